@@ -1,18 +1,49 @@
 import sys
 import cv2
-import face_recognition
-import numpy as np
-import sqlite3
-import pickle
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QLineEdit, QFileDialog, QDialog, QInputDialog, QScrollArea, QHBoxLayout, QMessageBox
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QFileDialog, QInputDialog, QMessageBox
 from PyQt5.QtCore import QTimer, Qt, pyqtSignal
 from PyQt5.QtGui import QImage, QPixmap
-from datetime import datetime
 import os
-
-# Veritabanı bağlantısı
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from face_gallery import FaceGallery
+from ann_index import index_path_for
+from storage import (Storage, encoding_to_blob, encoding_from_blob, migrate_encodings, migrate_thumbnails,
+                     make_thumbnail, face_thumbnail)
+from capture import CaptureThread
+from recognition import encode_face, detect_faces
+from recognition_worker import RecognitionExecutor
+from frame_cache import FrameCache
+from gate_controller import GateController, DECIDED, face_crop
+from log_writer import LogWriter
+from metrics import metrics
+from log_viewer import LogViewerDialog
+from face_list import FaceListModel, FaceListDialog
+
+DB_PATH = 'student_faces.db'
+# Tanıma işçi havuzu ayarları (None: çekirdek sayısına göre)
+RECOGNITION_WORKERS = None
+MAX_FRAMES_IN_FLIGHT = None
+# Karar, önizlemenin en fazla bu kadar eski (saniye) algılamasını kullanır; yoksa yeni kare işlenir
+DECISION_MAX_AGE = 0.5
+# Butonsuz sürekli mod: kapıya gelen kişi için karar otomatik verilir (bkz. gate_controller.py)
+HANDS_FREE = True
+# Aşama süresi ölçümü (bkz. yuzveplaka.py); kapalıyken ek iş yapılmaz
+METRICS_ENABLED = False
+METRICS_OVERLAY = True
+METRICS_PORT = None
+METRICS_FILE = None
+
+# Her iş parçacığı için uzun ömürlü, WAL modunda bağlantı
+db = Storage(DB_PATH)
+
+# Tanıma kayıtları arka planda toplu olarak yazılır
+log_writer = LogWriter(db, "INSERT INTO recognition_logs (name, timestamp) VALUES (?, ?)")
+
+# Veritabanı bağlantısı (bu iş parçacığının paylaşılan bağlantısı, kapatılmamalı)
 def create_connection():
-    return sqlite3.connect('student_faces.db')
+    return db.connection()
 
 # Veritabanı kurulum ve güncelleme
 def setup_database():
@@ -28,59 +59,65 @@ def setup_database():
                             id INTEGER PRIMARY KEY AUTOINCREMENT,
                             name TEXT,
                             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_faces_name ON faces(name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON recognition_logs(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_name_timestamp ON recognition_logs(name, timestamp)")
         conn.commit()
+        migrate_encodings(conn)
+        migrate_thumbnails(conn)
 
 # Yüze veritabanına ekle
 def add_face(name, encoding, image):
-    encoding_blob = pickle.dumps(encoding)
+    encoding_blob = encoding_to_blob(encoding)
+    thumbnail = make_thumbnail(image)
     with create_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("INSERT INTO faces (name, encoding, image) VALUES (?, ?, ?)", (name, encoding_blob, image))
+        cursor.execute("INSERT INTO faces (name, encoding, image, thumbnail) VALUES (?, ?, ?, ?)",
+                       (name, encoding_blob, image, thumbnail))
         conn.commit()
+        return cursor.lastrowid
 
-# Veritabanındaki tüm yüzleri al
+# Veritabanındaki tüm yüzleri al (resimler hariç, bkz. get_face_image)
 def get_faces():
     with create_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM faces")
+        cursor.execute("SELECT id, name, encoding, access_allowed FROM faces")
         faces = cursor.fetchall()
-    return [{"id": face[0], "name": face[1], "encoding": pickle.loads(face[2]), "image": face[3], "access_allowed": face[4]} for face in faces]
+    return [{"id": face[0], "name": face[1], "encoding": encoding_from_blob(face[2]), "access_allowed": face[3]} for face in faces]
 
-# Tanıma etkinliğini kaydet
-def log_recognition(name):
+# Bir yüzün resmini ihtiyaç olduğunda al
+def get_face_image(face_id):
     with create_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("INSERT INTO recognition_logs (name) VALUES (?)", (name,))
-        conn.commit()
+        cursor.execute("SELECT image FROM faces WHERE id = ?", (face_id,))
+        row = cursor.fetchone()
+    return row[0] if row else None
 
-# Yüz kodlama
-def encode_face(image):
-    face_encodings = face_recognition.face_encodings(image)
-    if face_encodings:
-        return face_encodings[0]
-    return None
+# Bir yüzün küçük resmini al (kayıtlı öğrenciler listesi için)
+def get_face_thumbnail(face_id):
+    return face_thumbnail(create_connection(), face_id)
 
-# Çerçeve içindeki yüzleri tanı
-def recognize_faces(frame, known_faces):
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    face_locations = face_recognition.face_locations(rgb_frame)
-    face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+# Tanıma etkinliğini kaydet (kuyruğa eklenir, diske beklenmez; zaman CURRENT_TIMESTAMP gibi UTC)
+def log_recognition(name):
+    log_writer.write((name, time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())))
 
+# Kodlanmış yüzleri galeriyle eşleştir (tüm yüzler tek seferde eşleştirilir)
+def match_faces(face_encodings, face_gallery):
     face_names = []
-    for face_encoding in face_encodings:
-        matches = face_recognition.compare_faces([face["encoding"] for face in known_faces], face_encoding)
+    for match in face_gallery.best_matches(face_encodings):
         name = "Yeni Yuz"
         access_allowed = False
-        face_distances = face_recognition.face_distance([face["encoding"] for face in known_faces], face_encoding)
-        if len(face_distances) > 0:
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                name = known_faces[best_match_index]["name"]
-                access_allowed = known_faces[best_match_index]["access_allowed"]
-                log_recognition(name)
+        if match is not None:
+            name = match["name"]
+            access_allowed = match["access_allowed"]
+            log_recognition(name)
         face_names.append((name, access_allowed))
+    return face_names
 
-    return face_locations, face_names
+# Çerçeve içindeki yüzleri tanı
+def recognize_faces(frame, face_gallery):
+    face_locations, face_encodings = detect_faces(frame)
+    return face_locations, match_faces(face_encodings, face_gallery)
 
 class ClickableLabel(QLabel):
     clicked = pyqtSignal()
@@ -93,12 +130,30 @@ class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.initUI()
-        self.known_faces = []
+        if METRICS_ENABLED:
+            metrics.enable(METRICS_PORT, METRICS_FILE)
+        self.face_gallery = FaceGallery(flag_key="access_allowed")
         self.load_known_faces()
-        self.cap = cv2.VideoCapture(0)
+        # Kamera ayrı bir iş parçacığında okunur, işleme her zaman en yeni kareyi alır
+        self.cap = CaptureThread(0)
         if not self.cap.isOpened():
             print("Kamera açılamadı.")
             return
+        self.cap.start()
+        # Algılama arayüz iş parçacığını bloklamaması için işlem havuzunda çalışır
+        self.preview_locations = []
+        self.decision_seq = None
+        self.decision_frame = None
+        self.decision_entry = None
+        self.decision_started = None
+        # Önizleme algılamaları kare başına önbelleğe alınır; karar yolu bunları yeniden kullanır
+        self.frame_cache = FrameCache(max_age=DECISION_MAX_AGE)
+        self.preview_frames = {}
+        self.gate = GateController(flag_key="access_allowed")
+        self.gate_seq = None
+        self.gate_request = None
+        self.executor = RecognitionExecutor(RECOGNITION_WORKERS, MAX_FRAMES_IN_FLIGHT, parent=self)
+        self.executor.result_ready.connect(self.on_recognition_result)
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_frame)
         self.timer.start(30)
@@ -151,50 +206,30 @@ class MainWindow(QWidget):
                 if ok:
                     with open(fileName, 'rb') as f:
                         image_blob = f.read()
-                    add_face(name, encoding, image_blob)
-                    self.load_known_faces()
+                    face_id = add_face(name, encoding, image_blob)
+                    self.face_gallery.add(face_id, name, encoding, flag=1)
+                    self.face_gallery.save_index()
 
     def load_known_faces(self):
-        self.known_faces = get_faces()
+        self.face_gallery.load(get_faces())
+        self.face_gallery.enable_index(index_path_for(DB_PATH))
 
+    # Sadece görünen satırların küçük resimleri okunur (bkz. face_list.py)
     def view_faces(self):
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Kayıtlı Öğrenciler")
-        scroll = QScrollArea(dialog)
-        scroll.setWidgetResizable(True)
-        container = QWidget()
-        layout = QVBoxLayout(container)
-
-        faces = get_faces()
-        for face in faces:
-            if face["image"]:
-                image = QImage.fromData(face["image"])
-                pixmap = QPixmap.fromImage(image)
-                label = QLabel()
-                label.setPixmap(pixmap.scaled(100, 100, Qt.KeepAspectRatio))
-                layout.addWidget(QLabel(f"Adı: {face['name']}"))
-                layout.addWidget(label)
-                if face["access_allowed"] == 1:
-                    access_label = QLabel("Geçiş İzinli")
-                    access_label.setStyleSheet('background-color: green')
-                    layout.addWidget(access_label)
-                else:
-                    access_label = QLabel("Geçiş İzni Yok")
-                    access_label.setStyleSheet('background-color: red')
-                    layout.addWidget(access_label)
-
-                delete_button = QPushButton("Sil", container)
-                delete_button.clicked.connect(lambda _, name=face['name']: self.delete_and_notify(name))
-                layout.addWidget(delete_button)
-
-                toggle_access_button = QPushButton("Geçiş İzni Değiştir", container)
-                toggle_access_button.clicked.connect(lambda _, face_id=face['id']: self.toggle_access_and_notify(face_id))
-                layout.addWidget(toggle_access_button)
-
-        scroll.setWidget(container)
-        layout_wrapper = QVBoxLayout(dialog)
-        layout_wrapper.addWidget(scroll)
-        dialog.setLayout(layout_wrapper)
+        model = FaceListModel(get_faces(), get_face_thumbnail, "access_allowed",
+                              {1: ("Geçiş İzinli", "lightgreen"), 0: ("Geçiş İzni Yok", "lightcoral")})
+        dialog = FaceListDialog(model, "Kayıtlı Öğrenciler", parent=self)
+
+        def delete(face):
+            self.delete_and_notify(face["name"])
+            model.remove_faces(lambda f: f["name"] == face["name"])
+
+        def toggle_access(face):
+            access_allowed = self.toggle_access_and_notify(face["id"])
+            model.update_faces(lambda f: f["id"] == face["id"], access_allowed=access_allowed)
+
+        dialog.add_action("Sil", "", delete)
+        dialog.add_action("Geçiş İzni Değiştir", "", toggle_access)
         dialog.exec_()
 
     def delete_and_notify(self, name):
@@ -202,7 +237,8 @@ class MainWindow(QWidget):
             cursor = conn.cursor()
             cursor.execute("DELETE FROM faces WHERE name = ?", (name,))
             conn.commit()
-        self.load_known_faces()
+        self.face_gallery.remove_name(name)
+        self.face_gallery.save_index()
         QMessageBox.information(self, "Başarılı", f"Öğrenci {name} silindi.")
 
     def toggle_access_and_notify(self, face_id):
@@ -213,40 +249,141 @@ class MainWindow(QWidget):
             new_access_allowed = 0 if access_allowed == 1 else 1
             cursor.execute("UPDATE faces SET access_allowed = ? WHERE id = ?", (new_access_allowed, face_id))
             conn.commit()
-        self.load_known_faces()
+        self.face_gallery.set_flag_by_id(face_id, new_access_allowed)
         QMessageBox.information(self, "Başarılı", "Geçiş izni güncellendi.")
+        return new_access_allowed
 
+    # Kayıtlar sayfa sayfa okunur; açılış süresi tablo boyutundan bağımsızdır
     def view_logs(self):
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Giriş Kayıtları")
-        layout = QVBoxLayout(dialog)
-        with create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM recognition_logs ORDER BY timestamp DESC")
-            logs = cursor.fetchall()
-        for log in logs:
-            layout.addWidget(QLabel(f"Adı: {log[1]}, Zaman: {log[2]}"))
-        dialog.setLayout(layout)
+        dialog = LogViewerDialog(create_connection, [("name", "Adı"), ("timestamp", "Zaman")],
+                                 text_filters=[("name", "Adı")], title="Giriş Kayıtları", parent=self)
         dialog.exec_()
 
     def start_recognition(self):
         self.status_label.setText("Yüz tanıma işlemi başladı, lütfen bekleyin...")
         self.status_label.setStyleSheet('background-color: yellow')
         self.image_displayed = False
+        self.decision_started = time.perf_counter()
         self.recognize_face()
 
     def recognize_face(self):
         if self.image_displayed:
             return
 
-        ret, frame = self.cap.read()
+        # Önizlemenin taze bir algılaması varsa sadece önbellekte olmayan yüzler kodlanır
+        entry = self.frame_cache.latest()
+        if entry is not None and entry["face_locations"]:
+            encodings = self.frame_cache.cached_encodings(entry)
+            missing = [location for location, encoding in zip(entry["face_locations"], encodings) if encoding is None]
+            self.decision_entry = entry
+            metrics.count("decision_cached_faces", len(encodings) - len(missing))
+            if not missing:
+                self.decide(entry["frame"], entry["face_locations"], encodings)
+                return
+            self.decision_seq = self.executor.submit('encode', entry["frame"], {"face_locations": missing}, force=True)
+            return
+
+        ret, frame = self.cap.read(timeout=1.0)
         if not ret:
             self.status_label.setText("Kamera açılamadı.")
             return
 
         frame = cv2.resize(frame, (640, 480))  # Performans için çerçeveyi yeniden boyutlandır
-        face_locations, face_names = recognize_faces(frame, self.known_faces)
-
+        # Karar için gönderilen kare önizleme sınırına takılmaz; sonuç on_recognition_result ile gelir
+        self.decision_frame = frame
+        self.decision_seq = self.executor.submit('faces', frame, force=True)
+
+    # İşçi havuzundan gelen sonuçlar (arayüz iş parçacığında çalışır)
+    def on_recognition_result(self, result):
+        if result["task"] == 'face_locations':
+            timestamp, frame = self.pop_preview_frame(result["seq"])
+            if "error" not in result:
+                self.preview_locations = result["face_locations"]
+                if frame is not None:
+                    entry = self.frame_cache.put(result["seq"], frame, result["face_locations"], timestamp)
+                    if HANDS_FREE:
+                        self.update_gate(frame, result["face_locations"], entry, timestamp)
+        elif result["seq"] == self.gate_seq:
+            self.gate_seq = None
+            frame, location, entry = self.gate_request
+            if "error" in result or not result["face_encodings"]:
+                self.gate.on_error()
+                return
+            encoding = result["face_encodings"][0]
+            if entry is not None:
+                self.frame_cache.store_encodings(entry, [location], [encoding])
+            self.on_gate_encoding(frame, location, encoding)
+        elif result["seq"] != self.decision_seq:
+            return
+        elif result["task"] == 'encode':
+            self.decision_seq = None
+            entry = self.decision_entry
+            if "error" in result:
+                self.show_decision(entry["frame"].copy(), [], [])
+                return
+            self.frame_cache.store_encodings(entry, result["face_locations"], result["face_encodings"])
+            self.decide(entry["frame"], entry["face_locations"], self.frame_cache.cached_encodings(entry))
+        elif result["task"] == 'faces':
+            self.decision_seq = None
+            if "error" in result:
+                self.show_decision(self.decision_frame, [], [])
+                return
+            entry = self.frame_cache.put(result["seq"], self.decision_frame, result["face_locations"])
+            if entry is not None:
+                self.frame_cache.store_encodings(entry, result["face_locations"], result["face_encodings"])
+            self.decide(self.decision_frame, result["face_locations"], result["face_encodings"])
+
+    # Sürekli mod: önizleme algılamasını durum makinesine ver, gerekirse kapıdaki kişiyi kodlat
+    def update_gate(self, frame, face_locations, entry, timestamp):
+        was_decided = self.gate.state == DECIDED
+        location = self.gate.update(face_locations, frame.shape, timestamp)
+        if was_decided and self.gate.state != DECIDED and self.image_displayed:
+            # Kişi kapıdan ayrıldı; kamera görüntüsüne dönülür
+            self.clear_turnstile_image()
+        if location is None:
+            return
+        if entry is not None:
+            encoding = self.frame_cache.cached_encodings(entry)[entry["face_locations"].index(location)]
+            if encoding is not None:
+                self.on_gate_encoding(frame, location, encoding)
+                return
+        # İşçiye tam kare yerine sadece yüzün çevresi gönderilir
+        crop, crop_location = face_crop(frame, location)
+        self.gate_request = (frame, location, entry)
+        # Kapı istekleri ayrı akıştır: buton kararının 'encode' sonucunu bayat sayıp atmasın (ya da tersi)
+        self.gate_seq = self.executor.submit('encode', crop, {"face_locations": [crop_location]}, force=True,
+                                             stream="gate")
+
+    def on_gate_encoding(self, frame, location, encoding):
+        with metrics.stage("match"):
+            matches = self.face_gallery.match([encoding])[0]
+        decision = self.gate.on_match(matches[0] if matches else None)
+        if decision is None:
+            return
+        # Kapıda duran kişi için tek kayıt
+        if decision["log"]:
+            log_recognition(decision["name"])
+        metrics.observe("gate_decision", decision["latency"])
+        self.show_decision(frame.copy(), [location], [(decision["name"], decision["access_allowed"])])
+
+    # Sonucu gelen önizleme karesini (gönderim zamanıyla) al; bayat sonuçları gelmeyen eski kareler de atılır
+    def pop_preview_frame(self, seq):
+        frame = self.preview_frames.pop(seq, (None, None))
+        for old_seq in [s for s in self.preview_frames if s < seq]:
+            del self.preview_frames[old_seq]
+        return frame
+
+    def decide(self, frame, face_locations, face_encodings):
+        with metrics.stage("match"):
+            face_names = match_faces(face_encodings, self.face_gallery)
+        # Önbellekteki kare sonraki kararlar için temiz kalmalı
+        self.show_decision(frame.copy(), face_locations, face_names)
+
+    def show_decision(self, frame, face_locations, face_names):
+        if self.decision_started is not None:
+            # Butona basılmasından turnike kararına kadar geçen süre
+            metrics.observe("decision", time.perf_counter() - self.decision_started)
+            self.decision_started = None
         if face_names:
             for (top, right, bottom, left), (name, access_allowed) in zip(face_locations, face_names):
                 color = (0, 255, 0) if access_allowed else (0, 0, 255)
@@ -268,27 +405,44 @@ class MainWindow(QWidget):
             self.show_turnstile_image("closed")
 
     def update_frame(self):
-        if self.image_displayed:
+        # Sürekli modda turnike resmi gösterilirken de algılama sürer; kişinin ayrıldığı böyle anlaşılır
+        if self.image_displayed and not HANDS_FREE:
             return
 
         ret, frame = self.cap.read()
         if not ret:
             return
 
-        frame = cv2.resize(frame, (640, 480))  # Performans için çerçeveyi yeniden boyutlandır
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
-
-        face_locations = face_recognition.face_locations(rgb_image)
-        for (top, right, bottom, left) in face_locations:
+        with metrics.stage("resize"):
+            frame = cv2.resize(frame, (640, 480))  # Performans için çerçeveyi yeniden boyutlandır
+
+        seq = self.executor.submit('face_locations', frame)
+        if seq is not None:
+            # Algılama sonucu karar yolunda da kullanılır; kutular çizilmeden önceki kare saklanır
+            self.preview_frames[seq] = (time.monotonic(), frame.copy())
+        if self.image_displayed:
+            return
+        for (top, right, bottom, left) in self.preview_locations:
             cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 255), 2)
 
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        qt_image = QImage(rgb_image.data, rgb_image.shape[1], rgb_image.shape[0], QImage.Format_RGB888)
-        self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+        if METRICS_OVERLAY:
+            metrics.draw_overlay(frame)
+        with metrics.stage("display"):
+            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            h, w, ch = rgb_image.shape
+            bytes_per_line = ch * w
+            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+            self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+        metrics.frame()
+
+    def closeEvent(self, event):
+        if hasattr(self, 'timer'):
+            self.timer.stop()
+            self.executor.shutdown()
+        self.cap.release()
+        log_writer.close()
+        metrics.close()
+        super().closeEvent(event)
 
     def show_turnstile_image(self, status):
         self.image_displayed = True
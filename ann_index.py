@@ -0,0 +1,196 @@
+import os
+
+import numpy as np
+
+ENCODING_SIZE = 128
+# Bu sayının altındaki galerilerde kaba kuvvet arama zaten yeterince hızlı
+ANN_MIN_FACES = 20000
+DEFAULT_N_PROBE = 16
+KMEANS_ITERATIONS = 10
+# Eğitimden sonra eklenen kayıt oranı bunu aşarsa merkezler yeniden eğitilir
+RETRAIN_GROWTH = 0.5
+
+
+# Veritabanı dosyasının yanında tutulan indeks dosyasının yolu
+def index_path_for(db_path):
+    return os.path.splitext(db_path)[0] + '.ann.npz'
+
+
+def _sq_distances(queries, vectors, vector_sq_norms):
+    q_norms = np.einsum('ij,ij->i', queries, queries)
+    sq = q_norms[:, None] + vector_sq_norms[None, :] - 2.0 * (queries @ vectors.T)
+    return np.maximum(sq, 0, out=sq)
+
+
+# Sadece NumPy kullanan ters dosya (IVF) indeksi: vektörler k-means merkezlerine göre
+# listelere ayrılır, arama sırasında sadece en yakın n_probe listesi taranır.
+class IVFIndex:
+    def __init__(self, n_lists=None, n_probe=DEFAULT_N_PROBE):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids = None
+        self._centroid_norms = None
+        self._list_vectors = []
+        self._list_norms = []
+        self._list_ids = []
+        self._list_of = {}
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self._list_of)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    @property
+    def ids(self):
+        return np.fromiter(self._list_of.keys(), dtype=np.int64, count=len(self._list_of))
+
+    # Eğitimden bu yana indeks yeterince büyüdüyse merkezler artık veriyi temsil etmiyor
+    def needs_retrain(self):
+        return not self.is_trained or len(self) > self._trained_size * (1 + RETRAIN_GROWTH)
+
+    # Tüm vektörlerle k-means merkezlerini eğitip listeleri baştan kur
+    def train(self, ids, encodings, seed=0):
+        encodings = np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        count = len(encodings)
+        n_lists = self.n_lists or max(1, int(np.sqrt(count)))
+        n_lists = min(n_lists, max(1, count))
+        rng = np.random.default_rng(seed)
+        sample = encodings
+        if count > 64 * n_lists:
+            sample = encodings[rng.choice(count, 64 * n_lists, replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            c_norms = np.einsum('ij,ij->i', centroids, centroids)
+            assign = np.argmin(_sq_distances(sample, centroids, c_norms), axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            # Boş kalan merkezleri rastgele örneklere taşı
+            empty = np.flatnonzero(~filled)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        self._set_centroids(centroids)
+        self._fill(ids, encodings)
+        self._trained_size = count
+
+    def _set_centroids(self, centroids):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+
+    # Vektörleri merkezlere dağıtıp her liste için bitişik bir dizi oluştur
+    def _fill(self, ids, encodings):
+        ids = np.asarray(ids, dtype=np.int64)
+        encodings = np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        assign = self._assign(encodings)
+        order = np.argsort(assign, kind='stable')
+        bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+        self._list_vectors, self._list_norms, self._list_ids = [], [], []
+        for i in range(len(self.centroids)):
+            rows = order[bounds[i]:bounds[i + 1]]
+            vectors = encodings[rows]
+            self._list_vectors.append(vectors)
+            self._list_norms.append(np.einsum('ij,ij->i', vectors, vectors))
+            self._list_ids.append(ids[rows])
+        self._list_of = dict(zip(ids.tolist(), assign.tolist()))
+
+    def _assign(self, vectors):
+        assign = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 8192):
+            chunk = vectors[start:start + 8192]
+            assign[start:start + 8192] = np.argmin(_sq_distances(chunk, self.centroids, self._centroid_norms), axis=1)
+        return assign
+
+    # Eğitilmiş indekse yeni bir yüz ekle (en yakın merkezin listesine)
+    def add(self, face_id, encoding):
+        face_id = int(face_id)
+        if face_id in self._list_of:
+            self.remove([face_id])
+        vector = np.asarray(encoding, dtype=np.float32).reshape(1, ENCODING_SIZE)
+        list_no = int(self._assign(vector)[0])
+        self._list_vectors[list_no] = np.vstack([self._list_vectors[list_no], vector])
+        self._list_norms[list_no] = np.append(self._list_norms[list_no], np.dot(vector[0], vector[0]))
+        self._list_ids[list_no] = np.append(self._list_ids[list_no], face_id)
+        self._list_of[face_id] = list_no
+
+    def remove(self, face_ids):
+        for face_id in face_ids:
+            list_no = self._list_of.pop(int(face_id), None)
+            if list_no is None:
+                continue
+            keep = self._list_ids[list_no] != face_id
+            self._list_vectors[list_no] = self._list_vectors[list_no][keep]
+            self._list_norms[list_no] = self._list_norms[list_no][keep]
+            self._list_ids[list_no] = self._list_ids[list_no][keep]
+
+    # Veritabanındaki güncel kayıtlarla indeksi eşitle: eksikleri ekle, silinenleri çıkar
+    def sync(self, ids, encodings):
+        ids = np.asarray(ids, dtype=np.int64)
+        if not self.is_trained or len(ids) > self._trained_size * (1 + RETRAIN_GROWTH):
+            self.train(ids, encodings)
+            return
+        current = set(self._list_of)
+        self.remove(current - set(ids.tolist()))
+        for i, face_id in enumerate(ids.tolist()):
+            if face_id not in current:
+                self.add(face_id, encodings[i])
+
+    # Her sorgu için en yakın k kaydın (id, uzaklık) listesini döndürür
+    def search(self, queries, k=1, n_probe=None):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        c_dists = _sq_distances(queries, self.centroids, self._centroid_norms)
+        probes = np.argpartition(c_dists, n_probe - 1, axis=1)[:, :n_probe]
+        q_norms = np.einsum('ij,ij->i', queries, queries)
+        results = []
+        for query, q_norm, probe in zip(queries, q_norms, probes):
+            sq = np.concatenate([self._list_norms[c] - 2.0 * (self._list_vectors[c] @ query) for c in probe])
+            if len(sq) == 0:
+                results.append([])
+                continue
+            ids = np.concatenate([self._list_ids[c] for c in probe])
+            sq += q_norm
+            np.maximum(sq, 0, out=sq)
+            top = min(k, len(sq))
+            best = np.argpartition(sq, top - 1)[:top]
+            best = best[np.argsort(sq[best])]
+            results.append([(int(ids[i]), float(np.sqrt(sq[i]))) for i in best])
+        return results
+
+    def save(self, path):
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, centroids=self.centroids,
+                 vectors=np.concatenate(self._list_vectors) if self._list_vectors else np.empty((0, ENCODING_SIZE)),
+                 ids=np.concatenate(self._list_ids) if self._list_ids else np.empty(0, dtype=np.int64),
+                 n_probe=self.n_probe, trained_size=self._trained_size)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(n_lists=len(data["centroids"]), n_probe=int(data["n_probe"]))
+            index._set_centroids(data["centroids"])
+            index._fill(data["ids"], data["vectors"])
+            index._trained_size = int(data["trained_size"])
+        return index
+
+
+# Dosyadan indeksi yükle ve galeriyle eşitle; dosya yoksa ya da bozuksa baştan eğit
+def load_or_build(path, ids, encodings, n_probe=DEFAULT_N_PROBE):
+    index = None
+    if os.path.exists(path):
+        try:
+            index = IVFIndex.load(path)
+            index.n_probe = n_probe
+        except Exception as e:
+            print(f"ANN indeksi okunamadi, yeniden olusturuluyor: {e}")
+    if index is None:
+        index = IVFIndex(n_probe=n_probe)
+        index.train(ids, encodings)
+    else:
+        index.sync(ids, encodings)
+    return index
@@ -0,0 +1,241 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+import database
+from face_gallery import FaceGallery
+from plate_registry import PlateRegistry
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov'}
+# Bir işe verilen en fazla resim sayısı ve video parçası uzunluğu (saniye)
+IMAGES_PER_JOB = 32
+SEGMENT_SECONDS = 60
+STAGES = ("decode", "faces", "plates")
+
+# Kayıtlı video ve resimleri arayüz ve kamera olmadan işleyen komut satırı aracı. Dosyalar ve
+# video parçaları bir işlem havuzuna dağıtılır; sonuçlar JSONL dosyasına ve/veya veritabanına yazılır.
+#
+#   python batch_process.py kayitlar/ --mode both --jsonl sonuc.jsonl --db recognition.db
+#   python batch_process.py giris.mp4 --mode plates --realtime
+
+_gallery = None
+_marked_names = set()
+
+
+# İşçi işlemi başlangıcı: galeri veritabanından bir kez yüklenir
+def _init_worker(db_path, mode):
+    global _gallery, _marked_names
+    database.open_database(db_path)
+    if mode in ("faces", "both"):
+        faces = database.get_faces()
+        _gallery = FaceGallery(faces, flag_key="marked")
+        _marked_names = {face["name"] for face in faces if face["marked"]}
+
+
+# Girdi yollarından işler: ("images", [yollar]) ve ("video", yol, başlangıç_karesi, bitiş_karesi)
+def build_jobs(inputs, segment_seconds=SEGMENT_SECONDS, split_videos=True):
+    images, videos = [], []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext in IMAGE_EXTENSIONS:
+                        images.append(os.path.join(root, name))
+                    elif ext in VIDEO_EXTENSIONS:
+                        videos.append(os.path.join(root, name))
+        elif os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+            images.append(path)
+        else:
+            videos.append(path)
+
+    jobs = [("images", images[i:i + IMAGES_PER_JOB]) for i in range(0, len(images), IMAGES_PER_JOB)]
+    for path in videos:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"Video acilamadi: {path}")
+            continue
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        segment = int(segment_seconds * fps)
+        if not split_videos or frame_count <= 0 or segment <= 0:
+            jobs.append(("video", path, 0, None))
+            continue
+        for start in range(0, frame_count, segment):
+            jobs.append(("video", path, start, min(start + segment, frame_count)))
+    return jobs
+
+
+def _empty_stats():
+    stats = {"frames": 0, "dropped": 0, "faces": 0, "plates": 0}
+    stats.update({f"{stage}_time": 0.0 for stage in STAGES})
+    return stats
+
+
+def _process_frame(frame, mode, stats):
+    result = {}
+    if mode in ("faces", "both"):
+        start = time.perf_counter()
+        face_locations, face_names = database.recognize_faces(frame, _gallery, log=False)
+        stats["faces_time"] += time.perf_counter() - start
+        result["faces"] = [{"name": name, "location": list(location), "marked": name in _marked_names}
+                           for location, name in zip(face_locations, face_names)]
+        stats["faces"] += len(face_locations)
+    if mode in ("plates", "both"):
+        start = time.perf_counter()
+        plate_locations, plate_numbers = database.recognize_plate(frame, log=False)
+        stats["plates_time"] += time.perf_counter() - start
+        result["plates"] = [{"plate_number": plate_number, "location": list(location)}
+                            for location, plate_number in zip(plate_locations, plate_numbers)]
+        stats["plates"] += len(plate_numbers)
+    stats["frames"] += 1
+    return result
+
+
+# İşçide çalışan iş: kareleri okur, işler ve (kare sonuçları, istatistikler) döndürür.
+# realtime=True ile video kaynak hızında oynatılır; işleme geride kalırsa kareler canlı kamerada olduğu gibi atlanır.
+def run_job(job, mode, stride=1, realtime=False):
+    stats = _empty_stats()
+    results = []
+    if job[0] == "images":
+        for path in job[1]:
+            start = time.perf_counter()
+            frame = cv2.imread(path)
+            stats["decode_time"] += time.perf_counter() - start
+            if frame is None:
+                print(f"Resim okunamadi: {path}")
+                continue
+            result = _process_frame(frame, mode, stats)
+            result.update(source=path, frame=0)
+            results.append(result)
+        return results, stats
+
+    _, path, first, last = job
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    if first:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+    frame_no = first
+    started = time.perf_counter()
+    try:
+        while last is None or frame_no < last:
+            start = time.perf_counter()
+            ok = cap.grab()
+            stats["decode_time"] += time.perf_counter() - start
+            if not ok:
+                break
+            if realtime:
+                behind = (time.perf_counter() - started) - (frame_no - first) / fps
+                if behind < 0:
+                    time.sleep(-behind)
+                elif behind > 1.0 / fps:
+                    stats["dropped"] += 1
+                    frame_no += 1
+                    continue
+            if (frame_no - first) % stride:
+                frame_no += 1
+                continue
+            start = time.perf_counter()
+            ok, frame = cap.retrieve()
+            stats["decode_time"] += time.perf_counter() - start
+            if not ok:
+                break
+            result = _process_frame(frame, mode, stats)
+            result.update(source=path, frame=frame_no, timestamp=round(frame_no / fps, 3))
+            results.append(result)
+            frame_no += 1
+    finally:
+        cap.release()
+    return results, stats
+
+
+# Plakaların izleme listesinde olup olmadığını sonuçlara ekle; tek karakteri farklı okunmuş olabilecek
+# işaretli plaka possible_match alanına yazılır
+def mark_plates(results, plate_registry):
+    for result in results:
+        for plate in result.get("plates", []):
+            plate["marked"] = plate_registry.is_marked(plate["plate_number"])
+            match = plate_registry.possible_match(plate["plate_number"])
+            plate["possible_match"] = None if match is None else match["plate_number"]
+
+
+# Kare sonuçlarını tanıma kayıtlarına yaz: arayüzdeki gibi işaretli yüzler ve tüm plakalar
+def log_results(results):
+    for result in results:
+        for face in result.get("faces", []):
+            if face["marked"]:
+                database.log_recognition('face', face["name"])
+        database.log_plates([plate["plate_number"] for plate in result.get("plates", [])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayitli video ve resimlerde arayuzsuz yuz/plaka tanima")
+    parser.add_argument("inputs", nargs="+", help="Video dosyalari, resimler ya da klasorler")
+    parser.add_argument("--mode", choices=["faces", "plates", "both"], default="both")
+    parser.add_argument("--db", default=database.DB_PATH, help="Kayitli yuz/plakalarin okunacagi veritabani")
+    parser.add_argument("--log-db", action="store_true", help="Tanimalari veritabanindaki recognition_logs tablosuna yaz")
+    parser.add_argument("--jsonl", help="Kare sonuclarinin yazilacagi JSONL dosyasi")
+    parser.add_argument("--workers", type=int, default=None, help="Islem sayisi (varsayilan: cekirdek sayisi)")
+    parser.add_argument("--stride", type=int, default=1, help="Her N karede bir isle")
+    parser.add_argument("--segment-seconds", type=float, default=SEGMENT_SECONDS, help="Videolarin bolundugu parca uzunlugu")
+    parser.add_argument("--realtime", action="store_true", help="Videolari kaynak hizinda oynat (videolar bolunmez)")
+    args = parser.parse_args()
+
+    database.open_database(args.db)
+    database.setup_database()
+    plate_registry = PlateRegistry(database.get_plates()) if args.mode != "faces" else None
+
+    jobs = build_jobs(args.inputs, args.segment_seconds, split_videos=not args.realtime)
+    if not jobs:
+        print("Islenecek dosya bulunamadi.")
+        return
+    workers = args.workers or os.cpu_count() or 1
+    print(f"{len(jobs)} is, {workers} islem")
+
+    totals = _empty_stats()
+    output = open(args.jsonl, "w", encoding="utf-8") if args.jsonl else None
+    started = time.perf_counter()
+    # dlib ve OpenCV iş parçacıklarıyla fork güvenli olmadığı için işlemler spawn ile başlatılır
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(args.db, args.mode)) as pool:
+        futures = [pool.submit(run_job, job, args.mode, args.stride, args.realtime) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results, stats = future.result()
+            except Exception as e:
+                print(f"Error in batch job: {e}")
+                continue
+            if plate_registry is not None:
+                mark_plates(results, plate_registry)
+            if args.log_db:
+                log_results(results)
+            if output is not None:
+                for result in results:
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            for key, value in stats.items():
+                totals[key] += value
+            print(f"\r{done}/{len(jobs)} is, {totals['frames']} kare", end="", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    if output is not None:
+        output.close()
+    database.log_writer.close()
+
+    frames = max(totals["frames"], 1)
+    print(f"{totals['frames']} kare {elapsed:.1f} sn: {totals['frames'] / elapsed:.1f} kare/sn"
+          + (f", {totals['dropped']} kare atlandi" if totals["dropped"] else ""))
+    for stage in STAGES:
+        print(f"  {stage:7s}: {totals[f'{stage}_time'] / frames * 1000:8.2f} ms/kare (islem basina)")
+    print(f"  bulunan yuz: {totals['faces']}, bulunan plaka: {totals['plates']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_face_gallery import make_faces, time_call
+from face_clusters import UnknownFaceClusters
+from face_gallery import FaceGallery
+
+# Tekrar gelen bilinmeyen yüzlerin maliyeti: her kodlama önce galeriyle eşleştirilir, galeride olmayanlar
+# için eklenen iş tek bir toplu merkez aramasıdır. Galeri eşleştirmesine göre bu ek maliyet ölçülür.
+# Ayrıca sentetik ziyaretçi akışında kümelerin saflığı (her kümede tek kişi) ölçülür.
+
+
+# Ziyaretçi akışı: her ziyaretçinin sabit bir merkezi var, her görüş gürültülü bir kodlama
+def visitor_stream(visitors, observations, noise, rng):
+    centers = rng.normal(0, 0.09, size=(visitors, 128))
+    order = rng.integers(0, visitors, size=observations)
+    return order, centers[order] + rng.normal(0, noise, size=(observations, 128))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bilinmeyen yuz kumeleme: galeri eslestirme ve merkez aramasi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Galeri boyutlari")
+    parser.add_argument("--visitors", type=int, default=100, help="Ziyaretci (bilinmeyen kisi) sayisi")
+    parser.add_argument("--observations", type=int, default=5000, help="Toplam gorus sayisi")
+    parser.add_argument("--noise", type=float, default=0.015, help="Gorusler arasi boyut basina gurultu")
+    parser.add_argument("--max-clusters", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    truth, encodings = visitor_stream(args.visitors, args.observations, args.noise, rng)
+
+    clusters = UnknownFaceClusters(max_clusters=args.max_clusters)
+    members = defaultdict(Counter)
+    for step, (visitor, encoding) in enumerate(zip(truth, encodings)):
+        cluster_id = clusters.lookup([encoding])[0][0]
+        cluster_id = clusters.observe(encoding, cluster_id, now=step)
+        members[cluster_id][visitor] += 1
+    pure = sum(counter.most_common(1)[0][1] for counter in members.values())
+    split = Counter(visitor for counter in members.values() for visitor in counter)
+    print(f"{args.visitors} ziyaretci, {args.observations} gorus: {len(members)} kume acildi, "
+          f"{len(clusters)} kume tutuluyor, {clusters.evicted} atildi")
+    print(f"  saflik: %{pure / args.observations * 100:.2f}, "
+          f"birden fazla kumeye bolunen ziyaretci: {sum(1 for count in split.values() if count > 1)}")
+
+    query = [encodings[-1]]
+    lookup_ms = time_call(lambda: clusters.lookup(query), args.repeat)
+    print(f"{'galeri':>8} {'galeri (ms)':>12} {'kume (ms)':>10} {'ek maliyet':>11}")
+    for size in args.sizes:
+        gallery = FaceGallery(make_faces(size, rng))
+        gallery_ms = time_call(lambda: gallery.best_matches(query), args.repeat)
+        print(f"{size:>8} {gallery_ms:>12.3f} {lookup_ms:>10.3f} {lookup_ms / gallery_ms * 100:>10.1f}%")
+
+
+if __name__ == '__main__':
+    main()
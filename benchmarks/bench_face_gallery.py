@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from face_gallery import FaceGallery
+
+
+# Sentetik galeri: face_recognition kodlamalarına benzer ölçekte rastgele 128 boyutlu vektörler
+def make_faces(count, rng):
+    encodings = rng.normal(0, 0.09, size=(count, 128))
+    return [{"id": i + 1, "name": f"kisi_{i}", "encoding": encodings[i], "marked": i % 10 == 0}
+            for i in range(count)]
+
+
+# Eski yol: her yüz için liste yeniden kurulur, compare_faces ve face_distance ayrı ayrı çalışır
+def legacy_match(known_faces, face_encodings, tolerance=0.6):
+    names = []
+    for face_encoding in face_encodings:
+        known = [face["encoding"] for face in known_faces]
+        matches = list(np.linalg.norm(np.array(known) - face_encoding, axis=1) <= tolerance)
+        face_distances = np.linalg.norm(np.array([face["encoding"] for face in known_faces]) - face_encoding, axis=1)
+        name = "Yeni Yuz"
+        if len(face_distances) > 0:
+            best = np.argmin(face_distances)
+            if matches[best]:
+                name = known_faces[best]["name"]
+        names.append(name)
+    return names
+
+
+def time_call(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kare başına yüz eşleştirme maliyeti")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--faces", type=int, default=3, help="Kare başına yüz sayısı")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'galeri':>8} {'eski (ms)':>10} {'galeri (ms)':>12} {'hızlanma':>9}")
+    for size in args.sizes:
+        faces = make_faces(size, rng)
+        gallery = FaceGallery(faces)
+        queries = [faces[i]["encoding"] + rng.normal(0, 0.01, 128) for i in range(args.faces)]
+        legacy_ms = time_call(lambda: legacy_match(faces, queries), max(1, args.repeat // 4))
+        gallery_ms = time_call(lambda: gallery.best_matches(queries), args.repeat)
+        print(f"{size:>8} {legacy_ms:>10.2f} {gallery_ms:>12.3f} {legacy_ms / gallery_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
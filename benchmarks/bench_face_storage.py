@@ -0,0 +1,81 @@
+import argparse
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from face_gallery import FaceGallery
+from storage import encoding_from_blob, migrate_encodings
+
+
+# Eski biçimde (pickle kodlama + tam boy resim) sentetik yüz tablosu oluştur
+def build_legacy_db(path, count, image_bytes, rng):
+    with sqlite3.connect(path) as conn:
+        conn.execute('''CREATE TABLE faces (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            name TEXT,
+                            encoding BLOB,
+                            image BLOB,
+                            marked INTEGER DEFAULT 0)''')
+        image = rng.bytes(image_bytes)
+        rows = ((f"kisi_{i}", pickle.dumps(rng.normal(0, 0.09, 128)), image) for i in range(count))
+        conn.executemany("INSERT INTO faces (name, encoding, image) VALUES (?, ?, ?)", rows)
+        conn.commit()
+
+
+def legacy_get_faces(path):
+    with sqlite3.connect(path) as conn:
+        faces = conn.execute("SELECT * FROM faces").fetchall()
+    return [{"id": face[0], "name": face[1], "encoding": pickle.loads(face[2]), "image": face[3], "marked": face[4]} for face in faces]
+
+
+def compact_get_faces(path):
+    with sqlite3.connect(path) as conn:
+        faces = conn.execute("SELECT id, name, encoding, marked FROM faces").fetchall()
+    return [{"id": face[0], "name": face[1], "encoding": encoding_from_blob(face[2]), "marked": face[3]} for face in faces]
+
+
+# Galeriyi soğuk olarak yükle; süreyi ve tepe bellek kullanımını ölç
+def measure(load, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    faces = load(path)
+    gallery = FaceGallery(faces)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del faces
+    return elapsed, peak, len(gallery)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yüz tablosunun soğuk yükleme süresi ve bellek kullanımı")
+    parser.add_argument("--faces", type=int, default=50000)
+    parser.add_argument("--image-kb", type=int, default=30, help="Kayıt başına resim boyutu")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "faces.db")
+        build_legacy_db(path, args.faces, args.image_kb * 1024, rng)
+        legacy_s, legacy_peak, _ = measure(legacy_get_faces, path)
+        with sqlite3.connect(path) as conn:
+            start = time.perf_counter()
+            migrate_encodings(conn)
+            migrate_s = time.perf_counter() - start
+        compact_s, compact_peak, count = measure(compact_get_faces, path)
+
+    print(f"{count} yuz, resim basina {args.image_kb} KB (goc suresi {migrate_s:.2f} s)")
+    print(f"{'yol':>12} {'sure (s)':>9} {'tepe bellek (MB)':>17}")
+    print(f"{'pickle':>12} {legacy_s:>9.2f} {legacy_peak / 2**20:>17.1f}")
+    print(f"{'float32':>12} {compact_s:>9.2f} {compact_peak / 2**20:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import cv2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from face_gallery import FaceGallery
+from face_tracker import FaceTracker
+from recognition import detect_faces, detect_face_locations, encode_faces
+from storage import encoding_from_blob
+
+
+def load_gallery(db_path):
+    gallery = FaceGallery()
+    if db_path:
+        with sqlite3.connect(db_path) as conn:
+            rows = conn.execute("SELECT id, name, encoding FROM faces").fetchall()
+        gallery.load({"id": row[0], "name": row[1], "encoding": encoding_from_blob(row[2]), "marked": 0} for row in rows)
+    return gallery
+
+
+def label_for(match):
+    return match["name"] if match is not None else "Yeni Yuz"
+
+
+def read_frames(path, limit):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.resize(frame, (640, 480)))
+    cap.release()
+    return frames
+
+
+# Eski yol: her karede tam çözünürlükte algılama ve tüm yüzlerin kodlanması
+def run_baseline(frames, gallery):
+    labels = []
+    start = time.perf_counter()
+    for frame in frames:
+        _, encodings = detect_faces(frame)
+        labels.append(sorted(label_for(m) for m in gallery.best_matches(encodings)))
+    return labels, time.perf_counter() - start
+
+
+def run_tracked(frames, gallery, tracker):
+    def identify(frame, locations):
+        return [(label_for(m), m is not None) for m in gallery.best_matches(encode_faces(frame, locations))]
+
+    labels = []
+    start = time.perf_counter()
+    for frame in frames:
+        _, names = tracker.process(frame, detect_face_locations, identify)
+        labels.append(sorted(names))
+    return labels, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Algıla-izle hattının her kare algılamaya göre maliyeti")
+    parser.add_argument("videos", nargs="+", help="Kaydedilmiş video dosyaları")
+    parser.add_argument("--db", help="Galerinin okunacağı veritabanı")
+    parser.add_argument("--frames", type=int, default=600, help="Video başına en fazla kare")
+    parser.add_argument("--detect-every", type=int, default=5)
+    parser.add_argument("--detect-scale", type=float, default=0.5)
+    args = parser.parse_args()
+
+    gallery = load_gallery(args.db)
+    print(f"{'video':>20} {'kare':>5} {'eski ms/kare':>13} {'izli ms/kare':>13} {'algilama':>9} {'kodlama':>8} {'etiket uyumu':>13}")
+    for path in args.videos:
+        frames = read_frames(path, args.frames)
+        if not frames:
+            print(f"{path}: kare okunamadi")
+            continue
+        tracker = FaceTracker(detect_every=args.detect_every, detect_scale=args.detect_scale)
+        baseline_labels, baseline_s = run_baseline(frames, gallery)
+        tracked_labels, tracked_s = run_tracked(frames, gallery, tracker)
+        agreement = sum(a == b for a, b in zip(baseline_labels, tracked_labels)) / len(frames)
+        print(f"{os.path.basename(path)[-20:]:>20} {len(frames):>5} {baseline_s / len(frames) * 1000:>13.1f} "
+              f"{tracked_s / len(frames) * 1000:>13.1f} {tracker.detections:>9} {tracker.encodings:>8} {agreement:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_face_tracking import load_gallery, read_frames
+from gate_controller import PRESENT, GateController, face_crop
+from recognition import detect_faces, detect_face_locations, encode_faces
+
+# Kayıtlı kliplerde turnike karar gecikmesi: butonlu yol (tam karede algılama + tüm yüzlerin
+# kodlanması) ile sürekli moddaki tek kişi hızlı yolu (önizleme algılaması + sadece kapıdaki
+# yüzün kesitinin kodlanması, ilk güvenilir eşleşmede durma) karşılaştırılır.
+#
+#   python benchmarks/bench_gate_latency.py klip1.mp4 klip2.mp4 --db YuzTanimaliTurnike/student_faces.db
+
+
+def percentiles(samples):
+    if not samples:
+        return "-", "-"
+    p50, p99 = np.percentile(np.array(samples) * 1000, [50, 99])
+    return f"{p50:.1f}", f"{p99:.1f}"
+
+
+# Butona yüz göründüğü her karede basıldığı varsayılır; kayıt her eşleşen yüz için yazılırdı
+def run_button(frames, gallery):
+    latencies, logs = [], 0
+    for frame in frames:
+        start = time.perf_counter()
+        face_locations, face_encodings = detect_faces(frame)
+        matches = gallery.best_matches(face_encodings)
+        if face_locations:
+            latencies.append(time.perf_counter() - start)
+            logs += sum(match is not None for match in matches)
+    return latencies, logs
+
+
+# Kareler sırayla işlenir; gecikme, kişinin göründüğü ilk karenin işlenmeye başlamasından karara kadar
+# geçen işlem süresidir. Klip zamanı durum makinesinin saati olarak kullanılır.
+def run_gate(frames, gallery, fps):
+    gate = GateController(flag_key="marked")
+    latencies, logs, encodes = [], 0, 0
+    present_start = None
+    for i, frame in enumerate(frames):
+        now = i / fps
+        start = time.perf_counter()
+        face_locations = detect_face_locations(frame)
+        location = gate.update(face_locations, frame.shape, now)
+        if gate.state == PRESENT and present_start is None:
+            present_start = start
+        elif gate.state != PRESENT:
+            present_start = None
+        if location is None:
+            continue
+        crop, crop_location = face_crop(frame, location)
+        encodings = encode_faces(crop, [crop_location])
+        encodes += 1
+        if not encodings:
+            gate.on_error()
+            continue
+        matches = gallery.match(encodings)[0]
+        decision = gate.on_match(matches[0] if matches else None, now)
+        if decision is not None:
+            latencies.append(time.perf_counter() - present_start)
+            logs += decision["log"]
+            present_start = None
+    return latencies, logs, encodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turnike karar gecikmesi: butonlu yol ve surekli mod hizli yolu")
+    parser.add_argument("videos", nargs="+", help="Kaydedilmis video dosyalari")
+    parser.add_argument("--db", help="Galerinin okunacagi veritabani")
+    parser.add_argument("--frames", type=int, default=600, help="Video basina en fazla kare")
+    parser.add_argument("--fps", type=float, default=30.0, help="Durum makinesi saati icin kare hizi")
+    args = parser.parse_args()
+
+    gallery = load_gallery(args.db)
+    print(f"{'video':>20} {'buton p50':>10} {'buton p99':>10} {'kayit':>6} {'surekli p50':>12} {'surekli p99':>12} "
+          f"{'karar':>6} {'kodlama':>8} {'kayit':>6}")
+    for path in args.videos:
+        frames = read_frames(path, args.frames)
+        if not frames:
+            print(f"{path}: kare okunamadi")
+            continue
+        button_latencies, button_logs = run_button(frames, gallery)
+        gate_latencies, gate_logs, encodes = run_gate(frames, gallery, args.fps)
+        print(f"{os.path.basename(path)[-20:]:>20} {' '.join(f'{v:>10}' for v in percentiles(button_latencies))} "
+              f"{button_logs:>6} {' '.join(f'{v:>12}' for v in percentiles(gate_latencies))} "
+              f"{len(gate_latencies):>6} {encodes:>8} {gate_logs:>6}")
+    print("Gecikmeler ms; buton: yuz gorunen her karede tam kare algilama+kodlama, "
+          "surekli: kisinin ilk karesinden karara kadar islem suresi.")
+
+
+if __name__ == '__main__':
+    main()
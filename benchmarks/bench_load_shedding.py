@@ -0,0 +1,88 @@
+import argparse
+import heapq
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from load_shedder import LEVELS, TARGET_LATENCY, LoadShedder
+
+# Yük atmanın karar gecikmesine etkisi (benzetim): kameradan her 30 ms'de bir kare gelir, işler sınırlı
+# sayıda işçide sırayla çalışır. İş süresi algılama ölçeği, kodlanan yüz sayısı ve OCR adaylarıyla
+# orantılıdır. Yoğun dönemde işlemci paylaşımı süreleri uzatır ve kalabalık kareye girer. Kontrol
+# açık ve kapalıyken dönem başına gecikme ve seviye geçişleri karşılaştırılır.
+FRAME_INTERVAL = 0.03
+DETECT_COST = 0.06       # 0.5 ölçekte algılama (sn)
+ENCODE_COST = 0.02       # yüz başına kodlama
+OCR_COST = 0.03          # aday başına OCR
+DEFAULT_OCR_BUDGET = 3
+
+
+# Dönemler: (süre sn, işlemci yavaşlama katsayısı, karedeki yüz sayısı)
+PHASES = [(20, 1.0, 1), (40, 2.5, 6), (30, 1.0, 1)]
+
+
+def job_cost(settings, slowdown, faces, mode, rng):
+    if mode == "plates":
+        if not settings["ocr"]:
+            return None
+        candidates = settings["ocr_budget"] or DEFAULT_OCR_BUDGET
+        cost = 0.01 + OCR_COST * candidates
+    else:
+        encoded = faces if settings["max_faces"] is None else min(faces, settings["max_faces"])
+        cost = DETECT_COST * (settings["detect_scale"] / 0.5) ** 2 + ENCODE_COST * encoded
+    return cost * slowdown * rng.uniform(0.8, 1.2)
+
+
+def simulate(target, mode, workers, max_in_flight, seed=0):
+    rng = np.random.default_rng(seed)
+    shedder = LoadShedder(target)
+    shedder.reset(0.0)
+    free_at = [0.0] * workers
+    completions = []
+    phase_latencies = [[] for _ in PHASES]
+    skipped = [0] * len(PHASES)
+    t = 0.0
+    for phase, (duration, slowdown, faces) in enumerate(PHASES):
+        end = t + duration
+        while t < end:
+            while completions and completions[0][0] <= t:
+                done, latency, job_phase = heapq.heappop(completions)
+                shedder.observe(latency, done)
+                phase_latencies[job_phase].append(latency)
+            shedder.update(t)
+            cost = job_cost(shedder.settings, slowdown, faces, mode, rng)
+            if cost is None or not shedder.take_frame() or len(completions) >= max_in_flight:
+                skipped[phase] += 1
+            else:
+                worker = int(np.argmin(free_at))
+                start = max(t, free_at[worker])
+                free_at[worker] = start + cost
+                heapq.heappush(completions, (start + cost, start + cost - t, phase))
+            t += FRAME_INTERVAL
+    return phase_latencies, skipped, list(shedder.transitions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uyarlanabilir yuk atma benzetimi (karar gecikmesi)")
+    parser.add_argument("--target", type=float, default=TARGET_LATENCY, help="Hedef gecikme (sn)")
+    parser.add_argument("--mode", choices=["faces", "plates"], default="faces")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"Donemler (sn, yavaslama, yuz): {PHASES}, hedef {args.target * 1000:.0f} ms")
+    for label, target in (("kontrol kapali", None), ("kontrol acik", args.target)):
+        latencies, skipped, transitions = simulate(target, args.mode, args.workers, args.max_in_flight)
+        print(f"{label}:")
+        for phase, values in enumerate(latencies):
+            values = np.array(values) * 1000 if values else np.zeros(1)
+            print(f"  donem {phase + 1}: {len(latencies[phase]):5d} is, gecikme p50 {np.percentile(values, 50):6.0f} ms "
+                  f"p95 {np.percentile(values, 95):6.0f} ms, gonderilmeyen kare {skipped[phase]}")
+        for transition in transitions:
+            print(f"  {transition['time']:6.1f} sn -> {transition['level']} {LEVELS[transition['level']]['name']}")
+
+
+if __name__ == '__main__':
+    main()
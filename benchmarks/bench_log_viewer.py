@@ -0,0 +1,69 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_storage import INDEXES, SCHEMA
+from log_query import PAGE_SIZE, fetch_page
+
+# Kayıt penceresinin açılış maliyeti: eski tüm tabloyu okuma (SELECT * ... ORDER BY timestamp DESC)
+# ile keyset sayfalamanın ilk sayfası ve filtreli sorgular. Eski yol ayrıca her satır için bir QLabel
+# oluşturuyordu; bu ölçüme dahil değildir.
+COLUMNS = ["type", "identifier", "timestamp"]
+
+
+def build_db(path, rows):
+    with sqlite3.connect(path) as conn:
+        for sql in SCHEMA:
+            conn.execute(sql)
+        for sql in INDEXES:
+            conn.execute(sql)
+        # database.setup_database ile eklenen kayıt penceresi indeksleri
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_type_timestamp ON recognition_logs(type, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_logs_identifier_timestamp ON recognition_logs(identifier, timestamp)")
+        start = 1.6e9
+        conn.executemany("INSERT INTO recognition_logs (type, identifier, timestamp) VALUES (?, ?, ?)",
+                         ((("face", "plate")[i % 2], f"34 AB {i % 1000}",
+                           time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start + i * 10))) for i in range(rows)))
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def deep_page(conn, pages):
+    after = None
+    for _ in range(pages):
+        _, after = fetch_page(conn, COLUMNS, after=after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayit penceresi: tum tabloyu okuma ve keyset sayfalama")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--pages", type=int, default=50, help="Derin sayfa olcumu icin kaydirilan sayfa sayisi")
+    args = parser.parse_args()
+
+    print(f"{'satir':>9} {'eski (ms)':>10} {'ilk sayfa':>10} {'tur':>8} {'kimlik':>8} {'tarih':>8} {f'{args.pages}. sayfa':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"logs_{size}.db")
+            build_db(path, size)
+            with sqlite3.connect(path) as conn:
+                old = timed_ms(lambda: conn.execute("SELECT * FROM recognition_logs ORDER BY timestamp DESC").fetchall())
+                first = timed_ms(lambda: fetch_page(conn, COLUMNS))
+                by_type = timed_ms(lambda: fetch_page(conn, COLUMNS, {"type": "plate"}))
+                by_identifier = timed_ms(lambda: fetch_page(conn, COLUMNS, {"identifier": "34 AB 7"}))
+                by_date = timed_ms(lambda: fetch_page(conn, COLUMNS, {"since": "2020-09-14 00:00:00",
+                                                                      "until": "2020-09-15 00:00:00"}))
+                deep = timed_ms(lambda: deep_page(conn, args.pages)) / args.pages
+            print(f"{size:>9} {old:>10.1f} {first:>10.2f} {by_type:>8.2f} {by_identifier:>8.2f} {by_date:>8.2f} {deep:>10.2f}")
+    print(f"Sayfa boyutu {PAGE_SIZE} satir.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from log_writer import LogWriter
+
+CREATE_SQL = '''CREATE TABLE recognition_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    type TEXT,
+                    identifier TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)'''
+
+
+# Eski yol: her kayıt için yeni bağlantı, tek satır ekleme ve commit
+def direct_log(db_path, rec_type, identifier):
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO recognition_logs (type, identifier) VALUES (?, ?)", (rec_type, identifier))
+        conn.commit()
+    conn.close()
+
+
+# Kare döngüsünü taklit et: her karede birkaç kayıt, sonra kare başına süreleri döndür
+def run_frames(log, frames, events_per_frame):
+    times = []
+    for frame_no in range(frames):
+        start = time.perf_counter()
+        for i in range(events_per_frame):
+            log('face', f"kisi_{i}")
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tanıma kaydı yazımının kare süresine etkisi")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--events-per-frame", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_db = os.path.join(tmp, "direct.db")
+        queued_db = os.path.join(tmp, "queued.db")
+        for path in (direct_db, queued_db):
+            with sqlite3.connect(path) as conn:
+                conn.execute(CREATE_SQL)
+
+        direct = run_frames(lambda t, i: direct_log(direct_db, t, i), args.frames, args.events_per_frame)
+
+        writer = LogWriter(queued_db, "INSERT INTO recognition_logs (type, identifier) VALUES (?, ?)")
+        queued = run_frames(lambda t, i: writer.write((t, i)), args.frames, args.events_per_frame)
+        start = time.perf_counter()
+        writer.close()
+        close_s = time.perf_counter() - start
+        with sqlite3.connect(queued_db) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM recognition_logs").fetchone()[0]
+
+    print(f"{args.frames} kare, kare basina {args.events_per_frame} kayit")
+    print(f"{'yol':>10} {'p50 ms':>8} {'p99 ms':>8} {'maks ms':>8}")
+    for name, times in (("dogrudan", direct), ("kuyruk", queued)):
+        print(f"{name:>10} {np.percentile(times, 50):>8.3f} {np.percentile(times, 99):>8.3f} {times.max():>8.3f}")
+    print(f"kuyruk: {writer.batches} toplu yazma, {rows} satir, kapanista bosaltma {close_s * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
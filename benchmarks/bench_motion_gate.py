@@ -0,0 +1,105 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_plate_candidates import synthetic_scene
+from motion_gate import HOLD_OFF, MotionGate
+from plate_candidates import find_plate_candidates, rank_candidates
+
+# Hareket kapısının boş sahnedeki işlemci kullanımı ve bir kişi/araç geldiğinde algılama gecikmesi.
+# Sentetik sahne: sabit bir arka plan ve her karede sensör gürültüsü; --idle saniye boyunca boş kalır,
+# sonra sahneye bir nesne girip geçer. Her karede çalışan algılama (plaka adayı çıkarma ve sıralama,
+# face_recognition kuruluysa HOG yüz algılama da) kapılı ve kapısız çalıştırılır. İşlemci kullanımı
+# time.process_time ile ölçülür ve 30 fps'de tek çekirdeğe oranı olarak verilir. OCR ölçüme dahil
+# değildir; gerçek kazanç daha büyüktür.
+FPS = 30
+
+
+def detectors():
+    def plates(frame):
+        candidates, edged = find_plate_candidates(frame)
+        rank_candidates(frame, edged, candidates, len(candidates))
+
+    result = [("plaka adayi", plates)]
+    try:
+        import face_recognition
+    except ImportError:
+        print("face_recognition kurulu degil; yuz algilama olculmedi.")
+        return result
+
+    def faces(frame):
+        small = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+        face_recognition.face_locations(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+
+    return result + [("yuz algilama", faces)]
+
+
+# Boş sahne, ardından soldan sağa geçen bir nesne (araç gövdesi ve plaka)
+def scene_frames(idle_seconds, pass_seconds, rng):
+    background, _ = synthetic_scene(rng)
+    idle = int(idle_seconds * FPS)
+    frames = []
+    for i in range(idle + int(pass_seconds * FPS)):
+        frame = np.clip(background + rng.normal(0, 3, background.shape), 0, 255).astype(np.uint8)
+        if i >= idle:
+            x = int((i - idle) * 640 / (pass_seconds * FPS)) - 200
+            cv2.rectangle(frame, (x, 200), (x + 260, 380), (40, 40, 160), -1)
+            cv2.rectangle(frame, (x + 70, 330), (x + 190, 356), (240, 240, 240), -1)
+            cv2.putText(frame, "34 AB 123", (x + 74, 351), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 2)
+        frames.append(frame)
+    return frames, idle
+
+
+# first: frames'in sahnedeki ilk kare numarası (kapı, kareleri FPS hızında geliyormuş gibi görür)
+def run(frames, detect, gate, first=0):
+    active = []
+    start = time.process_time()
+    for i, frame in enumerate(frames, first):
+        run_detection = gate is None or gate.active(frame, now=i / FPS)
+        if run_detection:
+            detect(frame)
+        active.append(run_detection)
+    return time.process_time() - start, active
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hareket kapisi: bos sahnede islemci kullanimi ve gelis gecikmesi")
+    parser.add_argument("--idle", type=float, default=20, help="Bos sahne suresi (sn)")
+    parser.add_argument("--pass-time", type=float, default=3, help="Nesnenin sahneden gecme suresi (sn)")
+    parser.add_argument("--hold-off", type=float, default=HOLD_OFF)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames, arrival = scene_frames(args.idle, args.pass_time, rng)
+    # Kapı ilk karede açılır ve arka planı öğrenirken hold_off kadar açık kalır; boş sahne ölçümü sonrasından başlar
+    warmup = int(args.hold_off * FPS) + 1
+    warmup_frames, idle_frames, busy_frames = frames[:warmup], frames[warmup:arrival], frames[arrival:]
+
+    gate = MotionGate(hold_off=args.hold_off)
+    gate_cpu, _ = run(frames, lambda frame: None, gate)
+    print(f"Kapi maliyeti: {gate_cpu / len(frames) * 1000:.2f} ms/kare")
+    print(f"{'algilama':>14} {'bos: kapisiz':>13} {'bos: kapili':>12} {'gelis: kapisiz':>15} {'gelis: kapili':>14} {'gecikme':>8}")
+    for name, detect in detectors():
+        gate = MotionGate(hold_off=args.hold_off)
+        ungated_idle, _ = run(idle_frames, detect, None)
+        run(warmup_frames, detect, gate)
+        gated_idle, _ = run(idle_frames, detect, gate, warmup)
+        ungated_busy, _ = run(busy_frames, detect, None)
+        gated_busy, active = run(busy_frames, detect, gate, arrival)
+        # Nesne sahneye girdikten sonra algılamanın ilk çalıştığı kare
+        first = active.index(True) if True in active else len(active)
+        usage = [cpu / len(part) * FPS * 100 for cpu, part in
+                 ((ungated_idle, idle_frames), (gated_idle, idle_frames), (ungated_busy, busy_frames), (gated_busy, busy_frames))]
+        print(f"{name:>14} {usage[0]:>12.1f}% {usage[1]:>11.1f}% {usage[2]:>14.1f}% {usage[3]:>13.1f}% "
+              f"{first:>4d} kare")
+    print(f"Islemci kullanimi {FPS} fps'de tek cekirdege oranla. Gecikme: nesne girdikten sonra algilamanin "
+          f"calismadigi kare sayisi (ilk girdigi karede 0).")
+
+
+if __name__ == '__main__':
+    main()
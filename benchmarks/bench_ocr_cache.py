@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ocr_cache import OCRCache
+
+
+# Kamera gürültüsü eklenmiş ve recognize_plate'teki gibi uyarlamalı eşiklenmiş plaka kesiti
+def plate_crop(text, rng, noise=3.0):
+    gray = np.full((40, 160), 90, np.uint8)
+    cv2.putText(gray, text, (5, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2)
+    noisy = np.clip(gray + rng.normal(0, noise, gray.shape), 0, 255).astype(np.uint8)
+    return cv2.adaptiveThreshold(noisy, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Otopark girişi senaryosunda OCR önbelleği isabet oranı")
+    parser.add_argument("--frames", type=int, default=1800, help="Kare sayısı (30 fps ile 1 dakika)")
+    parser.add_argument("--cars", type=int, default=20, help="Dakikada geçen araç sayısı")
+    parser.add_argument("--candidates", type=int, default=3, help="Kare başına OCR'a giden kesit")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    plates = [f"{rng.integers(1, 82):02d} {''.join(rng.choice(list('ABCDEFGHJKLMNPRSTUVYZ'), 2))} {rng.integers(100, 9999)}"
+              for _ in range(args.cars)]
+    frames_per_car = args.frames // args.cars
+    cache = OCRCache()
+    wrong = 0
+    start = time.perf_counter()
+    for frame_no in range(args.frames):
+        plate = plates[min(frame_no // frames_per_car, args.cars - 1)]
+        # Aynı karedeki diğer adaylar (tabela, pencere) için sabit metinler
+        for text in [plate] + [f"TABELA {i}" for i in range(args.candidates - 1)]:
+            result = cache.lookup(plate_crop(text, rng), lambda image, text=text: text)
+            wrong += result != text
+    elapsed = time.perf_counter() - start
+
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    print(f"{args.frames} kare, {args.cars} arac, kare basina {args.candidates} kesit")
+    print(f"OCR cagrisi: {stats['misses']} / {lookups} (onbelleksiz {lookups}), isabet orani {stats['hits'] / lookups:.1%}")
+    print(f"yanlis metin: {wrong}, tahliye: {stats['evictions']}, suresi dolan: {stats['expirations']}")
+    print(f"kesit basina ozet + arama: {elapsed / lookups * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ocr_service import OCRService, tesseract_read
+
+
+# recognize_plate'teki gibi uyarlamalı eşiklenmiş sentetik plaka kesitleri
+def plate_crops(count, rng):
+    crops = []
+    for _ in range(count):
+        text = f"{rng.integers(1, 82):02d} {''.join(rng.choice(list('ABCDEFGHJKLMNPRSTUVYZ'), 2))} {rng.integers(100, 9999)}"
+        gray = np.full((40, 200), 200, np.uint8)
+        cv2.putText(gray, text, (5, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2)
+        noisy = np.clip(gray + rng.normal(0, 3.0, gray.shape), 0, 255).astype(np.uint8)
+        crops.append(cv2.adaptiveThreshold(noisy, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2))
+    return crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pytesseract ile kalici OCR iscilerinin kesit/sn karsilastirmasi")
+    parser.add_argument("--crops", type=int, default=200, help="Okunacak kesit sayisi")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Denenecek OCR isci sayilari")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 4, 10], help="Istek basina kesit sayilari")
+    args = parser.parse_args()
+
+    crops = plate_crops(args.crops, np.random.default_rng(0))
+
+    start = time.perf_counter()
+    expected = [tesseract_read(crop) for crop in crops]
+    elapsed = time.perf_counter() - start
+    print(f"pytesseract (kesit basina islem): {len(crops) / elapsed:8.1f} kesit/sn")
+
+    for workers in args.workers:
+        service = OCRService(workers=workers)
+        # İlk istek işçilerin motorlarını ısıtır ve ölçüme katılmaz
+        service.read_batch(crops[:workers])
+        for batch in args.batch:
+            batches = [crops[i:i + batch] for i in range(0, len(crops), batch)]
+            start = time.perf_counter()
+            # İşçilerin hepsini meşgul etmek için istekler eşzamanlı gönderilir
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Zaman aşımına uğrayan kesitler None döner ve boş okuma sayılır
+                texts = [item[0] if item else "" for result in pool.map(service.read_batch, batches) for item in result]
+            elapsed = time.perf_counter() - start
+            agreement = np.mean([a == b for a, b in zip(texts, expected)])
+            print(f"OCRService isci={workers} parti={batch:2d}: {len(crops) / elapsed:8.1f} kesit/sn, "
+                  f"pytesseract ile ayni sonuc {agreement:.0%}")
+        print(f"  {service.stats()}")
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from plate_candidates import PLATE_CONTOURS, box_iou, find_plate_candidates, rank_candidates
+
+LETTERS = list('ABCDEFGHJKLMNPRSTUVYZ')
+
+
+def _random_box(rng, size, w, h, boxes):
+    for _ in range(50):
+        x = int(rng.integers(0, size[0] - w))
+        y = int(rng.integers(0, size[1] - h))
+        if all(box_iou((x, y, w, h), other) == 0 for other in boxes):
+            return x, y, w, h
+    return None
+
+
+# Sentetik sahne: gürültülü arka plan, pencere/tabela/tampon gibi dikdörtgen çeldiriciler ve bir plaka.
+# Plaka kutusu (x, y, w, h) ile birlikte döndürülür.
+def synthetic_scene(rng, size=(640, 480), distractors=6):
+    frame = np.empty((size[1], size[0], 3), np.uint8)
+    frame[:] = rng.integers(60, 140, 3)
+    frame = np.clip(frame + rng.normal(0, 6, frame.shape), 0, 255).astype(np.uint8)
+    boxes = []
+
+    plate_w = int(rng.integers(110, 220))
+    plate_h = int(round(plate_w / rng.uniform(4.3, 5.0)))
+    plate = _random_box(rng, size, plate_w, plate_h, boxes)
+    boxes.append(plate)
+
+    for _ in range(distractors):
+        kind = rng.choice(["window", "sign", "bumper", "text_panel"])
+        if kind == "window":
+            w, h = int(rng.integers(80, 200)), int(rng.integers(60, 140))
+        elif kind == "sign":
+            w, h = int(rng.integers(60, 140)), int(rng.integers(40, 80))
+        elif kind == "bumper":
+            w, h = int(rng.integers(200, 400)), int(rng.integers(20, 40))
+        else:
+            w, h = int(rng.integers(120, 240)), int(rng.integers(40, 70))
+        box = _random_box(rng, size, w, h, boxes)
+        if box is None:
+            continue
+        boxes.append(box)
+        x, y, w, h = box
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, -1)
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (20, 20, 20), 2)
+        if kind in ("sign", "text_panel"):
+            words = "DUR" if kind == "sign" else "INDIRIM %50"
+            cv2.putText(frame, words, (x + 6, y + h - h // 3), cv2.FONT_HERSHEY_SIMPLEX, h / 60, (0, 0, 0), 2)
+
+    x, y, w, h = plate
+    cv2.rectangle(frame, (x, y), (x + w, y + h), (245, 245, 245), -1)
+    cv2.rectangle(frame, (x, y), (x + int(w * 0.08), y + h), (160, 60, 0), -1)
+    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 0), 2)
+    text = f"{rng.integers(1, 82):02d} {''.join(rng.choice(LETTERS, 2))} {rng.integers(100, 9999)}"
+    scale = h / 38
+    cv2.putText(frame, text, (x + int(w * 0.1), y + int(h * 0.75)), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), 2)
+    frame = cv2.GaussianBlur(frame, (3, 3), 0)
+    return frame, plate
+
+
+def evaluate(scenes, select):
+    ocr_calls = plate_calls = found = 0
+    elapsed = 0.0
+    for frame, plate in scenes:
+        start = time.perf_counter()
+        boxes = select(frame)
+        elapsed += time.perf_counter() - start
+        hits = sum(box_iou(box, plate) > 0.5 for box in boxes)
+        ocr_calls += len(boxes)
+        plate_calls += hits
+        found += hits > 0
+    n = len(scenes)
+    precision = plate_calls / ocr_calls if ocr_calls else 0.0
+    return ocr_calls / n, precision, found / n, elapsed / n * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plaka adayi puanlamasinin kesinlik/duyarlilik ve kare basina OCR cagrisi olcumu")
+    parser.add_argument("--scenes", type=int, default=300, help="Uretilecek sentetik sahne sayisi")
+    parser.add_argument("--distractors", type=int, default=6, help="Sahne basina plaka olmayan dikdortgen")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1, 2, 3, 5], help="Denenecek kare basina OCR butceleri")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    scenes = [synthetic_scene(rng, distractors=args.distractors) for _ in range(args.scenes)]
+
+    print(f"{args.scenes} sahne, sahne basina {args.distractors} celdirici")
+    print(f"{'yontem':>22} {'OCR/kare':>9} {'kesinlik':>9} {'duyarlilik':>11} {'ms/kare':>8}")
+    # Eski yol: en büyük 10 konturdaki tüm dörtgenler OCR'a gider
+    calls, precision, recall, ms = evaluate(scenes, lambda frame: [box for box, _ in find_plate_candidates(frame, 10)[0]])
+    print(f"{'tum dortgenler (10)':>22} {calls:9.2f} {precision:9.1%} {recall:11.1%} {ms:8.2f}")
+    calls, precision, recall, ms = evaluate(scenes, lambda frame: [box for box, _ in find_plate_candidates(frame)[0]])
+    print(f"{f'tum dortgenler ({PLATE_CONTOURS})':>22} {calls:9.2f} {precision:9.1%} {recall:11.1%} {ms:8.2f}")
+    for budget in args.budgets:
+        def select(frame, budget=budget):
+            candidates, edged = find_plate_candidates(frame)
+            return [box for _, box, _ in rank_candidates(frame, edged, candidates, budget)]
+        calls, precision, recall, ms = evaluate(scenes, select)
+        print(f"{f'puanlama butce={budget}':>22} {calls:9.2f} {precision:9.1%} {recall:11.1%} {ms:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
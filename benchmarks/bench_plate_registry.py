@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from plate_registry import PlateRegistry
+
+LETTERS = list('ABCDEFGHJKLMNPRSTUVYZ')
+
+
+def random_plates(rng, count):
+    plates = set()
+    while len(plates) < count:
+        plates.add(f"{rng.integers(1, 82):02d} {''.join(rng.choice(LETTERS, int(rng.integers(1, 4))))} {rng.integers(10, 9999)}")
+    return sorted(plates)
+
+
+# Bir karakteri değiştirilmiş okuma (OCR hatası)
+def misread(rng, plate):
+    chars = list(plate)
+    positions = [i for i, c in enumerate(chars) if c != ' ']
+    i = int(rng.choice(positions))
+    chars[i] = str(rng.choice([c for c in '0123456789' + ''.join(LETTERS) if c != chars[i]]))
+    return "".join(chars)
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PlateRegistry isaretli plaka aramasi ile eski liste taramasinin karsilastirmasi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Kayitli plaka sayilari")
+    parser.add_argument("--marked", type=float, default=0.1, help="Isaretli plaka orani")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        plates = [{"id": i, "plate_number": p, "marked": int(rng.random() < args.marked)}
+                  for i, p in enumerate(random_plates(rng, size))]
+        marked = [p["plate_number"] for p in plates if p["marked"]]
+        start = time.perf_counter()
+        registry = PlateRegistry(plates)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        hits = [str(rng.choice(marked)) for _ in range(args.queries // 2)]
+        misses = [misread(rng, str(rng.choice(marked))) for _ in range(args.queries // 2)]
+        queries = hits + misses
+
+        # Eski yol: her plaka için işaretli liste yeniden kurulur ve doğrusal aranır
+        old_queries = queries[:max(20, args.queries * 1000 // size)]
+        old_us, _ = timed(lambda q: q in [p["plate_number"] for p in plates if p["marked"]], old_queries)
+        exact_us, _ = timed(lambda q: registry.get(q) is not None and registry.get(q)["marked"], queries)
+        fuzzy_us, results = timed(registry.watch_match, queries)
+        fuzzy_recall = np.mean([r is not None for r in results[len(hits):]])
+
+        print(f"{size:7d} plaka ({len(marked)} isaretli), dizin kurma {build_ms:7.1f} ms")
+        print(f"    eski liste taramasi : {old_us:10.1f} us/sorgu")
+        print(f"    tam anahtar         : {exact_us:10.2f} us/sorgu")
+        print(f"    bulanik (1 duzenleme): {fuzzy_us:10.2f} us/sorgu, tek karakter hatali okumalarda isabet {fuzzy_recall:.1%}")
+        print(f"    {registry.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import Storage, encoding_to_blob
+
+SCHEMA = ('''CREATE TABLE faces (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                encoding BLOB,
+                image BLOB,
+                marked INTEGER DEFAULT 0)''',
+          '''CREATE TABLE plates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                plate_number TEXT,
+                marked INTEGER DEFAULT 0)''',
+          '''CREATE TABLE recognition_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type TEXT,
+                identifier TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+
+# yuzveplaka.setup_database ile aynı indeksler
+INDEXES = ("CREATE INDEX IF NOT EXISTS idx_faces_name ON faces(name)",
+           "CREATE INDEX IF NOT EXISTS idx_plates_plate_number ON plates(plate_number)",
+           "CREATE INDEX IF NOT EXISTS idx_logs_type_identifier_timestamp ON recognition_logs(type, identifier, timestamp)",
+           "CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON recognition_logs(timestamp)")
+
+
+def build_db(path, rows, rng):
+    with sqlite3.connect(path) as conn:
+        for sql in SCHEMA:
+            conn.execute(sql)
+        encoding = encoding_to_blob(rng.normal(0, 0.09, 128))
+        conn.executemany("INSERT INTO faces (name, encoding) VALUES (?, ?)",
+                         ((f"kisi_{i}", encoding) for i in range(rows)))
+        conn.executemany("INSERT INTO plates (plate_number) VALUES (?)",
+                         ((f"{i % 81 + 1:02d} AB {i:05d}",) for i in range(rows)))
+        conn.executemany("INSERT INTO recognition_logs (type, identifier, timestamp) VALUES (?, ?, datetime('now', ?))",
+                         (('face', f"kisi_{i % 1000}", f"-{i} seconds") for i in range(rows)))
+
+
+# Uygulamadaki yardımcı fonksiyonların çalıştırdığı ifadeler
+def operations(rows):
+    i = rows // 2
+    return (
+        ("add_face", "INSERT INTO faces (name, encoding) VALUES (?, ?)", ("yeni", b"\0" * 512), True),
+        ("mark_face", "UPDATE faces SET marked = 1 WHERE name = ?", (f"kisi_{i}",), True),
+        ("mark_plate", "UPDATE plates SET marked = 1 WHERE plate_number = ?", (f"{i % 81 + 1:02d} AB {i:05d}",), True),
+        ("delete_plate", "DELETE FROM plates WHERE plate_number = ?", ("00 XX 00000",), True),
+        ("log_recognition", "INSERT INTO recognition_logs (type, identifier) VALUES (?, ?)", ('face', 'kisi_1'), True),
+        ("son_kayitlar", "SELECT * FROM recognition_logs ORDER BY timestamp DESC LIMIT 50", (), False),
+        ("kisi_kayitlari", "SELECT timestamp FROM recognition_logs WHERE type = ? AND identifier = ? ORDER BY timestamp DESC LIMIT 20",
+         ('face', 'kisi_7'), False),
+    )
+
+
+# Eski yol: her işlemde yeni bağlantı, varsayılan günlük modu, indeks yok
+def run_legacy(path, sql, params, write):
+    with sqlite3.connect(path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        if write:
+            conn.commit()
+        else:
+            cursor.fetchall()
+    conn.close()
+
+
+def run_storage(storage, sql, params, write):
+    if write:
+        storage.execute(sql, params)
+    else:
+        storage.query(sql, params)
+
+
+def time_op(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Veritabanı CRUD işlemlerinin süresi")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        storage_db = os.path.join(tmp, "storage.db")
+        build_db(legacy_db, args.rows, rng)
+        build_db(storage_db, args.rows, rng)
+        storage = Storage(storage_db)
+        for sql in INDEXES:
+            storage.execute(sql)
+
+        print(f"tablo basina {args.rows} satir")
+        print(f"{'islem':>16} {'eski (ms)':>10} {'Storage (ms)':>13}")
+        for name, sql, params, write in operations(args.rows):
+            legacy_ms = time_op(lambda: run_legacy(legacy_db, sql, params, write), args.repeat)
+            storage_ms = time_op(lambda: run_storage(storage, sql, params, write), args.repeat)
+            print(f"{name:>16} {legacy_ms:>10.3f} {storage_ms:>13.3f}")
+        storage.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ann_index import IVFIndex
+from face_gallery import FaceGallery, DEFAULT_TOLERANCE
+from storage import encoding_from_blob
+
+
+# Veritabanındaki yüz kodlamalarını oku
+def load_db_encodings(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT id, encoding FROM faces").fetchall()
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    encodings = np.array([encoding_from_blob(row[1]) for row in rows], dtype=np.float32).reshape(-1, 128)
+    return ids, encodings
+
+
+# Kimlik kümeleri halinde sentetik galeri: her kimliğin merkezi etrafında birkaç kayıt
+def synthetic_encodings(count, rng):
+    identities = rng.normal(0, 0.09, size=(max(1, count // 3), 128))
+    owner = rng.integers(0, len(identities), size=count)
+    encodings = identities[owner] + rng.normal(0, 0.02, size=(count, 128))
+    return np.arange(1, count + 1, dtype=np.int64), encodings.astype(np.float32)
+
+
+# Kayıtlı yüzlere gürültü eklenmiş gerçek sorgular ve galeride olmayan sahte sorgular
+def make_queries(encodings, count, noise, rng):
+    genuine = encodings[rng.integers(0, len(encodings), size=count // 2)]
+    genuine = genuine + rng.normal(0, noise, size=genuine.shape)
+    impostors = rng.normal(0, 0.09, size=(count - len(genuine), 128))
+    return np.vstack([genuine, impostors]).astype(np.float32)
+
+
+def decisions(matches, tolerance):
+    return [m[0]["id"] if m and m[0]["distance"] <= tolerance else None for m in matches]
+
+
+# Sorguları kare başına birkaç yüz olacak şekilde gruplayıp eşleştir; kare başına süreyi de döndür
+def match_frames(gallery, queries, faces_per_frame):
+    matches = []
+    start = time.perf_counter()
+    for i in range(0, len(queries), faces_per_frame):
+        matches.extend(gallery.match(queries[i:i + faces_per_frame]))
+    frames = -(-len(queries) // faces_per_frame)
+    return matches, (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN indeksinin kaba kuvvet aramaya göre geri çağırma ve karar uyumu")
+    parser.add_argument("--db", help="Yüzlerin okunacağı veritabanı (verilmezse sentetik galeri)")
+    parser.add_argument("--synthetic", type=int, default=50000, help="Sentetik galeri boyutu")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--faces-per-frame", type=int, default=3)
+    parser.add_argument("--noise", type=float, default=0.025, help="Gerçek sorgulara eklenen gürültü")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.db:
+        ids, encodings = load_db_encodings(args.db)
+    else:
+        ids, encodings = synthetic_encodings(args.synthetic, rng)
+    faces = [{"id": int(face_id), "name": str(face_id), "encoding": enc, "marked": 0}
+             for face_id, enc in zip(ids, encodings)]
+    queries = make_queries(encodings, args.queries, args.noise, rng)
+
+    gallery = FaceGallery(faces, tolerance=args.tolerance)
+    exact, exact_ms = match_frames(gallery, queries, args.faces_per_frame)
+    exact_decisions = decisions(exact, args.tolerance)
+    accepted = [i for i, d in enumerate(exact_decisions) if d is not None]
+
+    start = time.perf_counter()
+    index = IVFIndex(n_lists=args.n_lists)
+    index.train(ids, encodings)
+    print(f"galeri: {len(ids)} yuz, {len(index.centroids)} liste, egitim {time.perf_counter() - start:.1f} s")
+    print(f"kaba kuvvet: {exact_ms:.3f} ms/kare, {len(accepted)}/{len(queries)} sorgu kabul edildi")
+    # recall@1 sadece kaba kuvvetin kabul ettiği sorgular üzerinden hesaplanır
+    print(f"{'n_probe':>8} {'recall@1':>9} {'karar uyumu':>12} {'ms/kare':>9}")
+    gallery.index = index
+    for n_probe in args.n_probe:
+        index.n_probe = n_probe
+        approx, approx_ms = match_frames(gallery, queries, args.faces_per_frame)
+        approx_decisions = decisions(approx, args.tolerance)
+        recall = np.mean([approx_decisions[i] == exact_decisions[i] for i in accepted]) if accepted else 1.0
+        agreement = np.mean([a == e for a, e in zip(approx_decisions, exact_decisions)])
+        print(f"{n_probe:>8} {recall:>9.4f} {agreement:>12.4f} {approx_ms:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
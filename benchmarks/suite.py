@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_face_gallery import make_faces
+from bench_ocr_service import plate_crops
+from bench_plate_candidates import synthetic_scene
+from face_gallery import FaceGallery
+from plate_candidates import find_plate_candidates, rank_candidates
+
+# Tanıma hattının sıcak yollarını ayrı ayrı ölçen, tekrarlanabilir (sabit tohumlu) ölçüm takımı.
+# Sonuçlar JSON olarak kaydedilir; --compare ile önceki bir temel ölçümle karşılaştırılır ve
+# eşiği aşan gerilemelerde çıkış kodu 1 olur.
+#
+#   python benchmarks/suite.py --save benchmarks/baseline.json
+#   python benchmarks/suite.py --compare benchmarks/baseline.json
+
+SEED = 0
+# Ölçümün gürültüsüne göre varsayılan gerileme eşikleri (oran)
+DEFAULT_THRESHOLD = 0.2
+NOISY_THRESHOLD = 0.35
+
+
+# Ölçülemeyen (bağımlılığı eksik) durumlar için
+class Skip(Exception):
+    pass
+
+
+# fn'i rounds kez repeat tekrar çalıştır; tur başına süre medyanı (ms)
+def median_ms(fn, repeat, rounds=5):
+    fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        samples.append((time.perf_counter() - start) / repeat * 1000)
+    return statistics.median(samples)
+
+
+def _import_database():
+    try:
+        import database
+    except ImportError as e:
+        raise Skip(f"database ice aktarilamadi: {e}")
+    return database
+
+
+def _temp_database(database, directory):
+    database.open_database(os.path.join(directory, "suite.db"))
+    database.setup_database()
+    return database
+
+
+def bench_face_match(sizes):
+    rng = np.random.default_rng(SEED)
+    results = {}
+    for size in sizes:
+        gallery = FaceGallery(make_faces(size, rng), flag_key="marked")
+        # Kare başına 4 yüz: recognize_faces içindeki eşleştirme adımı
+        queries = rng.normal(0, 0.09, size=(4, 128))
+        results[f"face_match_{size}"] = (median_ms(lambda: gallery.best_matches(queries), 20), "ms/kare", False,
+                                         DEFAULT_THRESHOLD)
+    return results
+
+
+def bench_is_new_face(sizes):
+    database = _import_database()
+    rng = np.random.default_rng(SEED)
+    results = {}
+    for size in sizes:
+        faces = make_faces(size, rng)
+        query = rng.normal(0, 0.09, 128)
+        results[f"is_new_face_{size}"] = (median_ms(lambda: database.is_new_face(query, faces), 3), "ms/cagri",
+                                          False, DEFAULT_THRESHOLD)
+    return results
+
+
+def bench_plate_candidates(scenes=30):
+    rng = np.random.default_rng(SEED)
+    frames = [synthetic_scene(rng)[0] for _ in range(scenes)]
+
+    def run():
+        for frame in frames:
+            candidates, edged = find_plate_candidates(frame)
+            rank_candidates(frame, edged, candidates, 3)
+    return {"plate_candidates": (median_ms(run, 1) / scenes, "ms/kare", False, NOISY_THRESHOLD)}
+
+
+def bench_plate_ocr(crops=30):
+    if shutil.which("tesseract") is None:
+        raise Skip("tesseract bulunamadi")
+    from ocr_service import OCRService
+    images = plate_crops(crops, np.random.default_rng(SEED))
+    service = OCRService(workers=1)
+    try:
+        ms = median_ms(lambda: [service.read_batch(images[i:i + 3]) for i in range(0, crops, 3)], 1, rounds=3)
+    finally:
+        service.close()
+    return {"plate_ocr": (crops / ms * 1000, "kesit/sn", True, NOISY_THRESHOLD)}
+
+
+def bench_loading(directory, faces=10000, plates=10000):
+    database = _temp_database(_import_database(), directory)
+    rng = np.random.default_rng(SEED)
+    conn = database.create_connection()
+    image = bytes(rng.integers(0, 255, 20000, dtype=np.uint8))
+    with conn:
+        conn.executemany("INSERT INTO faces (name, encoding, image, marked) VALUES (?, ?, ?, ?)",
+                         ((face["name"], database.encoding_to_blob(face["encoding"]), image, int(face["marked"]))
+                          for face in make_faces(faces, rng)))
+        conn.executemany("INSERT INTO plates (plate_number, marked) VALUES (?, ?)",
+                         ((f"{i % 81 + 1:02d} AB {i}", i % 10 == 0) for i in range(plates)))
+    return {f"get_faces_{faces}": (median_ms(database.get_faces, 1), "ms", False, NOISY_THRESHOLD),
+            f"get_plates_{plates}": (median_ms(database.get_plates, 1), "ms", False, NOISY_THRESHOLD)}
+
+
+def bench_log_recognition(directory, rows=20000):
+    database = _temp_database(_import_database(), directory)
+    start = time.perf_counter()
+    for i in range(rows):
+        database.log_recognition('plate', f"34 AB {i}")
+    # Ölçüme kuyruğun diske yazılması da dahildir
+    database.log_writer.close()
+    elapsed = time.perf_counter() - start
+    return {"log_recognition": (rows / elapsed, "kayit/sn", True, NOISY_THRESHOLD)}
+
+
+# Arayüzdeki kare gösterimi: BGR -> RGB -> QImage -> QPixmap
+def bench_qimage():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtGui import QGuiApplication, QImage, QPixmap
+    except ImportError as e:
+        raise Skip(f"PyQt5 bulunamadi: {e}")
+    app = QGuiApplication.instance() or QGuiApplication([])
+    frame = np.random.default_rng(SEED).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    def convert():
+        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb_image.shape
+        return QPixmap.fromImage(QImage(rgb_image.data, w, h, ch * w, QImage.Format_RGB888))
+    result = {"qimage_convert": (median_ms(convert, 50), "ms/kare", False, NOISY_THRESHOLD)}
+    del app
+    return result
+
+
+def run_suite(args):
+    directory = tempfile.mkdtemp(prefix="suite_")
+    cases = [
+        ("face_match", lambda: bench_face_match(args.gallery_sizes)),
+        ("is_new_face", lambda: bench_is_new_face(args.is_new_face_sizes)),
+        ("plate_candidates", bench_plate_candidates),
+        ("plate_ocr", bench_plate_ocr),
+        ("loading", lambda: bench_loading(directory)),
+        ("log_recognition", lambda: bench_log_recognition(directory)),
+        ("qimage", bench_qimage),
+    ]
+    results, skipped = {}, {}
+    try:
+        for name, case in cases:
+            if args.only and name not in args.only:
+                continue
+            try:
+                for key, (value, unit, higher_is_better, threshold) in case().items():
+                    results[key] = {"value": round(value, 4), "unit": unit,
+                                    "higher_is_better": higher_is_better, "threshold": threshold}
+                    print(f"{key:24s} {value:12.3f} {unit}")
+            except Skip as e:
+                skipped[name] = str(e)
+                print(f"{name:24s} atlandi: {e}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    meta = {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__,
+            "machine": platform.machine(), "system": platform.system(), "cpus": os.cpu_count(),
+            "time": time.strftime('%Y-%m-%d %H:%M:%S')}
+    return {"meta": meta, "results": results, "skipped": skipped}
+
+
+# Temel ölçümle karşılaştır; gerileyen durumların listesini döndürür
+def compare(baseline, current):
+    regressions = []
+    print(f"\n{'durum':24s} {'temel':>12s} {'simdi':>12s} {'degisim':>9s}")
+    for key, base in baseline["results"].items():
+        now = current["results"].get(key)
+        if now is None:
+            continue
+        change = now["value"] / base["value"] - 1 if base["value"] else 0.0
+        worse = -change if base["higher_is_better"] else change
+        flag = "GERILEME" if worse > base["threshold"] else ""
+        if flag:
+            regressions.append(key)
+        print(f"{key:24s} {base['value']:12.3f} {now['value']:12.3f} {change:+9.1%} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tanima hattinin sicak yollari icin tekrarlanabilir olcum takimi")
+    parser.add_argument("--save", help="Sonuclarin yazilacagi JSON dosyasi (temel olcum)")
+    parser.add_argument("--compare", help="Karsilastirilacak temel olcum JSON dosyasi")
+    parser.add_argument("--only", nargs="+", help="Sadece bu durumlari calistir")
+    parser.add_argument("--gallery-sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--is-new-face-sizes", type=int, nargs="+", default=[1000])
+    args = parser.parse_args()
+
+    current = run_suite(args)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuclar {args.save} dosyasina yazildi.")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("machine") != current["meta"]["machine"] or baseline["meta"].get("cpus") != current["meta"]["cpus"]:
+            print("Uyari: temel olcum farkli bir makinede alinmis.")
+        regressions = compare(baseline, current)
+        if regressions:
+            print(f"\n{len(regressions)} durumda gerileme: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from metrics import metrics
+
+
+# Kamerayı ayrı bir iş parçacığında sürekli okuyup son birkaç kareyi zaman damgasıyla tutan yakalayıcı.
+# İşleme döngüsü her zaman en yeni kareyi alır; arada kaçırılan kareler sayılır.
+# realtime=True ile video dosyası kendi kare hızında okunur ve kamera yerine kullanılabilir;
+# loop=True ile dosya bitince başa sarılır.
+class CaptureThread(threading.Thread):
+    def __init__(self, source=0, width=None, height=None, buffer_size=2, realtime=False, loop=False):
+        super().__init__(daemon=True)
+        self.source = source
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = cv2.VideoCapture(source)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self._frames = deque(maxlen=buffer_size)
+        self._condition = threading.Condition()
+        self._running = False
+        self._seq = 0
+        self._last_read_seq = 0
+        self.finished = False
+        self.captured_frames = 0
+        self.dropped_frames = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def start(self):
+        self._running = True
+        super().start()
+        return self
+
+    def run(self):
+        interval = 0.0
+        if self.realtime and isinstance(self.source, str):
+            file_fps = self.cap.get(cv2.CAP_PROP_FPS)
+            interval = 1.0 / file_fps if file_fps and file_fps > 0 else 1.0 / 25
+        next_frame = time.monotonic()
+        while self._running:
+            if interval:
+                delay = next_frame - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_frame = max(next_frame + interval, time.monotonic() - interval)
+            ret, frame = self.cap.read()
+            if not ret:
+                # Video dosyası bittiyse dur (ya da başa sar), kamera ise kısa bir süre sonra tekrar dene
+                if isinstance(self.source, str):
+                    if self.loop and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0) and self.captured_frames:
+                        continue
+                    break
+                time.sleep(0.01)
+                continue
+            with self._condition:
+                self._seq += 1
+                self.captured_frames += 1
+                self._frames.append({"seq": self._seq, "timestamp": time.monotonic(), "frame": frame})
+                self._condition.notify_all()
+        with self._condition:
+            self.finished = True
+            self._condition.notify_all()
+        # Kamerayı sadece okuyan iş parçacığı bırakır; cap.read() içinde takılıysa okuma bitince bırakılır
+        self.cap.release()
+
+    # En yeni kareyi döndür; son okumadan beri yeni kare yoksa timeout kadar bekler, gelmezse None.
+    # Dönen sözlükteki "dropped", bu okuma ile bir önceki arasında işlenmeden atlanan kare sayısıdır.
+    def read_latest(self, timeout=0):
+        def has_new():
+            return self.finished or (self._frames and self._frames[-1]["seq"] > self._last_read_seq)
+
+        with self._condition:
+            if not self._condition.wait_for(has_new, timeout) or not self._frames:
+                return None
+            latest = self._frames[-1]
+            if latest["seq"] <= self._last_read_seq:
+                return None
+            dropped = latest["seq"] - self._last_read_seq - 1 if self._last_read_seq else 0
+            self._last_read_seq = latest["seq"]
+            self.dropped_frames += dropped
+        age = time.monotonic() - latest["timestamp"]
+        # Karenin yakalandıktan sonra işlenmeye alınana kadar beklediği süre
+        metrics.observe("capture_age", age)
+        metrics.gauge("dropped_frames", self.dropped_frames)
+        return dict(latest, dropped=dropped, age=age)
+
+    # cv2.VideoCapture.read ile aynı biçimde (ret, frame) döndürür
+    def read(self, timeout=0):
+        latest = self.read_latest(timeout)
+        if latest is None:
+            return False, None
+        return True, latest["frame"]
+
+    def stop(self):
+        self._running = False
+        if self.is_alive():
+            self.join(timeout=1.0)
+
+    # İş parçacığı hiç başlatılmadıysa kamera burada bırakılır; başlatıldıysa run() çıkarken bırakır
+    def release(self):
+        self.stop()
+        if self.ident is None:
+            self.cap.release()
@@ -0,0 +1,205 @@
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from face_gallery import DEFAULT_TOLERANCE
+from log_writer import LogWriter
+from recognition import detect_faces, detect_plates
+from storage import (Storage, encoding_to_blob, encoding_from_blob, migrate_encodings, migrate_thumbnails,
+                     make_thumbnail, face_thumbnail)
+
+# Arayüzden bağımsız veritabanı ve tanıma yardımcıları; hem arayüz hem de komut satırı
+# toplu işleme (batch_process.py) tarafından kullanılır.
+
+DB_PATH = 'recognition.db'
+# Her iş parçacığı için uzun ömürlü, WAL modunda bağlantı
+db = Storage(DB_PATH)
+
+# Tanıma kayıtları arka planda toplu olarak yazılır
+LOG_INSERT_SQL = "INSERT INTO recognition_logs (type, identifier, timestamp) VALUES (?, ?, ?)"
+log_writer = LogWriter(db, LOG_INSERT_SQL)
+
+# Başka bir veritabanı dosyasına geç (ör. komut satırından --db ile); bekleyen kayıtlar önce yazılır
+def open_database(db_path):
+    global DB_PATH, db, log_writer
+    log_writer.close()
+    DB_PATH = db_path
+    db = Storage(db_path)
+    log_writer = LogWriter(db, LOG_INSERT_SQL)
+
+# Veritabanı bağlantısı (bu iş parçacığının paylaşılan bağlantısı, kapatılmamalı)
+def create_connection():
+    return db.connection()
+
+# Veritabanı kurulumu ve güncelleme
+def setup_database():
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''CREATE TABLE IF NOT EXISTS faces (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            name TEXT,
+                            encoding BLOB,
+                            image BLOB,
+                            marked INTEGER DEFAULT 0)''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS plates (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            plate_number TEXT,
+                            marked INTEGER DEFAULT 0)''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS recognition_logs (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            type TEXT,
+                            identifier TEXT,
+                            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_faces_name ON faces(name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_plates_plate_number ON plates(plate_number)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_type_identifier_timestamp ON recognition_logs(type, identifier, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON recognition_logs(timestamp)")
+        # Kayıt penceresinin tür ve isim/plaka filtreleri için (sıralama da dizinden gelir)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_type_timestamp ON recognition_logs(type, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_identifier_timestamp ON recognition_logs(identifier, timestamp)")
+        conn.commit()
+        migrate_encodings(conn)
+        migrate_thumbnails(conn)
+
+# Veritabanına yüz ekleme
+def add_face(name, encoding, image):
+    encoding_blob = encoding_to_blob(encoding)
+    thumbnail = make_thumbnail(image)
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO faces (name, encoding, image, thumbnail) VALUES (?, ?, ?, ?)",
+                       (name, encoding_blob, image, thumbnail))
+        conn.commit()
+        return cursor.lastrowid
+
+# Veritabanındaki tüm yüzleri alma (resimler hariç, bkz. get_face_image)
+def get_faces():
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, name, encoding, marked FROM faces")
+        faces = cursor.fetchall()
+    return [{"id": face[0], "name": face[1], "encoding": encoding_from_blob(face[2]), "marked": face[3]} for face in faces]
+
+# Bir yüzün resmini ihtiyaç olduğunda alma
+def get_face_image(face_id):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT image FROM faces WHERE id = ?", (face_id,))
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+# Bir yüzün küçük resmini alma (kayıtlı yüzler listesi için)
+def get_face_thumbnail(face_id):
+    return face_thumbnail(create_connection(), face_id)
+
+# Veritabanında bir yüzü işaretleme
+def mark_face(name):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE faces SET marked = 1 WHERE name = ?", (name,))
+        conn.commit()
+
+# Veritabanında bir yüzün işaretini kaldırma
+def unmark_face(name):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE faces SET marked = 0 WHERE name = ?", (name,))
+        conn.commit()
+
+# Veritabanından bir yüzü silme
+def delete_face(name):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM faces WHERE name = ?", (name,))
+        conn.commit()
+
+# Veritabanındaki tüm yüzleri işaretleme
+def mark_all_faces():
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE faces SET marked = 1")
+        conn.commit()
+
+# Veritabanına plaka ekleme
+def add_plate(plate_number):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO plates (plate_number) VALUES (?)", (plate_number,))
+        conn.commit()
+        return cursor.lastrowid
+
+# Veritabanındaki tüm plakaları alma
+def get_plates():
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM plates")
+        plates = cursor.fetchall()
+    return [{"id": plate[0], "plate_number": plate[1], "marked": plate[2]} for plate in plates]
+
+# Veritabanında bir plakayı işaretleme
+def mark_plate(plate_number):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE plates SET marked = 1 WHERE plate_number = ?", (plate_number,))
+        conn.commit()
+
+# Veritabanında bir plakanın işaretini kaldırma
+def unmark_plate(plate_number):
+    with create_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE plates SET marked = 0 WHERE plate_number = ?", (plate_number,))
+        conn.commit()
+
+# Tanıma olayını kaydetme (kuyruğa eklenir, diske beklenmez; zaman CURRENT_TIMESTAMP gibi UTC)
+def log_recognition(rec_type, identifier):
+    log_writer.write((rec_type, identifier, time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())))
+
+# Yüzün yeni olup olmadığını kontrol etme: tüm kayıtlı kodlamalara uzaklık tek bir NumPy işlemiyle
+# hesaplanır (compare_faces ile aynı eşik ve karşılaştırma)
+def is_new_face(face_encoding, known_faces, tolerance=DEFAULT_TOLERANCE):
+    known_faces = list(known_faces)
+    if not known_faces:
+        return True
+    known = np.array([known_face["encoding"] for known_face in known_faces], dtype=np.float32)
+    distances = np.linalg.norm(known - np.asarray(face_encoding, dtype=np.float32), axis=1)
+    return not np.any(distances <= tolerance)
+
+# Kodlanmış yüzleri galeriyle eşleştirme (tüm yüzler tek seferde eşleştirilir).
+# log=False ile işaretli yüzler kaydedilmez (sonuçları başka bir işleme dönen işçiler için).
+def match_faces(face_encodings, face_gallery, log=True):
+    face_names = []
+    for match in face_gallery.best_matches(face_encodings):
+        name = "Yeni Yuz"
+        if match is not None:
+            name = match["name"]
+            if name == "Isimsiz":
+                name = "Kayitli Ama Isimsiz"
+            # Bu yüz işaretlenmiş mi kontrol et
+            if match["marked"] and log:
+                log_recognition('face', name)
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                print(f"Marked face {name} recognized at {timestamp}!")
+        face_names.append(name)
+    return face_names
+
+# Bir karedeki yüzleri tanıma
+def recognize_faces(frame, face_gallery, log=True):
+    face_locations, face_encodings = detect_faces(frame)
+    return face_locations, match_faces(face_encodings, face_gallery, log)
+
+# Tanınan plakaları kaydetme
+def log_plates(plate_numbers):
+    for plate_text in plate_numbers:
+        log_recognition('plate', plate_text)
+
+# Bir karedeki plakaları tanıma
+def recognize_plate(frame, log=True):
+    plate_locations, recognized_plates = detect_plates(frame)
+    if log:
+        log_plates(recognized_plates)
+    for (x, y, w, h), plate_text in zip(plate_locations, recognized_plates):
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(frame, plate_text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+    return plate_locations, recognized_plates
@@ -0,0 +1,214 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import face_recognition
+import numpy as np
+
+import database
+from ann_index import index_path_for
+from batch_process import IMAGE_EXTENSIONS
+from face_gallery import DEFAULT_TOLERANCE, FaceGallery
+from storage import encoding_from_blob, encoding_to_blob, migrate_encodings, migrate_thumbnails, thumbnail_from_image
+
+# Klasörden ya da CSV'den toplu yüz kaydı. Resimler bir işlem havuzunda kodlanır, zaten kayıtlı
+# (ya da bu çalıştırmada eklenmiş) yüzler atlanır ve kayıtlar toplu işlemlerle yazılır. Her işlemden
+# sonra işlenen dosyalar kontrol noktası dosyasına eklenir; yarıda kalan çalıştırma kaldığı yerden sürer.
+#
+#   python enroll_faces.py ogrenciler/ --db recognition.db
+#   python enroll_faces.py liste.csv --db YuzTanimaliTurnike/student_faces.db --rejected reddedilen.csv
+#
+# Klasörde alt klasörler varsa isim alt klasörün adıdır (ogrenciler/Ali Veli/1.jpg), yoksa dosya adı.
+# CSV satırları: yol,isim (göreli yollar CSV'nin klasörüne göredir).
+
+# Algılama için resmin en uzun kenarı bu boyuta küçültülür
+ENCODE_MAX_SIDE = 1024
+BATCH_SIZE = 200
+INSERT_SQL = "INSERT INTO faces (name, encoding, image, thumbnail) VALUES (?, ?, ?, ?)"
+REASONS = {"no_face": "yuz yok", "multiple_faces": "birden fazla yuz", "duplicate": "zaten kayitli",
+           "unreadable": "okunamadi"}
+
+
+# [(yol, isim)]
+def list_images(source):
+    if os.path.isdir(source):
+        entries = []
+        for root, _, files in os.walk(source):
+            for file_name in sorted(files):
+                stem, ext = os.path.splitext(file_name)
+                if ext.lower() not in IMAGE_EXTENSIONS:
+                    continue
+                name = os.path.basename(root) if os.path.abspath(root) != os.path.abspath(source) else stem
+                entries.append((os.path.join(root, file_name), name))
+        return entries
+    base = os.path.dirname(os.path.abspath(source))
+    entries = []
+    with open(source, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or [cell.strip().lower() for cell in row[:2]] == ["path", "name"]:
+                continue
+            path, name = row[0].strip(), row[1].strip()
+            entries.append((path if os.path.isabs(path) else os.path.join(base, path), name))
+    return entries
+
+
+# İşçide çalışır: (yol, durum, kodlama, resim baytları, küçük resim)
+def encode_image(path):
+    try:
+        with open(path, 'rb') as f:
+            image_blob = f.read()
+    except OSError:
+        return path, "unreadable", None, None, None
+    image = cv2.imdecode(np.frombuffer(image_blob, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return path, "unreadable", None, None, None
+    scale = ENCODE_MAX_SIDE / max(image.shape[:2])
+    small = cv2.resize(image, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1 else image
+    rgb_image = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+    face_locations = face_recognition.face_locations(rgb_image)
+    if not face_locations:
+        return path, "no_face", None, None, None
+    if len(face_locations) > 1:
+        return path, "multiple_faces", None, None, None
+    encoding = face_recognition.face_encodings(rgb_image, face_locations)[0]
+    return path, "ok", encoding, image_blob, thumbnail_from_image(image)
+
+
+def load_checkpoint(path):
+    done = set()
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError):
+                    continue
+    return done
+
+
+def load_gallery(conn):
+    rows = conn.execute("SELECT id, name, encoding FROM faces").fetchall()
+    return FaceGallery(({"id": row[0], "name": row[1], "encoding": encoding_from_blob(row[2]), "marked": 0}
+                        for row in rows if row[2] is not None), flag_key="marked")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Klasorden ya da CSV'den paralel, devam ettirilebilir toplu yuz kaydi")
+    parser.add_argument("source", help="Resim klasoru ya da yol,isim satirlari iceren CSV")
+    parser.add_argument("--db", default=database.DB_PATH, help="Yuzlerin eklenecegi veritabani")
+    parser.add_argument("--workers", type=int, default=None, help="Islem sayisi (varsayilan: cekirdek sayisi)")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="Tek islemde yazilan kayit sayisi")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Ayni kisi sayilan en fazla uzaklik")
+    parser.add_argument("--checkpoint", help="Kontrol noktasi dosyasi (varsayilan: <db>.enroll.jsonl)")
+    parser.add_argument("--restart", action="store_true", help="Kontrol noktasini yok sayip bastan basla")
+    parser.add_argument("--rejected", help="Reddedilen resimlerin yazilacagi CSV dosyasi")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or args.db + ".enroll.jsonl"
+    if args.restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    entries = list_images(args.source)
+    done = load_checkpoint(checkpoint_path)
+    names = dict(entries)
+    paths = [path for path, _ in entries if path not in done]
+    print(f"{len(entries)} resim, {len(entries) - len(paths)} tanesi onceki calistirmada islenmis.")
+    if not paths:
+        return
+
+    # Şema uygulamaya göre farklıdır (yuzveplaka: marked, turnike: access_allowed); tablo yoksa
+    # veritabanı önce ilgili uygulamanın setup_database'i ile oluşturulmalıdır
+    if not os.path.exists(args.db):
+        print(f"{args.db} bulunamadi; once uygulamayi bir kez calistirarak veritabanini olusturun.")
+        return
+    database.open_database(args.db)
+    conn = database.create_connection()
+    if conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'faces'").fetchone() is None:
+        print(f"{args.db} icinde faces tablosu yok; once uygulamayi bir kez calistirarak veritabanini olusturun.")
+        return
+    # Eski veritabanlarındaki pickle kodlamaları galeri yüklenmeden önce dönüştürülür
+    migrate_encodings(conn)
+    migrate_thumbnails(conn)
+    gallery = load_gallery(conn)
+    gallery.tolerance = args.tolerance
+    gallery.enable_index(index_path_for(args.db))
+    print(f"Veritabaninda {len(gallery)} yuz var.")
+
+    counts = Counter()
+    rejected = []
+    pending = []
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+
+    # Bekleyen kayıtları tek işlemde yaz, sonra kontrol noktasına ekle
+    def commit():
+        conn.commit()
+        for record in pending:
+            checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+        pending.clear()
+
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    processed = 0
+    # dlib ve OpenCV iş parçacıklarıyla fork güvenli olmadığı için işlemler spawn ile başlatılır
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        for path, status, encoding, image_blob, thumbnail in pool.map(encode_image, paths, chunksize=4):
+            name = names[path]
+            record = {"path": path, "name": name, "status": status}
+            if status == "ok":
+                match = gallery.best_matches([encoding])[0]
+                if match is not None:
+                    status = record["status"] = "duplicate"
+                    record["match"] = match["name"]
+                else:
+                    cursor = conn.execute(INSERT_SQL, (name, encoding_to_blob(encoding), image_blob, thumbnail))
+                    # Aynı çalıştırmadaki kopyalar da yakalansın diye galeriye hemen eklenir
+                    gallery.add(cursor.lastrowid, name, encoding)
+                    record["id"] = cursor.lastrowid
+            counts[status] += 1
+            if status != "ok":
+                rejected.append(record)
+            pending.append(record)
+            processed += 1
+            if len(pending) >= args.batch:
+                commit()
+                elapsed = time.perf_counter() - started
+                print(f"\r{processed}/{len(paths)} resim, {processed / elapsed:.1f} resim/sn", end="", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\nYarida kesildi; ayni komutla kaldigi yerden devam edilebilir.", file=sys.stderr)
+    finally:
+        commit()
+        checkpoint.close()
+        pool.shutdown(wait=False, cancel_futures=True)
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    gallery.save_index()
+
+    print(f"{processed} resim {elapsed:.1f} sn: {processed / max(elapsed, 1e-9):.1f} resim/sn ({workers} islem)")
+    print(f"  eklenen: {counts['ok']}")
+    for reason, label in REASONS.items():
+        if counts[reason]:
+            print(f"  {label}: {counts[reason]}")
+    if args.rejected:
+        with open(args.rejected, "w", newline='', encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["path", "name", "reason", "match"])
+            for record in rejected:
+                writer.writerow([record["path"], record["name"], record["status"], record.get("match", "")])
+        print(f"Reddedilen resimler {args.rejected} dosyasina yazildi.")
+    else:
+        for record in rejected:
+            detail = f" ({record['match']})" if "match" in record else ""
+            print(f"  reddedildi: {record['path']}: {REASONS[record['status']]}{detail}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import time
+
+import cv2
+import numpy as np
+
+from face_gallery import ENCODING_SIZE
+
+# Galeride olmayan yüzlerin çevrimiçi kümelenmesi: her bilinmeyen kodlama en yakın küme merkezine
+# (tek bir toplu uzaklık hesabıyla) atanır, yakın merkez yoksa yeni küme açılır. Küme sayısı sınırlıdır;
+# dolunca en uzun süredir görülmeyen küme atılır (LRU). Her küme için en kaliteli yüz kesiti saklanır ve
+# operatör bir kümeyi tek adımda kayıtlı yüze dönüştürebilir.
+MAX_CLUSTERS = 256
+# Aynı kişi sayılan en fazla merkez uzaklığı (galeri eşiğinden sıkı: farklı kişiler birleşmesin)
+CLUSTER_THRESHOLD = 0.5
+# Merkez, son en fazla bu kadar kodlamanın ortalaması gibi davranır; kişi zamanla değişebilir
+MAX_WEIGHT = 50
+LABEL_PREFIX = "Ziyaretci "
+
+
+def cluster_label(cluster_id):
+    return f"{LABEL_PREFIX}{cluster_id}"
+
+
+def is_unknown_label(label):
+    return label == "Yeni Yuz" or label.startswith(LABEL_PREFIX)
+
+
+# Kesit kalitesi: yüz alanı ve netlik (Laplace varyansı)
+def face_quality(frame, location):
+    top, right, bottom, left = location
+    crop = frame[max(top, 0):bottom, max(left, 0):right]
+    if crop.size == 0:
+        return 0.0
+    sharpness = cv2.Laplacian(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var()
+    return float((bottom - top) * (right - left) * np.log1p(sharpness))
+
+
+# Yüzün çevresiyle birlikte JPEG kesiti (kümeden kayıt yapılırken yüz resmi olarak kullanılır)
+def face_snapshot(frame, location, margin=0.3):
+    top, right, bottom, left = location
+    pad_y, pad_x = int((bottom - top) * margin), int((right - left) * margin)
+    crop = frame[max(top - pad_y, 0):bottom + pad_y, max(left - pad_x, 0):right + pad_x]
+    if crop.size == 0:
+        return None
+    ok, buffer = cv2.imencode('.jpg', crop, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return buffer.tobytes() if ok else None
+
+
+class UnknownFaceClusters:
+    def __init__(self, max_clusters=MAX_CLUSTERS, threshold=CLUSTER_THRESHOLD, max_weight=MAX_WEIGHT):
+        self.max_clusters = max_clusters
+        self.threshold = threshold
+        self.max_weight = max_weight
+        self._centroids = np.zeros((max_clusters, ENCODING_SIZE), dtype=np.float32)
+        self._sq_norms = np.zeros(max_clusters, dtype=np.float32)
+        self._ids = np.zeros(max_clusters, dtype=np.int64)
+        self._last_seen = np.zeros(max_clusters, dtype=np.float64)
+        self._size = 0
+        self._info = {}
+        self._slot_of = {}
+        self._next_id = 1
+        self.evicted = 0
+
+    def __len__(self):
+        return self._size
+
+    # Her kodlama için (küme kimliği, uzaklık); eşik içinde küme yoksa kimlik None
+    def lookup(self, face_encodings):
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        if self._size == 0 or len(queries) == 0:
+            return [(None, None)] * len(queries)
+        q_norms = np.einsum('ij,ij->i', queries, queries)
+        sq = q_norms[:, None] + self._sq_norms[:self._size][None, :] - 2.0 * (queries @ self._centroids[:self._size].T)
+        best = np.argmin(sq, axis=1)
+        distances = np.sqrt(np.maximum(sq[np.arange(len(queries)), best], 0))
+        return [(int(self._ids[slot]) if distance <= self.threshold else None, float(distance))
+                for slot, distance in zip(best, distances)]
+
+    # Kodlamayı kümeye ekle (cluster_id None ise yeni küme açılır); kare ve konum verilirse
+    # kesit kalitesi daha iyiyse kümenin resmi güncellenir. Küme kimliğini döndürür.
+    def observe(self, face_encoding, cluster_id=None, frame=None, location=None, now=None):
+        now = time.time() if now is None else now
+        encoding = np.asarray(face_encoding, dtype=np.float32)
+        slot = self._slot_of.get(cluster_id)
+        if slot is None:
+            slot = self._new_slot()
+            cluster_id = self._next_id
+            self._next_id += 1
+            self._ids[slot] = cluster_id
+            self._slot_of[cluster_id] = slot
+            self._centroids[slot] = encoding
+            self._info[cluster_id] = {"id": cluster_id, "count": 1, "first_seen": now, "last_seen": now,
+                                      "quality": -1.0, "snapshot": None}
+        else:
+            info = self._info[cluster_id]
+            weight = min(info["count"], self.max_weight)
+            self._centroids[slot] += (encoding - self._centroids[slot]) / (weight + 1)
+            info["count"] += 1
+            info["last_seen"] = now
+        self._sq_norms[slot] = np.dot(self._centroids[slot], self._centroids[slot])
+        self._last_seen[slot] = now
+        if frame is not None and location is not None:
+            quality = face_quality(frame, location)
+            info = self._info[cluster_id]
+            if quality > info["quality"]:
+                snapshot = face_snapshot(frame, location)
+                if snapshot is not None:
+                    info["quality"], info["snapshot"] = quality, snapshot
+        return cluster_id
+
+    def _new_slot(self):
+        if self._size < self.max_clusters:
+            self._size += 1
+            return self._size - 1
+        # Dolu: en uzun süredir görülmeyen küme atılır
+        slot = int(np.argmin(self._last_seen[:self._size]))
+        cluster_id = int(self._ids[slot])
+        del self._slot_of[cluster_id]
+        del self._info[cluster_id]
+        self.evicted += 1
+        return slot
+
+    def remove(self, cluster_id):
+        slot = self._slot_of.pop(cluster_id, None)
+        if slot is None:
+            return False
+        del self._info[cluster_id]
+        # Son satır boşalan yere taşınır
+        last = self._size - 1
+        if slot != last:
+            for array in (self._centroids, self._sq_norms, self._ids, self._last_seen):
+                array[slot] = array[last]
+            self._slot_of[int(self._ids[slot])] = slot
+        self._size -= 1
+        return True
+
+    # Kodlamalara (etiket, kesin_mi) ata: önce hepsi match(kodlamalar) -> isimler ile galeriyle eşleştirilir
+    # (kayıtlı ya da işaretli bir kişi hiçbir zaman ziyaretçi etiketinin arkasında kalmasın); sadece galeride
+    # olmayanlar kümelere bakılır, yakın küme yoksa yeni küme açılır. Yeni açılan küme ilk görüşte kesin
+    # sayılmaz, tekrar kodlanınca doğrulanır.
+    def identify(self, face_encodings, match, frame=None, face_locations=None, now=None):
+        names = match(face_encodings)
+        misses = [i for i, name in enumerate(names) if is_unknown_label(name)]
+        clusters = dict(zip(misses, self.lookup([face_encodings[i] for i in misses]))) if misses else {}
+        labels = []
+        for i, (encoding, name) in enumerate(zip(face_encodings, names)):
+            if i not in clusters:
+                labels.append((name, True))
+                continue
+            found = clusters[i][0]
+            location = face_locations[i] if face_locations is not None else None
+            cluster_id = self.observe(encoding, found, frame, location, now)
+            labels.append((cluster_label(cluster_id), found is not None))
+        return labels
+
+    # Merkezi verilen kodlamaya radius içinde olan kümeleri sil (kişi galeriye eklendiğinde); silinen kimlikler
+    def remove_near(self, face_encoding, radius):
+        if self._size == 0:
+            return []
+        encoding = np.asarray(face_encoding, dtype=np.float32)
+        distances = np.linalg.norm(self._centroids[:self._size] - encoding, axis=1)
+        removed = [int(cluster_id) for cluster_id in self._ids[:self._size][distances <= radius]]
+        for cluster_id in removed:
+            self.remove(cluster_id)
+        return removed
+
+    def snapshot(self, cluster_id):
+        info = self._info.get(cluster_id)
+        return None if info is None else info["snapshot"]
+
+    # Kümeler, en son görülen önce: [{"id", "count", "first_seen", "last_seen", "quality"}]
+    def clusters(self):
+        return sorted(({key: value for key, value in info.items() if key != "snapshot"} for info in self._info.values()),
+                      key=lambda info: info["last_seen"], reverse=True)
+
+    # Kümeyi kayıt için çıkar: merkez kodlaması ve en iyi kesit; küme silinir
+    def promote(self, cluster_id):
+        slot = self._slot_of.get(cluster_id)
+        if slot is None:
+            return None
+        result = {"encoding": self._centroids[slot].copy(), "image": self._info[cluster_id]["snapshot"],
+                  "count": self._info[cluster_id]["count"]}
+        self.remove(cluster_id)
+        return result
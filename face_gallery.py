@@ -0,0 +1,191 @@
+import numpy as np
+
+import ann_index
+
+# face_recognition.compare_faces ile aynı varsayılan eşik
+DEFAULT_TOLERANCE = 0.6
+ENCODING_SIZE = 128
+
+
+# Kayıtlı yüzlerin bellekteki galerisi: tüm kodlamalar tek bir (N, 128) float32 matriste,
+# id/isim/bayrak bilgileri de aynı sıradaki dizilerde tutulur.
+class FaceGallery:
+    def __init__(self, faces=None, flag_key="marked", tolerance=DEFAULT_TOLERANCE):
+        self.flag_key = flag_key
+        self.tolerance = tolerance
+        self._size = 0
+        self._encodings = np.empty((0, ENCODING_SIZE), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._flags = np.empty(0, dtype=np.int8)
+        self._names = []
+        self._row_of = None
+        self.index = None
+        self.index_path = None
+        if faces is not None:
+            self.load(faces)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def encodings(self):
+        return self._encodings[:self._size]
+
+    @property
+    def ids(self):
+        return self._ids[:self._size]
+
+    @property
+    def flags(self):
+        return self._flags[:self._size]
+
+    @property
+    def names(self):
+        return self._names
+
+    # get_faces() çıktısından galeriyi baştan kur
+    def load(self, faces):
+        faces = list(faces)
+        count = len(faces)
+        self._encodings = np.array([face["encoding"] for face in faces], dtype=np.float32).reshape(count, ENCODING_SIZE)
+        self._ids = np.array([face["id"] for face in faces], dtype=np.int64)
+        self._flags = np.array([face[self.flag_key] or 0 for face in faces], dtype=np.int8)
+        self._names = [face["name"] for face in faces]
+        self._size = count
+        self._sq_norms = np.einsum('ij,ij->i', self._encodings, self._encodings)
+        self._row_of = None
+        if self.index is not None:
+            self.index.sync(self.ids, self.encodings)
+
+    # Büyük galerilerde eşleştirmeyi diskte saklanan yaklaşık en yakın komşu indeksine devret
+    def enable_index(self, index_path, n_probe=ann_index.DEFAULT_N_PROBE, min_faces=ann_index.ANN_MIN_FACES):
+        self.index_path = index_path
+        if self._size < min_faces:
+            self.index = None
+            return
+        self.index = ann_index.load_or_build(index_path, self.ids, self.encodings, n_probe=n_probe)
+        self.save_index()
+
+    def save_index(self):
+        if self.index is not None and self.index_path:
+            self.index.save(self.index_path)
+
+    # Kapasite dolduğunda dizileri ikiye katlayarak büyüt
+    def _reserve(self, capacity):
+        if capacity <= len(self._ids):
+            return
+        capacity = max(capacity, 2 * len(self._ids), 16)
+        encodings = np.empty((capacity, ENCODING_SIZE), dtype=np.float32)
+        encodings[:self._size] = self._encodings[:self._size]
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        sq_norms[:self._size] = self._sq_norms[:self._size]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        flags = np.empty(capacity, dtype=np.int8)
+        flags[:self._size] = self._flags[:self._size]
+        self._encodings, self._sq_norms, self._ids, self._flags = encodings, sq_norms, ids, flags
+
+    # Veritabanına eklenen yüzü galeriye ekle
+    def add(self, face_id, name, encoding, flag=0):
+        self._reserve(self._size + 1)
+        i = self._size
+        self._encodings[i] = encoding
+        self._sq_norms[i] = np.dot(self._encodings[i], self._encodings[i])
+        self._ids[i] = face_id
+        self._flags[i] = flag or 0
+        self._names.append(name)
+        if self._row_of is not None:
+            self._row_of[int(face_id)] = i
+        self._size += 1
+        if self.index is not None:
+            if self.index.needs_retrain():
+                self.index.train(self.ids, self.encodings)
+            else:
+                self.index.add(face_id, encoding)
+
+    # Maskeye uyan satırları silip dizileri sıkıştır
+    def _remove_where(self, mask):
+        keep = ~mask
+        removed = int(mask.sum())
+        if not removed:
+            return 0
+        if self.index is not None:
+            self.index.remove(self._ids[:self._size][mask].tolist())
+        size = self._size - removed
+        self._encodings[:size] = self._encodings[:self._size][keep]
+        self._sq_norms[:size] = self._sq_norms[:self._size][keep]
+        self._ids[:size] = self._ids[:self._size][keep]
+        self._flags[:size] = self._flags[:self._size][keep]
+        self._names = [name for name, k in zip(self._names, keep) if k]
+        self._size = size
+        self._row_of = None
+        return removed
+
+    def _name_mask(self, name):
+        return np.fromiter((n == name for n in self._names), dtype=bool, count=self._size)
+
+    # delete_face ile aynı şekilde isme göre sil
+    def remove_name(self, name):
+        return self._remove_where(self._name_mask(name))
+
+    def remove_id(self, face_id):
+        return self._remove_where(self.ids == face_id)
+
+    # mark_face / unmark_face ile aynı şekilde isme göre bayrak güncelle
+    def set_flag(self, name, value):
+        self._flags[:self._size][self._name_mask(name)] = value
+
+    def set_flag_by_id(self, face_id, value):
+        self._flags[:self._size][self.ids == face_id] = value
+
+    def set_all_flags(self, value):
+        self._flags[:self._size] = value
+
+    def rename(self, face_id, name):
+        for i in np.flatnonzero(self.ids == face_id):
+            self._names[i] = name
+
+    def _entry(self, index, distance):
+        return {"id": int(self._ids[index]), "name": self._names[index],
+                self.flag_key: int(self._flags[index]), "distance": float(distance)}
+
+    # Sorgu kodlamaları ile galerideki tüm kodlamalar arasındaki öklid uzaklıkları (M, N)
+    def distances(self, face_encodings):
+        queries = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        q_norms = np.einsum('ij,ij->i', queries, queries)
+        sq = q_norms[:, None] + self._sq_norms[:self._size][None, :] - 2.0 * (queries @ self.encodings.T)
+        np.maximum(sq, 0, out=sq)
+        return np.sqrt(sq, out=sq)
+
+    def _row_for_id(self, face_id):
+        if self._row_of is None:
+            self._row_of = {int(face_id): row for row, face_id in enumerate(self.ids)}
+        return self._row_of[face_id]
+
+    # Karedeki tüm yüzleri tek bir toplu uzaklık hesabıyla eşleştir; her yüz için en yakın k kaydı döndürür
+    def match(self, face_encodings, k=1):
+        if len(face_encodings) == 0:
+            return []
+        if self._size == 0:
+            return [[] for _ in face_encodings]
+        if self.index is not None:
+            return [[self._entry(self._row_for_id(face_id), distance) for face_id, distance in hits]
+                    for hits in self.index.search(face_encodings, k)]
+        dists = self.distances(face_encodings)
+        k = min(k, self._size)
+        if k == 1:
+            best = np.argmin(dists, axis=1)[:, None]
+        else:
+            best = np.argpartition(dists, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(dists, best, axis=1), axis=1)
+            best = np.take_along_axis(best, order, axis=1)
+        results = []
+        for row, indexes in enumerate(best):
+            results.append([self._entry(i, dists[row, i]) for i in indexes])
+        return results
+
+    # compare_faces eşiğine göre en iyi eşleşmeyi ya da None döndürür
+    def best_matches(self, face_encodings):
+        return [matches[0] if matches and matches[0]["distance"] <= self.tolerance else None
+                for matches in self.match(face_encodings)]
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QDialog, QHBoxLayout, QListView, QPushButton, QVBoxLayout
+
+from storage import THUMBNAIL_SIZE
+
+# Bellekte tutulan en fazla küçük resim sayısı (LRU)
+PIXMAP_CACHE_SIZE = 256
+
+
+# Kayıtlı yüzler için sanal liste modeli: görünüm sadece ekrandaki satırların verisini ister, küçük
+# resimler de sadece bu satırlar için veritabanından okunup çözülür ve sınırlı bir LRU önbellekte tutulur.
+class FaceListModel(QAbstractListModel):
+    # faces: [{"id", "name", flag_key}]; load_thumbnail(face_id) -> JPEG baytları ya da None;
+    # flag_labels: {bayrak değeri: (yazı, renk)}
+    def __init__(self, faces, load_thumbnail, flag_key, flag_labels, cache_size=PIXMAP_CACHE_SIZE, parent=None):
+        super().__init__(parent)
+        self._faces = list(faces)
+        self._load_thumbnail = load_thumbnail
+        self.flag_key = flag_key
+        self.flag_labels = flag_labels
+        self.cache_size = cache_size
+        self._pixmaps = OrderedDict()
+        self._placeholder = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor("lightgray"))
+        self.thumbnail_loads = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._faces)
+
+    def face(self, row):
+        return self._faces[row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        face = self._faces[index.row()]
+        label = self.flag_labels.get(face[self.flag_key])
+        if role == Qt.DisplayRole:
+            return face["name"] if label is None else f"{face['name']}\n{label[0]}"
+        if role == Qt.DecorationRole:
+            return self.pixmap(face["id"])
+        if role == Qt.BackgroundRole and label is not None and label[1]:
+            return QColor(label[1])
+        return None
+
+    def pixmap(self, face_id):
+        pixmap = self._pixmaps.get(face_id)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(face_id)
+            return pixmap
+        thumbnail = self._load_thumbnail(face_id)
+        self.thumbnail_loads += 1
+        pixmap = QPixmap()
+        if not thumbnail or not pixmap.loadFromData(thumbnail):
+            pixmap = self._placeholder
+        self._pixmaps[face_id] = pixmap
+        if len(self._pixmaps) > self.cache_size:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    # match(face) True olan satırları güncelle: update_faces(lambda f: f["name"] == name, marked=1)
+    def update_faces(self, match, **changes):
+        for row, face in enumerate(self._faces):
+            if match(face):
+                face.update(changes)
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def remove_faces(self, match):
+        for row in reversed(range(len(self._faces))):
+            if match(self._faces[row]):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._pixmaps.pop(self._faces[row]["id"], None)
+                del self._faces[row]
+                self.endRemoveRows()
+
+
+# Kayıtlı yüzler penceresi: satır başına widget yerine tek bir liste görünümü ve seçili yüz
+# üzerinde çalışan butonlar. add_action ile eklenen fonksiyonlar seçili yüzün sözlüğünü alır.
+class FaceListDialog(QDialog):
+    def __init__(self, model, title, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(420, 600)
+        self.model = model
+        model.setParent(self)
+
+        self.list_view = QListView(self)
+        self.list_view.setModel(model)
+        self.list_view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        # Tüm satırlar aynı boyda: görünüm boyut için satırları tek tek sorgulamaz
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setSpacing(2)
+
+        self.button_layout = QHBoxLayout()
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.list_view)
+        layout.addLayout(self.button_layout)
+
+    def add_action(self, text, style, callback):
+        button = QPushButton(text, self)
+        button.setStyleSheet(style)
+        button.clicked.connect(lambda: self._run_action(callback))
+        self.button_layout.addWidget(button)
+
+    def _run_action(self, callback):
+        index = self.list_view.currentIndex()
+        if index.isValid():
+            callback(self.model.face(index.row()))
@@ -0,0 +1,121 @@
+# Algıla-sonra-izle yüz hattı: algılama her N karede bir (küçültülmüş karede) yapılır,
+# arada izler son konumlarını ve kimliklerini korur. Bir iz sadece yeni olduğunda,
+# kaydığında ya da güveni azaldığında yeniden kodlanır.
+
+DEFAULT_LABEL = "Yeni Yuz"
+
+
+def iou(a, b):
+    top, right, bottom, left = a
+    top2, right2, bottom2, left2 = b
+    inter_w = min(right, right2) - max(left, left2)
+    inter_h = min(bottom, bottom2) - max(top, top2)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = (right - left) * (bottom - top) + (right2 - left2) * (bottom2 - top2) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class FaceTracker:
+    def __init__(self, detect_every=5, detect_scale=0.5, match_iou=0.3, drift_iou=0.5,
+                 confidence_decay=0.98, min_confidence=0.3, max_missed=1):
+        self.detect_every = detect_every
+        self.detect_scale = detect_scale
+        self.match_iou = match_iou
+        self.drift_iou = drift_iou
+        self.confidence_decay = confidence_decay
+        self.min_confidence = min_confidence
+        self.max_missed = max_missed
+        self.tracks = []
+        self.frame_count = 0
+        self._frames_since_detect = detect_every
+        self._next_id = 1
+        self.detections = 0
+        self.encodings = 0
+
+    def reset(self):
+        self.tracks = []
+        self._frames_since_detect = self.detect_every
+
+    # Her yeni karede çağrılır: izlerin güveni azalır
+    def advance(self):
+        self.frame_count += 1
+        self._frames_since_detect += 1
+        for track in self.tracks:
+            track["confidence"] *= self.confidence_decay
+
+    def _needs_encoding(self, track):
+        return (track["encoded_location"] is None
+                or iou(track["location"], track["encoded_location"]) < self.drift_iou
+                or track["confidence"] < self.min_confidence)
+
+    # Bu karede algılama gerekli mi: süre dolduysa ya da bir izin yeniden kodlanması gerekiyorsa
+    def detection_due(self):
+        return (self._frames_since_detect >= self.detect_every
+                or any(track["confidence"] < self.min_confidence for track in self.tracks))
+
+    # Yeni algılamaları mevcut izlerle IoU'ya göre eşleştir; kodlanması gereken izleri döndürür
+    def update_detections(self, face_locations):
+        self.detections += 1
+        self._frames_since_detect = 0
+        pairs = sorted(((iou(track["location"], location), t, d)
+                        for t, track in enumerate(self.tracks)
+                        for d, location in enumerate(face_locations)), reverse=True)
+        used_tracks, used_detections = set(), set()
+        for score, t, d in pairs:
+            if score < self.match_iou:
+                break
+            if t in used_tracks or d in used_detections:
+                continue
+            used_tracks.add(t)
+            used_detections.add(d)
+            self.tracks[t]["location"] = face_locations[d]
+            self.tracks[t]["missed"] = 0
+
+        tracks = []
+        for t, track in enumerate(self.tracks):
+            if t not in used_tracks:
+                track["missed"] += 1
+            if track["missed"] <= self.max_missed:
+                tracks.append(track)
+        for d, location in enumerate(face_locations):
+            if d not in used_detections:
+                tracks.append({"id": self._next_id, "location": location, "label": DEFAULT_LABEL,
+                               "encoded_location": None, "confidence": 0.0, "missed": 0})
+                self._next_id += 1
+        self.tracks = tracks
+        return [track for track in self.tracks if track["missed"] == 0 and self._needs_encoding(track)]
+
+    # Yeniden kodlanan izin kimliğini güncelle; galeriyle kesin eşleşen kimlikler daha uzun süre güvenilir kalır
+    def assign(self, track_id, label, confident, location=None):
+        for track in self.tracks:
+            if track["id"] == track_id:
+                self.encodings += 1
+                track["label"] = label
+                track["encoded_location"] = location or track["location"]
+                track["confidence"] = 1.0 if confident else 0.5
+                return
+
+    # Etiketi değişen kimliği (ör. kayda dönüştürülen ziyaretçi kümesi) mevcut izlerde güncelle
+    def relabel(self, old_label, new_label):
+        for track in self.tracks:
+            if track["label"] == old_label:
+                track["label"] = new_label
+
+    def locations(self):
+        return [track["location"] for track in self.tracks]
+
+    def labels(self):
+        return [track["label"] for track in self.tracks]
+
+    # Eşzamanlı kullanım: detect(frame, scale) -> konumlar, identify(frame, konumlar) -> [(isim, kesin_mi)]
+    def process(self, frame, detect, identify):
+        self.advance()
+        if self.detection_due():
+            pending = self.update_detections(detect(frame, self.detect_scale))
+            if pending:
+                locations = [track["location"] for track in pending]
+                for track, (label, confident) in zip(pending, identify(frame, locations)):
+                    self.assign(track["id"], label, confident, track["location"])
+        return self.locations(), self.labels()
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+
+from face_tracker import iou
+
+# Önizlemenin algıladığı kareler ve yüz kodlamaları için kısa ömürlü önbellek. Önizleme döngüsü her
+# algılama sonucunu ekler; karar yolu en yeni taze kaydı kullanır ve sadece daha önce kodlanmamış
+# yüzleri kodlatır. Kodlamalar, aynı yüzün yakın zamandaki bir karede kodlanmış hâlinden (IoU ile)
+# de yeniden kullanılabilir.
+DEFAULT_MAX_AGE = 0.5
+DEFAULT_REUSE_IOU = 0.7
+
+
+class FrameCache:
+    def __init__(self, max_age=DEFAULT_MAX_AGE, max_entries=4, reuse_iou=DEFAULT_REUSE_IOU):
+        self.max_age = max_age
+        self.reuse_iou = reuse_iou
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # Algılama sonucu gelen kareyi ekle; kare sahibi tarafından artık değiştirilmemelidir
+    def put(self, seq, frame, face_locations, timestamp=None):
+        entry = {"seq": seq, "timestamp": time.monotonic() if timestamp is None else timestamp,
+                 "frame": frame, "face_locations": list(face_locations), "encodings": {}}
+        with self._lock:
+            # Sonuçlar sırasız gelebilir; daha eski bir kare en yeni kaydın yerini almaz
+            if self._entries and self._entries[-1]["seq"] > seq:
+                return None
+            self._entries.append(entry)
+        return entry
+
+    def _fresh(self, entry, now, max_age):
+        return now - entry["timestamp"] <= max_age
+
+    # En yeni taze kayıt (yoksa None)
+    def latest(self, max_age=None):
+        max_age = self.max_age if max_age is None else max_age
+        now = time.monotonic()
+        with self._lock:
+            if self._entries and self._fresh(self._entries[-1], now, max_age):
+                return self._entries[-1]
+        return None
+
+    # Kaydın yüzleriyle aynı sırada kodlamalar; önbellekte olmayanlar için None
+    def cached_encodings(self, entry):
+        now = time.monotonic()
+        with self._lock:
+            others = [other for other in reversed(self._entries)
+                      if other is not entry and other["encodings"] and self._fresh(other, now, self.max_age)]
+        encodings = []
+        for location in entry["face_locations"]:
+            encoding = entry["encodings"].get(tuple(location))
+            if encoding is None:
+                # Yüz yakın zamandaki bir karede neredeyse aynı konumda kodlandıysa yeniden kullanılır
+                for other in others:
+                    for other_location, other_encoding in other["encodings"].items():
+                        if iou(location, other_location) >= self.reuse_iou:
+                            encoding = other_encoding
+                            break
+                    if encoding is not None:
+                        entry["encodings"][tuple(location)] = encoding
+                        break
+            encodings.append(encoding)
+        return encodings
+
+    def store_encodings(self, entry, face_locations, face_encodings):
+        for location, encoding in zip(face_locations, face_encodings):
+            entry["encodings"][tuple(location)] = encoding
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,136 @@
+import time
+
+from face_tracker import DEFAULT_LABEL
+
+# Butonsuz turnike için durum makinesi: boş -> kişi var -> karar -> bekleme -> boş.
+# Kapıda tek kişi olduğu varsayılır: her denemede sadece en büyük/merkeze en yakın yüz kodlanır
+# ve ilk güvenilir eşleşmede karar verilir. Kişi kapıda durduğu sürece yeni karar ve kayıt üretilmez.
+IDLE = "idle"
+PRESENT = "present"
+DECIDED = "decided"
+COOLDOWN = "cooldown"
+
+
+# Kapıdaki kişi: alanı en büyük yüz, merkezden uzaklığına göre cezalandırılarak seçilir
+def primary_face(face_locations, frame_shape):
+    if not face_locations:
+        return None
+    height, width = frame_shape[:2]
+    half_diagonal = ((width / 2) ** 2 + (height / 2) ** 2) ** 0.5
+
+    def score(location):
+        top, right, bottom, left = location
+        dx = (left + right) / 2 - width / 2
+        dy = (top + bottom) / 2 - height / 2
+        offset = (dx * dx + dy * dy) ** 0.5 / half_diagonal
+        return (right - left) * (bottom - top) * (1.0 - 0.5 * offset)
+    return max(face_locations, key=score)
+
+
+# Yüzün çevresindeki kesit ve kesit içindeki konumu; işçiye tam kare yerine bu kesit gönderilir
+def face_crop(frame, location, margin=0.5):
+    top, right, bottom, left = location
+    pad_y = int((bottom - top) * margin)
+    pad_x = int((right - left) * margin)
+    y0, x0 = max(top - pad_y, 0), max(left - pad_x, 0)
+    y1, x1 = min(bottom + pad_y, frame.shape[0]), min(right + pad_x, frame.shape[1])
+    return frame[y0:y1, x0:x1], (top - y0, right - x0, bottom - y0, left - x0)
+
+
+class GateController:
+    def __init__(self, flag_key="access_allowed", confident_distance=0.45, tolerance=0.6, max_attempts=5,
+                 decide_timeout=3.0, absent_time=0.7, hold_time=5.0, cooldown=1.0, relog_interval=30.0,
+                 pending_timeout=2.0):
+        self.flag_key = flag_key
+        self.confident_distance = confident_distance
+        self.tolerance = tolerance
+        self.max_attempts = max_attempts
+        self.decide_timeout = decide_timeout
+        self.absent_time = absent_time
+        self.hold_time = hold_time
+        self.cooldown = cooldown
+        self.relog_interval = relog_interval
+        self.pending_timeout = pending_timeout
+        self._last_logged = {}
+        self.decisions = 0
+        self.reset()
+
+    def reset(self, now=None):
+        self.state = IDLE
+        self.state_since = time.monotonic() if now is None else now
+        self.last_seen = None
+        self.pending = False
+        self.pending_since = None
+        self.attempts = 0
+        self.best_match = None
+        self.decision = None
+
+    def _set_state(self, state, now):
+        self.state = state
+        self.state_since = now
+
+    # Önizlemenin her algılama sonucuyla çağrılır. Kodlanması gereken yüzün konumunu
+    # (kapıda kişi varken ve önceki deneme sonuçlandıysa) ya da None döndürür.
+    def update(self, face_locations, frame_shape, now=None):
+        now = time.monotonic() if now is None else now
+        if face_locations:
+            self.last_seen = now
+        present = self.last_seen is not None and now - self.last_seen <= self.absent_time
+        # Sonucu hiç gelmeyen (atılan) kodlama isteği sonsuza kadar beklenmez
+        if self.pending and now - self.pending_since >= self.pending_timeout:
+            self.pending = False
+
+        if self.state == COOLDOWN and now - self.state_since >= self.cooldown:
+            self._set_state(IDLE, now)
+        if self.state == IDLE and face_locations:
+            self._set_state(PRESENT, now)
+            self.attempts = 0
+            self.best_match = None
+            self.pending = False
+        elif self.state == PRESENT and not present:
+            # Kişi karar verilmeden ayrıldı
+            self._set_state(IDLE, now)
+        elif self.state == DECIDED and (not present or now - self.state_since >= self.hold_time):
+            self._set_state(COOLDOWN, now)
+            self.decision = None
+
+        if self.state == PRESENT and face_locations and not self.pending:
+            self.pending = True
+            self.pending_since = now
+            return primary_face(face_locations, frame_shape)
+        return None
+
+    # Kodlanan yüzün galerideki en yakın kaydı ({"name", "distance", flag_key}) ya da None.
+    # Karar verildiyse {"name", "access_allowed", "log", "latency"} döner.
+    def on_match(self, match, now=None):
+        now = time.monotonic() if now is None else now
+        self.pending = False
+        if self.state != PRESENT:
+            return None
+        self.attempts += 1
+        if match is not None and (self.best_match is None or match["distance"] < self.best_match["distance"]):
+            self.best_match = match
+        if match is not None and match["distance"] <= self.confident_distance:
+            return self._decide(match, now)
+        if self.attempts >= self.max_attempts or now - self.state_since >= self.decide_timeout:
+            best = self.best_match
+            return self._decide(best if best is not None and best["distance"] <= self.tolerance else None, now)
+        return None
+
+    # Kodlama başarısız oldu; sonraki karede yeniden denenir
+    def on_error(self):
+        self.pending = False
+
+    def _decide(self, match, now):
+        name = match["name"] if match is not None else DEFAULT_LABEL
+        access_allowed = bool(match[self.flag_key]) if match is not None else False
+        # Aynı kişi relog_interval içinde tekrar kaydedilmez
+        self._last_logged = {key: at for key, at in self._last_logged.items() if now - at < self.relog_interval}
+        log = match is not None and name not in self._last_logged
+        if log:
+            self._last_logged[name] = now
+        self.decision = {"name": name, "access_allowed": access_allowed, "log": log,
+                         "latency": now - self.state_since}
+        self.decisions += 1
+        self._set_state(DECIDED, now)
+        return self.decision
@@ -0,0 +1,114 @@
+import time
+from collections import deque
+
+from metrics import metrics
+
+# Uyarlanabilir yük atma: işçi havuzundan dönen sonuçların gecikmesi izlenir, hedef karar gecikmesi
+# aşılınca işleme adım adım hafifletilir, yük azalınca aynı adımlarla geri dönülür. Seviyeler birikimlidir:
+#   frame_skip    işlenen her kareden sonra havuza gönderilmeden atlanan kare sayısı
+#   detect_scale  yüz algılamanın yapıldığı küçültme oranı
+#   max_faces     kare başına kodlanan en fazla yüz (None: sınırsız)
+#   ocr_budget    kare başına OCR'a gönderilen en fazla plaka adayı (None: varsayılan)
+#   ocr           False ise plaka işleri hiç gönderilmez
+LEVELS = [
+    {"name": "normal", "frame_skip": 0, "detect_scale": 0.5, "max_faces": None, "ocr_budget": None, "ocr": True},
+    {"name": "kare atla", "frame_skip": 1, "detect_scale": 0.5, "max_faces": None, "ocr_budget": None, "ocr": True},
+    {"name": "kucuk algilama", "frame_skip": 1, "detect_scale": 0.35, "max_faces": None, "ocr_budget": 2, "ocr": True},
+    {"name": "sinirli aday", "frame_skip": 2, "detect_scale": 0.35, "max_faces": 2, "ocr_budget": 1, "ocr": True},
+    {"name": "ocr durdu", "frame_skip": 3, "detect_scale": 0.25, "max_faces": 1, "ocr_budget": 1, "ocr": False},
+]
+# Hedef karar gecikmesi (saniye)
+TARGET_LATENCY = 0.3
+
+
+class LoadShedder:
+    # target_latency None ise kontrol kapalıdır ve hep ilk seviyede kalınır.
+    # Gecikmenin percentile yüzdeliği window saniyedeki örneklerden hesaplanır. Bir seviye değişikliğinden
+    # sonra kötüleştirme için degrade_hold, iyileştirme için recover_hold saniye beklenir; iyileştirme
+    # sadece en az min_samples örnekte gecikme hedefin recover_ratio katının altındaysa (ya da hiç sonuç
+    # dönmüyorsa) yapılır.
+    def __init__(self, target_latency=TARGET_LATENCY, levels=LEVELS, window=2.0, percentile=0.9, min_samples=5,
+                 degrade_hold=1.0, recover_hold=5.0, recover_ratio=0.6):
+        self.target_latency = target_latency
+        self.levels = levels
+        self.window = window
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.degrade_hold = degrade_hold
+        self.recover_hold = recover_hold
+        self.recover_ratio = recover_ratio
+        self.level = 0
+        # Başarısız iyileştirme denemelerinden sonra bekleme süresi katlanır (seviyeler arası gidip gelmeyi önler)
+        self._recover_delay = recover_hold
+        self._recovered = False
+        self._samples = deque()
+        self._changed_at = time.monotonic()
+        self._frame_count = 0
+        self.transitions = deque(maxlen=100)
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    # Mod değişince eski ölçümler atılır; seviye korunur
+    def reset(self, now=None):
+        self._samples.clear()
+        self._changed_at = time.monotonic() if now is None else now
+        self._frame_count = 0
+
+    # Havuzdan dönen bir sonucun gönderimden itibaren gecikmesi (saniye)
+    def observe(self, latency, now=None):
+        now = time.monotonic() if now is None else now
+        # Son seviye değişikliğinden önce gönderilmiş işler eski ayarlarla çalıştı; kararı etkilemez
+        if now - latency >= self._changed_at:
+            self._samples.append((now, latency))
+
+    # Bu kare havuza gönderilebilir mi (frame_skip)
+    def take_frame(self):
+        self._frame_count += 1
+        return (self._frame_count - 1) % (self.settings["frame_skip"] + 1) == 0
+
+    def latency(self, now=None):
+        now = time.monotonic() if now is None else now
+        while self._samples and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+        if not self._samples:
+            return None
+        latencies = sorted(latency for _, latency in self._samples)
+        return latencies[min(int(len(latencies) * self.percentile), len(latencies) - 1)]
+
+    # Her karede çağrılır; seviye değiştiyse yeni ayarları, değişmediyse None döndürür
+    def update(self, now=None):
+        if self.target_latency is None:
+            return None
+        now = time.monotonic() if now is None else now
+        latency = self.latency(now)
+        held = now - self._changed_at
+        # Son iyileştirme tuttuysa bekleme süresi normale döner
+        if self._recovered and held >= self.recover_hold:
+            self._recover_delay = self.recover_hold
+        if latency is not None and latency > self.target_latency:
+            if held >= self.degrade_hold and self.level < len(self.levels) - 1:
+                return self._change(self.level + 1, latency, now)
+        elif latency is None or (len(self._samples) >= self.min_samples
+                                 and latency < self.target_latency * self.recover_ratio):
+            # Örnek yoksa (ör. OCR durduruldu) bir üst seviye denenir; yük sürüyorsa tekrar düşülür
+            if held >= self._recover_delay and self.level > 0:
+                return self._change(self.level - 1, latency, now)
+        return None
+
+    def _change(self, level, latency, now):
+        if level > self.level and self._recovered:
+            self._recover_delay = min(self._recover_delay * 2, self.recover_hold * 8)
+        self._recovered = level < self.level
+        old = self.levels[self.level]["name"]
+        self.level = level
+        self._samples.clear()
+        self._changed_at = now
+        measured = "-" if latency is None else f"{latency * 1000:.0f} ms"
+        print(f"Yuk seviyesi {old} -> {self.settings['name']} (p{int(self.percentile * 100)} gecikme {measured}, "
+              f"hedef {self.target_latency * 1000:.0f} ms)")
+        self.transitions.append({"time": now, "level": level, "name": self.settings["name"], "latency": latency})
+        metrics.count("load_level_changes")
+        metrics.gauge("load_level", level)
+        return self.settings
@@ -0,0 +1,41 @@
+# Tanıma kayıtlarının sayfa sayfa okunması (arayüzden bağımsız). Sayfalar OFFSET yerine son satırın
+# (timestamp, id) değerinden devam eder (keyset); böylece her sayfa, tablo ne kadar büyük olursa olsun
+# timestamp dizininde sadece kendi satırları kadar ilerler. Toplam satır sayısı hiç hesaplanmaz.
+PAGE_SIZE = 200
+TABLE = "recognition_logs"
+
+
+# Filtreler: {sütun: değer} eşitlik (boş değerler yok sayılır), "since" (dahil) ve "until" (hariç) zaman aralığı
+def build_page_query(columns, filters=None, after=None, limit=PAGE_SIZE, table=TABLE):
+    where, params = [], []
+    for column, value in (filters or {}).items():
+        if value is None or value == "":
+            continue
+        if column == "since":
+            where.append("timestamp >= ?")
+        elif column == "until":
+            where.append("timestamp < ?")
+        elif column in columns:
+            where.append(f"{column} = ?")
+        else:
+            raise ValueError(f"Bilinmeyen filtre: {column}")
+        params.append(value)
+    if after is not None:
+        where.append("(timestamp, id) < (?, ?)")
+        params.extend(after)
+    sql = f"SELECT id, {', '.join(columns)} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(limit)
+    return sql, params
+
+
+# Bir sayfa satır ve sonraki sayfanın başlangıcı (son sayfaysa None). columns "timestamp" içermelidir.
+def fetch_page(conn, columns, filters=None, after=None, limit=PAGE_SIZE, table=TABLE):
+    sql, params = build_page_query(columns, filters, after, limit, table)
+    rows = conn.execute(sql, params).fetchall()
+    if len(rows) < limit:
+        return rows, None
+    last = rows[-1]
+    return rows, (last[1 + columns.index("timestamp")], last[0])
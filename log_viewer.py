@@ -0,0 +1,140 @@
+import sqlite3
+
+from PyQt5.QtCore import QAbstractTableModel, QDate, QDateTime, QModelIndex, Qt, QTime
+from PyQt5.QtWidgets import (QCheckBox, QComboBox, QDateEdit, QDialog, QHBoxLayout, QHeaderView, QLineEdit,
+                             QPushButton, QTableView, QVBoxLayout)
+
+from log_query import PAGE_SIZE, fetch_page
+
+
+# Tanıma kayıtları için tembel tablo modeli: açılışta sadece ilk sayfa okunur, görünüm aşağı
+# kaydırıldıkça canFetchMore/fetchMore ile sonraki sayfalar keyset sorgusuyla eklenir.
+class LogTableModel(QAbstractTableModel):
+    # columns: [(sütun, başlık)]; connect: bu iş parçacığının veritabanı bağlantısını döndüren fonksiyon
+    def __init__(self, connect, columns, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self._connect = connect
+        self._columns = [column for column, _ in columns]
+        self._headers = [header for _, header in columns]
+        self.page_size = page_size
+        self._rows = []
+        self._filters = {}
+        self._after = None
+        self._exhausted = False
+
+    # Filtreler değişince model boşaltılır; sayfalar yeniden ilk sayfadan okunur
+    def set_filters(self, filters):
+        self.beginResetModel()
+        self._filters = dict(filters)
+        self._rows = []
+        self._after = None
+        self._exhausted = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column() + 1]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            rows, after = fetch_page(self._connect(), self._columns, self._filters, self._after, self.page_size)
+        except sqlite3.Error as e:
+            print(f"Error in fetching logs: {e}")
+            self._exhausted = True
+            return
+        self._after = after
+        self._exhausted = after is None
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+
+# Yerel günün başlangıcı, kayıtlardaki gibi UTC "yyyy-MM-dd HH:mm:ss" biçiminde
+def utc_midnight(date):
+    return QDateTime(date, QTime(0, 0)).toUTC().toString("yyyy-MM-dd HH:mm:ss")
+
+
+# Filtrelenebilir kayıt penceresi. text_filters: [(sütun, ipucu)] tam eşleşme;
+# choice_filters: [(sütun, [(etiket, değer)])]. Tarih aralığı yerel günlerle seçilir ve kayıtlar gibi
+# UTC'ye çevrilerek sorgulanır.
+class LogViewerDialog(QDialog):
+    def __init__(self, connect, columns, text_filters=(), choice_filters=(), title="Kayıtlar", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(600, 500)
+        self.model = LogTableModel(connect, columns, parent=self)
+
+        filter_layout = QHBoxLayout()
+        self.text_inputs = {}
+        for column, hint in text_filters:
+            line_edit = QLineEdit(self)
+            line_edit.setPlaceholderText(hint)
+            line_edit.returnPressed.connect(self.apply_filters)
+            filter_layout.addWidget(line_edit)
+            self.text_inputs[column] = line_edit
+        self.choice_inputs = {}
+        for column, choices in choice_filters:
+            combo = QComboBox(self)
+            combo.addItem("Tümü", None)
+            for label, value in choices:
+                combo.addItem(label, value)
+            combo.currentIndexChanged.connect(self.apply_filters)
+            filter_layout.addWidget(combo)
+            self.choice_inputs[column] = combo
+        self.date_check = QCheckBox("Tarih", self)
+        self.date_check.toggled.connect(self.apply_filters)
+        self.since_input = QDateEdit(QDate.currentDate(), self)
+        self.until_input = QDateEdit(QDate.currentDate(), self)
+        for date_edit in (self.since_input, self.until_input):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+        filter_button = QPushButton("Filtrele", self)
+        filter_button.clicked.connect(self.apply_filters)
+        filter_layout.addWidget(self.date_check)
+        filter_layout.addWidget(self.since_input)
+        filter_layout.addWidget(self.until_input)
+        filter_layout.addWidget(filter_button)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        # Sabit satır yüksekliği: görünüm satırları ölçmek için tüm veriyi dolaşmaz
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.table)
+        self.apply_filters()
+
+    def filters(self):
+        filters = {column: line_edit.text().strip() for column, line_edit in self.text_inputs.items()}
+        filters.update({column: combo.currentData() for column, combo in self.choice_inputs.items()})
+        if self.date_check.isChecked():
+            filters["since"] = utc_midnight(self.since_input.date())
+            # Bitiş günü dahil
+            filters["until"] = utc_midnight(self.until_input.date().addDays(1))
+        return filters
+
+    def apply_filters(self):
+        self.model.set_filters(self.filters())
+        self.model.fetchMore()
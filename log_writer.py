@@ -0,0 +1,92 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+from metrics import metrics
+from storage import Storage
+
+
+# Tanıma kayıtlarını arka planda toplu olarak yazan yazıcı. Üreticiler sınırlı bir kuyruğa
+# ekler ve hiçbir zaman diske beklemez; kuyruk doluysa kayıt atılır ve sayılır.
+# Kayıtlar belirli sayıya ulaşınca ya da belirli süre geçince tek bir işlemde yazılır.
+class LogWriter(threading.Thread):
+    def __init__(self, storage, insert_sql, batch_size=200, flush_interval=0.5, max_queue=10000):
+        super().__init__(daemon=True)
+        # Yazıcı kendi iş parçacığında depolama katmanından ayrı bir bağlantı alır
+        self.storage = storage if isinstance(storage, Storage) else Storage(storage)
+        self.insert_sql = insert_sql
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    # Kaydı kuyruğa ekle; yazıcı ilk kayıtta başlatılır. close() çağrıldıktan sonra gelen kayıtlar
+    # yazılmayacağı için kuyruğa alınmaz, atılmış sayılır.
+    def write(self, row):
+        if self._stopping.is_set():
+            self._drop()
+            return
+        if not self.is_alive():
+            self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._drop()
+
+    def _drop(self):
+        self.dropped += 1
+        metrics.count("dropped_log_rows")
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if not self.is_alive() and not self._stopping.is_set():
+                self.start()
+                atexit.register(self.close)
+
+    def run(self):
+        conn = self.storage.connection()
+        try:
+            while not self._stopping.is_set() or not self._queue.empty():
+                batch = self._collect()
+                if batch:
+                    self._flush(conn, batch)
+        finally:
+            self.storage.close()
+
+    # Toplu yazma için kayıt topla: batch_size dolana ya da flush_interval geçene kadar
+    def _collect(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self._stopping.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(timeout, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _flush(self, conn, batch):
+        try:
+            with metrics.stage("sqlite_flush"), conn:
+                conn.executemany(self.insert_sql, batch)
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error as e:
+            print(f"Error in writing recognition logs: {e}")
+
+    # Kuyruktaki tüm kayıtları yazıp yazıcıyı durdur
+    def close(self, timeout=5.0):
+        self._stopping.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def stats(self):
+        return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped, "batches": self.batches}
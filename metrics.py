@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+# Aşama başına tutulan son süre örneği sayısı (kayan pencere)
+WINDOW = 1000
+QUANTILES = (0.5, 0.95, 0.99)
+# Kare hızı bu süredeki karelerden hesaplanır (saniye)
+FPS_WINDOW = 2.0
+# Ekran katmanı bu aralıkta yeniden hesaplanır (saniye)
+OVERLAY_REFRESH = 0.5
+
+
+# Ölçüm kapalıyken dönen, hiçbir şey yapmayan zamanlayıcı
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_stage", "_start")
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metrics.observe(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+# Aşama süreleri için kayan histogramlar (p50/p95/p99), sayaçlar, göstergeler ve kare hızı.
+# Kapalıyken (varsayılan) stage() paylaşılan boş bir zamanlayıcı döndürür ve hiçbir ölçüm yapılmaz.
+#
+#   with metrics.stage("resize"):
+#       frame = cv2.resize(frame, (640, 480))
+class Metrics:
+    def __init__(self, window=WINDOW):
+        self.enabled = False
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}
+        self._counters = {}
+        self._gauges = {}
+        self._frames = deque()
+        self._overlay = []
+        self._overlay_time = 0.0
+        self._server = None
+
+    # Ölçümü aç; port verilirse yerel HTTP uç noktası, path verilirse düzenli yazılan Prometheus metin dosyası
+    def enable(self, port=None, path=None, interval=5.0):
+        self.enabled = True
+        if port:
+            self.serve(port)
+        if path:
+            self.export_file(path, interval)
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[name]
+            totals[0] += 1
+            totals[1] += seconds
+
+    # İşçi işlemlerinden gelen {aşama: saniye} sözlüğü
+    def observe_all(self, timings):
+        if self.enabled and timings:
+            for name, seconds in timings.items():
+                self.observe(name, seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self._gauges[name] = value
+
+    # Gösterilen her kare için çağrılır
+    def frame(self):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._frames.append(now)
+            while self._frames and now - self._frames[0] > FPS_WINDOW:
+                self._frames.popleft()
+
+    def fps(self):
+        with self._lock:
+            if len(self._frames) < 2:
+                return 0.0
+            return (len(self._frames) - 1) / (self._frames[-1] - self._frames[0])
+
+    # {aşama: {"p50", "p95", "p99", "count", "sum"}} (saniye)
+    def snapshot(self):
+        with self._lock:
+            samples = {name: np.fromiter(values, dtype=np.float64) for name, values in self._samples.items()}
+            totals = {name: tuple(value) for name, value in self._totals.items()}
+        result = {}
+        for name, values in samples.items():
+            quantiles = np.quantile(values, QUANTILES) if len(values) else [0.0] * len(QUANTILES)
+            stats = {f"p{int(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)}
+            stats.update(count=totals[name][0], sum=totals[name][1])
+            result[name] = stats
+        return result
+
+    def overlay_lines(self):
+        lines = [f"FPS {self.fps():5.1f}"]
+        lines += [f"{name}: {value}" for name, value in sorted(self._gauges.items())]
+        for name, stats in sorted(self.snapshot().items()):
+            lines.append(f"{name:16s} {stats['p50'] * 1000:6.1f} {stats['p95'] * 1000:6.1f} {stats['p99'] * 1000:6.1f} ms")
+        return lines
+
+    # Ölçümleri karenin sol üst köşesine yaz (camera_label'a verilmeden önce)
+    def draw_overlay(self, frame):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._overlay_time > OVERLAY_REFRESH:
+            self._overlay = self.overlay_lines()
+            self._overlay_time = now
+        for i, line in enumerate(self._overlay):
+            y = 16 + i * 16
+            cv2.putText(frame, line, (8, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (0, 0, 0), 3)
+            cv2.putText(frame, line, (8, y), cv2.FONT_HERSHEY_PLAIN, 1.0, (255, 255, 255), 1)
+
+    def prometheus_text(self):
+        lines = ["# HELP recognition_stage_seconds Asama suresi (kayan pencere)",
+                 "# TYPE recognition_stage_seconds summary"]
+        for name, stats in sorted(self.snapshot().items()):
+            for q in QUANTILES:
+                lines.append(f'recognition_stage_seconds{{stage="{name}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f'recognition_stage_seconds_sum{{stage="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'recognition_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+        lines += ["# TYPE recognition_fps gauge", f"recognition_fps {self.fps():.3f}"]
+        lines.append("# TYPE recognition_events_total counter")
+        with self._lock:
+            counters = dict(self._counters)
+        for name, value in sorted(counters.items()):
+            lines.append(f'recognition_events_total{{name="{name}"}} {value}')
+        lines.append("# TYPE recognition_gauge gauge")
+        for name, value in sorted(self._gauges.items()):
+            lines.append(f'recognition_gauge{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    # Prometheus node_exporter metin dosyası toplayıcısı için dosyayı atomik olarak yaz
+    def write_prometheus(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def export_file(self, path, interval=5.0):
+        def run():
+            while self.enabled:
+                try:
+                    self.write_prometheus(path)
+                except OSError as e:
+                    print(f"Error in writing metrics: {e}")
+                time.sleep(interval)
+        threading.Thread(target=run, daemon=True).start()
+
+    # Sadece yerel makineden erişilen /metrics uç noktası
+    def serve(self, port, host="127.0.0.1"):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.enabled = False
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+# İşlem genelinde paylaşılan ölçüm nesnesi
+metrics = Metrics()
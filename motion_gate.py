@@ -0,0 +1,66 @@
+import time
+
+import cv2
+import numpy as np
+
+from metrics import metrics
+
+# Boş sahnede algılama ve OCR çalıştırmamak için ucuz hareket kapısı. Kare küçültülüp gri tona çevrilir
+# ve bulanıklaştırılır; yavaş güncellenen arka plan ortalamasından belirgin farklı piksellerin oranı
+# eşiği aşarsa sahnede hareket ya da değişiklik var sayılır. Hareket bittikten sonra kapı hold_off saniye
+# daha açık kalır: duran kişi için algılama biraz sürer, ayrılan kişinin izleri de temizlenir.
+# Yeni gelen nesne arka plana karışana kadar (learning_rate) değişiklik olarak görülür.
+GATE_WIDTH = 160
+# Arka plandan en az bu kadar farklı gri seviye değişmiş sayılır
+PIXEL_THRESHOLD = 25
+# Hareket sayılan en küçük değişen piksel oranı
+MIN_CHANGED_RATIO = 0.002
+HOLD_OFF = 2.0
+LEARNING_RATE = 0.02
+
+
+class MotionGate:
+    def __init__(self, width=GATE_WIDTH, pixel_threshold=PIXEL_THRESHOLD, min_changed_ratio=MIN_CHANGED_RATIO,
+                 hold_off=HOLD_OFF, learning_rate=LEARNING_RATE):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.hold_off = hold_off
+        self.learning_rate = learning_rate
+        self.frames = 0
+        self.active_frames = 0
+        self.reset()
+
+    # Arka plan bir sonraki kareden yeniden öğrenilir; ilk karede kapı açıktır
+    def reset(self):
+        self._background = None
+        self._active_until = 0.0
+        self.changed_ratio = 0.0
+
+    def _prepare(self, frame):
+        height = max(1, int(frame.shape[0] * self.width / frame.shape[1]))
+        small = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0).astype(np.float32)
+
+    # Bu karede algılama yapılmalı mı: hareket var ya da son hareketten beri hold_off dolmadı
+    def active(self, frame, now=None):
+        now = time.monotonic() if now is None else now
+        with metrics.stage("motion_gate"):
+            gray = self._prepare(frame)
+            self.frames += 1
+            if self._background is None or self._background.shape != gray.shape:
+                self._background = gray
+                self._active_until = now + self.hold_off
+                self.active_frames += 1
+                return True
+            changed = cv2.absdiff(gray, self._background) > self.pixel_threshold
+            self.changed_ratio = float(np.count_nonzero(changed)) / changed.size
+            cv2.accumulateWeighted(gray, self._background, self.learning_rate)
+        if self.changed_ratio >= self.min_changed_ratio:
+            self._active_until = now + self.hold_off
+        if now < self._active_until:
+            self.active_frames += 1
+            return True
+        metrics.count("motion_skipped_frames")
+        return False
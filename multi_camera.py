@@ -0,0 +1,353 @@
+import argparse
+import sys
+import time
+
+import cv2
+from PyQt5.QtCore import QCoreApplication, QTimer
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication, QGridLayout, QLabel, QVBoxLayout, QWidget
+
+from ann_index import index_path_for
+from capture import CaptureThread
+from database import DB_PATH, get_faces, get_plates, log_plates, log_writer, match_faces, setup_database
+from face_clusters import UnknownFaceClusters, is_unknown_label
+from face_gallery import FaceGallery
+from face_tracker import FaceTracker
+from metrics import metrics
+from motion_gate import MotionGate
+from plate_consensus import PlateConsensus
+from plate_registry import PlateRegistry
+from recognition import is_turkish_license_plate
+from recognition_worker import RecognitionExecutor
+from stream_scheduler import StreamScheduler
+
+# Çok kameralı mod: her kaynak (kamera numarası ya da video dosyası) kendi yakalama iş parçacığında
+# okunur; tüm akışlar tek işçi havuzunu, tek yüz galerisini ve plaka kaydını paylaşır. Havuza hangi
+# akışın karesinin gideceğine StreamScheduler karar verir (akış başına fps bütçesi ve öncelik).
+#
+#   python multi_camera.py kapi1=0 kapi2=1:fps=8 serit=2:plates:priority=2
+#   python multi_camera.py kapi=kayit1.mp4 serit=kayit2.mp4:plates --headless --duration 60
+#
+# Video dosyaları kamera yerine kendi kare hızlarında okunur (--no-realtime ile olabildiğince hızlı).
+RECOGNITION_WORKERS = None
+MAX_FRAMES_IN_FLIGHT = None
+FRAME_SIZE = (640, 480)
+TICK_MS = 15
+STATS_INTERVAL = 5.0
+
+
+# "isim=kaynak[:faces|plates][:fps=N][:priority=N]" -> akış ayarları
+def parse_stream(spec):
+    name, _, rest = spec.partition("=")
+    if not rest:
+        raise ValueError(f"Akis 'isim=kaynak' biciminde olmali: {spec}")
+    parts = rest.split(":")
+    # Windows yolları (C:\...) iki nokta içerebilir; ayar olmayan parçalar kaynağa geri eklenir
+    source = parts[0]
+    config = {"name": name, "task": "faces", "fps": None, "priority": 1.0}
+    for part in parts[1:]:
+        key, _, value = part.partition("=")
+        if part in ("faces", "plates"):
+            config["task"] = part
+        elif key == "fps" and value:
+            config["fps"] = float(value)
+        elif key == "priority" and value:
+            config["priority"] = float(value)
+        else:
+            source += ":" + part
+    config["source"] = int(source) if source.isdigit() else source
+    return config
+
+
+def draw_labels(frame, locations, labels, colors):
+    for (top, right, bottom, left), label, color in zip(locations, labels, colors):
+        cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
+        cv2.putText(frame, label, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+
+
+# Bir kameranın yüz hattı: izleyici, algılama ve kodlama yuzveplaka.py'deki ile aynıdır
+class FaceStream:
+    def __init__(self, name, capture, face_gallery, face_clusters):
+        self.name = name
+        self.capture = capture
+        self.face_gallery = face_gallery
+        self.face_clusters = face_clusters
+        self.face_tracker = FaceTracker()
+        self.motion_gate = MotionGate()
+        self.pending_detections = {}
+        self.pending_encodes = {}
+        self.frame = None
+
+    # Yeni kare geldiyse al; havuza gönderilecek bir iş varsa True
+    def poll(self):
+        latest = self.capture.read_latest()
+        if latest is None:
+            return False
+        self.frame = cv2.resize(latest["frame"], FRAME_SIZE)
+        self.face_tracker.advance()
+        # Kapı her karede çalışır ki arka plan güncel kalsın
+        moving = self.motion_gate.active(self.frame)
+        return moving and self.face_tracker.detection_due() and not self.pending_detections and not self.pending_encodes
+
+    def submit(self, executor):
+        seq = executor.submit('face_locations', self.frame, {"scale": self.face_tracker.detect_scale}, stream=self.name)
+        if seq is not None:
+            self.pending_detections[seq] = self.frame
+        return seq
+
+    # Zamanlayıcının gönderdiği iş tamamlandıysa True (sonradan gelen kodlama işi zamanlayıcı dışındadır)
+    def on_result(self, result, executor):
+        if "error" in result:
+            self.pending_detections.pop(result["seq"], None)
+            self.pending_encodes.pop(result["seq"], None)
+            return result["task"] == 'face_locations'
+        if result["task"] == 'face_locations':
+            frame = self.pending_detections.pop(result["seq"], None)
+            if frame is None:
+                return False
+            pending = self.face_tracker.update_detections(result["face_locations"])
+            if pending:
+                options = {"face_locations": [track["location"] for track in pending]}
+                seq = executor.submit('encode', frame, options, force=True, stream=self.name)
+                self.pending_encodes[seq] = ([track["id"] for track in pending], frame)
+            return True
+        if result["task"] == 'encode':
+            pending = self.pending_encodes.pop(result["seq"], None)
+            if pending is not None:
+                track_ids, frame = pending
+                with metrics.stage("match"):
+                    labels = self.face_clusters.identify(result["face_encodings"],
+                                                         lambda encodings: match_faces(encodings, self.face_gallery),
+                                                         frame, result["face_locations"])
+                for track_id, location, (label, confident) in zip(track_ids, result["face_locations"], labels):
+                    self.face_tracker.assign(track_id, label, confident, location)
+        return False
+
+    def draw(self, frame):
+        labels = self.face_tracker.labels()
+        colors = [(0, 255, 0) if is_unknown_label(label) else (0, 255, 255) if label == "Kayitli Ama Isimsiz"
+                  else (0, 0, 255) for label in labels]
+        draw_labels(frame, self.face_tracker.locations(), labels, colors)
+
+
+# Bir şeridin plaka hattı: kareler arası oylama ve kayıt yuzveplaka.py'deki ile aynıdır
+class PlateStream:
+    def __init__(self, name, capture, plate_registry):
+        self.name = name
+        self.capture = capture
+        self.plate_registry = plate_registry
+        self.plate_consensus = PlateConsensus(validate=is_turkish_license_plate)
+        self.motion_gate = MotionGate()
+        self.plate_results = ([], [])
+        self.frame = None
+
+    def poll(self):
+        latest = self.capture.read_latest()
+        if latest is None:
+            return False
+        self.frame = cv2.resize(latest["frame"], FRAME_SIZE)
+        return self.motion_gate.active(self.frame)
+
+    def submit(self, executor):
+        return executor.submit('plates', self.frame, {"skip_boxes": self.plate_consensus.decided_boxes()},
+                               stream=self.name)
+
+    def on_result(self, result, executor):
+        if "error" in result:
+            return True
+        readings = list(zip(result["plate_locations"], result["plate_numbers"], result["plate_confidences"]))
+        with metrics.stage("plate_consensus"):
+            events = self.plate_consensus.update(readings, result["skipped_plate_locations"])
+        plate_numbers = [event["plate_number"] for event in events]
+        log_plates(plate_numbers)
+        for plate_number in plate_numbers:
+            self.plate_registry.see(plate_number)
+            match = self.plate_registry.possible_match(plate_number)
+            if match is not None:
+                print(f"{self.name}: olasi isaretli plaka: {plate_number} (kayitli: {match['plate_number']})")
+        self.plate_results = self.plate_consensus.display()
+        return True
+
+    def draw(self, frame):
+        boxes, labels = self.plate_results
+        locations = [(y, x + w, y + h, x) for x, y, w, h in boxes]
+        colors = [(0, 0, 255) if self.plate_registry.is_marked(label) else (0, 255, 0) for label in labels]
+        draw_labels(frame, locations, labels, colors)
+
+
+# Akışları, paylaşılan havuzu ve zamanlayıcıyı birleştirir; tick() bir QTimer ile çağrılır
+class MultiCameraController:
+    def __init__(self, configs, realtime=True, parent=None):
+        self.face_gallery = FaceGallery(flag_key="marked")
+        self.face_gallery.load(get_faces())
+        self.face_gallery.enable_index(index_path_for(DB_PATH))
+        self.face_clusters = UnknownFaceClusters()
+        self.plate_registry = PlateRegistry()
+        self.plate_registry.load(get_plates())
+        self.scheduler = StreamScheduler()
+        self.executor = RecognitionExecutor(RECOGNITION_WORKERS, MAX_FRAMES_IN_FLIGHT, parent=parent)
+        self.executor.result_ready.connect(self.on_recognition_result)
+        self.streams = {}
+        for config in configs:
+            capture = CaptureThread(config["source"], width=FRAME_SIZE[0], height=FRAME_SIZE[1], realtime=realtime)
+            if not capture.isOpened():
+                print(f"Kaynak acilamadi: {config['name']} ({config['source']})")
+                continue
+            capture.start()
+            if config["task"] == "plates":
+                stream = PlateStream(config["name"], capture, self.plate_registry)
+            else:
+                stream = FaceStream(config["name"], capture, self.face_gallery, self.face_clusters)
+            self.streams[config["name"]] = stream
+            self.scheduler.add(config["name"], config["fps"], config["priority"])
+
+    # Her akışın en yeni karesini al, sonra havuzdaki boş yerleri adil sırayla dağıt.
+    # Yeni karesi olan akışların listesini döndürür (ekran sadece bunları yeniler).
+    def tick(self):
+        now = time.monotonic()
+        updated, waiting = [], []
+        for name, stream in self.streams.items():
+            frame_before = stream.frame
+            if stream.poll():
+                waiting.append(name)
+            if stream.frame is not frame_before:
+                updated.append(name)
+        for name in self.scheduler.order(waiting, now):
+            if not self.executor.has_capacity():
+                self.scheduler.deferred(name)
+                continue
+            if self.streams[name].submit(self.executor) is not None:
+                self.scheduler.submitted(name, now)
+        return updated
+
+    def on_recognition_result(self, result):
+        try:
+            stream = self.streams.get(result.get("stream"))
+            if stream is None:
+                return
+            if stream.on_result(result, self.executor):
+                self.scheduler.completed(stream.name, result.get("roundtrip"), failed="error" in result)
+        except Exception as e:
+            print(f"Error in handling recognition result: {e}")
+
+    def finished(self):
+        return all(stream.capture.finished for stream in self.streams.values())
+
+    # Zamanlayıcı istatistiklerine yakalama sayaçları eklenir
+    def stats(self):
+        stats = self.scheduler.stats()
+        for name, stream in self.streams.items():
+            stats[name].update(captured=stream.capture.captured_frames, dropped=stream.capture.dropped_frames)
+        return stats
+
+    def stats_lines(self):
+        return [f"{name}: {s['rate']:.1f}/{s['fps'] or '-'} fps, oncelik {s['priority']:g}, "
+                f"gonderilen {s['submitted']}, biten {s['completed']}, butce {s['over_budget']}, "
+                f"havuz dolu {s['deferred']}, atlanan kare {s['dropped']}, "
+                f"gecikme p50 {s['latency_p50'] * 1000:.0f} ms p95 {s['latency_p95'] * 1000:.0f} ms"
+                for name, s in self.stats().items()]
+
+    def close(self):
+        for stream in self.streams.values():
+            stream.capture.release()
+        self.executor.shutdown()
+
+
+# Her akış için bir görüntü ve altında akış istatistikleri
+class MultiCameraWindow(QWidget):
+    def __init__(self, controller, columns=2):
+        super().__init__()
+        self.setWindowTitle('Çok Kameralı Tanıma')
+        self.controller = controller
+        self.views = {}
+        grid = QGridLayout()
+        for i, name in enumerate(controller.streams):
+            view, stats = QLabel(self), QLabel(name, self)
+            box = QVBoxLayout()
+            box.addWidget(view)
+            box.addWidget(stats)
+            grid.addLayout(box, i // columns, i % columns)
+            self.views[name] = (view, stats)
+        self.setLayout(grid)
+        self.last_stats = 0.0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_frames)
+        self.timer.start(TICK_MS)
+
+    def update_frames(self):
+        try:
+            for name in self.controller.tick():
+                stream = self.controller.streams[name]
+                frame = stream.frame.copy()
+                stream.draw(frame)
+                rgb_image = cv2.cvtColor(cv2.resize(frame, (480, 360)), cv2.COLOR_BGR2RGB)
+                h, w, ch = rgb_image.shape
+                qt_image = QImage(rgb_image.data, w, h, ch * w, QImage.Format_RGB888)
+                self.views[name][0].setPixmap(QPixmap.fromImage(qt_image))
+            now = time.monotonic()
+            if now - self.last_stats > 1.0:
+                self.last_stats = now
+                for name, line in zip(self.controller.streams, self.controller.stats_lines()):
+                    self.views[name][1].setText(line)
+        except Exception as e:
+            print(f"Error in updating frames: {e}")
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.controller.close()
+        log_writer.close()
+        metrics.close()
+        super().closeEvent(event)
+
+
+# Ekransız çalıştırma: istatistikler düzenli aralıklarla yazılır, süre dolunca ya da dosyalar bitince çıkılır
+def run_headless(app, controller, duration):
+    started = time.monotonic()
+    last_stats = [started]
+
+    def tick():
+        controller.tick()
+        now = time.monotonic()
+        if now - last_stats[0] >= STATS_INTERVAL:
+            last_stats[0] = now
+            print("\n".join(controller.stats_lines()), flush=True)
+        if controller.finished() or (duration and now - started >= duration):
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(TICK_MS)
+    app.exec_()
+    timer.stop()
+    print(f"{time.monotonic() - started:.1f} sn sonra:")
+    print("\n".join(controller.stats_lines()))
+    print(f"Havuz: {controller.executor.stats()}")
+    controller.close()
+    log_writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cok kamerali yuz ve plaka tanima (paylasilan isci havuzu)")
+    parser.add_argument("streams", nargs="+", help="isim=kaynak[:faces|plates][:fps=N][:priority=N]")
+    parser.add_argument("--headless", action="store_true", help="Pencere acmadan calistir, istatistikleri yaz")
+    parser.add_argument("--duration", type=float, default=0, help="Ekransiz modda calisma suresi (sn, 0: sinirsiz)")
+    parser.add_argument("--no-realtime", action="store_true", help="Video dosyalarini olabildigince hizli oku")
+    args = parser.parse_args()
+    configs = [parse_stream(spec) for spec in args.streams]
+
+    setup_database()
+    app = QCoreApplication(sys.argv) if args.headless else QApplication(sys.argv)
+    controller = MultiCameraController(configs, realtime=not args.no_realtime)
+    if not controller.streams:
+        print("Acilabilen kaynak yok.")
+        return
+    if args.headless:
+        run_headless(app, controller, args.duration)
+        return
+    window = MultiCameraWindow(controller)
+    window.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
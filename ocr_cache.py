@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+HASH_WIDTH = 32
+HASH_HEIGHT = 8
+
+
+# Eşiklenmiş plaka kesitinin algısal özeti: uyarlamalı eşiklemenin düz bölgelerde bıraktığı
+# tuz-biber gürültüsü medyan filtreyle temizlenir, kesit sabit boyuta küçültülür ve her hücre
+# sabit eşikle bite çevrilir. Park etmiş ya da sırada bekleyen araçtan gelen neredeyse aynı
+# kesitler aynı ya da birkaç bit farklı özeti verir. En-boy oranı da anahtara eklenir.
+def plate_hash(plate_image):
+    cleaned = cv2.medianBlur(plate_image, 5)
+    small = cv2.resize(cleaned, (HASH_WIDTH, HASH_HEIGHT), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(small > 127)
+    h, w = plate_image.shape[:2]
+    aspect = min(255, int(round(4 * w / max(h, 1))))
+    return bytes([aspect]) + bits.tobytes()
+
+
+# Plaka OCR sonuçları (metin ya da (metin, güven)) için iş parçacığı güvenli LRU/TTL önbelleği
+class OCRCache:
+    def __init__(self, max_entries=512, ttl=10.0, max_distance=2):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Tam eşleşme yoksa en fazla bu kadar bit farklı özet de isabet sayılır. Tek karakteri farklı
+        # plakalar 4 bit kadar az farkla ayrılabildiği için bu değer küçük, TTL de kısa tutulur.
+        self.max_distance = max_distance
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Sözlük LRU sırasındadır (isabetler sona taşınır); baştan atma sadece en uzun süredir kullanılmayan
+    # süresi dolmuş girişleri temizler. Sık isabet alan girişlerin süresi get() içinde ayrıca denetlenir.
+    def _expire(self, now):
+        while self._entries:
+            key, (_, stored_at) = next(iter(self._entries.items()))
+            if now - stored_at <= self.ttl:
+                break
+            del self._entries[key]
+            self.expirations += 1
+
+    def _nearest(self, key, now):
+        if not self.max_distance or not self._entries:
+            return None
+        keys = [k for k, (_, stored_at) in self._entries.items() if k[0] == key[0] and now - stored_at <= self.ttl]
+        if not keys:
+            return None
+        candidates = np.frombuffer(b''.join(k[1:] for k in keys), dtype=np.uint8).reshape(len(keys), -1)
+        distances = np.unpackbits(candidates ^ np.frombuffer(key[1:], dtype=np.uint8), axis=1).sum(axis=1)
+        best = int(np.argmin(distances))
+        return keys[best] if distances[best] <= self.max_distance else None
+
+    # Önbellekte varsa OCR sonucunu döndürür, yoksa None
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                key = self._nearest(key, now)
+            if key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, text):
+        with self._lock:
+            # TTL girişin ilk okunduğu andan sayılır; böylece hatalı bir okuma sonsuza kadar tekrar edilmez
+            if key in self._entries:
+                self._entries[key] = (text, self._entries[key][1])
+                return
+            self._entries[key] = (text, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # Kesit önbellekte yoksa ocr(kesit) ile okunur ve sonuç (None değilse) önbelleğe yazılır
+    def lookup(self, plate_image, ocr):
+        key = plate_hash(plate_image)
+        text = self.get(key)
+        if text is None:
+            text = ocr(plate_image)
+            if text is not None:
+                self.put(key, text)
+        return text
+
+    # Birden fazla kesit: önbellekte olmayanlar tek çağrıda ocr_batch([kesitler]) ile okunur. ocr None
+    # döndürürse (işçi zaman aşımı ya da çökme) sonuç önbelleğe yazılmaz; aksi halde kesit ve yakın
+    # özetleri TTL boyunca boş okunurdu.
+    def lookup_batch(self, plate_images, ocr_batch):
+        keys = [plate_hash(image) for image in plate_images]
+        texts = [self.get(key) for key in keys]
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if missing:
+            for i, text in zip(missing, ocr_batch([plate_images[i] for i in missing])):
+                texts[i] = text
+                if text is not None:
+                    self.put(keys[i], text)
+        return texts
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "expirations": self.expirations}
@@ -0,0 +1,168 @@
+import atexit
+import multiprocessing
+import queue
+import threading
+
+import numpy as np
+import pytesseract
+
+TESSERACT_CONFIG = '--oem 3 --psm 7'
+DEFAULT_TIMEOUT = 5.0
+
+
+# Eski yol: her kesit için tesseract programı ayrı bir işlem olarak başlatılır ve görüntü geçici dosyaya yazılır
+def tesseract_read(plate_image):
+    return pytesseract.image_to_string(plate_image, config=TESSERACT_CONFIG).strip()
+
+
+# pytesseract ile metin ve kelimelerin ortalama güveni (0-100)
+def tesseract_read_scored(plate_image):
+    data = pytesseract.image_to_data(plate_image, config=TESSERACT_CONFIG, output_type=pytesseract.Output.DICT)
+    words = [(word.strip(), float(conf)) for word, conf in zip(data["text"], data["conf"]) if word.strip()]
+    if not words:
+        return "", 0.0
+    return " ".join(word for word, _ in words), sum(conf for _, conf in words) / len(words)
+
+
+# İşçi işleminde bir kez başlatılan OCR motoru. tesserocr kuruluysa Tesseract kütüphanesi işlem içinde
+# bir kez yüklenir ve kesitler bellekten okunur; kurulu değilse pytesseract yoluna düşülür.
+class _Engine:
+    def __init__(self):
+        try:
+            import tesserocr
+            self._api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_LINE, oem=tesserocr.OEM.DEFAULT)
+        except (ImportError, RuntimeError) as e:
+            print(f"tesserocr kullanilamiyor, pytesseract kullanilacak: {e}")
+            self._api = None
+
+    # (metin, güven) döndürür; güven Tesseract'ın 0-100 arası ortalama kelime güvenidir
+    def read(self, plate_image):
+        if self._api is None:
+            return tesseract_read_scored(plate_image)
+        image = np.ascontiguousarray(plate_image, dtype=np.uint8)
+        h, w = image.shape[:2]
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        self._api.SetImageBytes(image.tobytes(), w, h, channels, w * channels)
+        return self._api.GetUTF8Text().strip(), float(self._api.MeanTextConf())
+
+
+# İşçi işleminin ana döngüsü: borudan (istek_no, [kesitler]) alır, (istek_no, [(metin, güven)]) gönderir
+def _worker_main(conn):
+    engine = _Engine()
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+        request_id, crops = message
+        texts = []
+        for crop in crops:
+            try:
+                texts.append(engine.read(crop))
+            except Exception as e:
+                print(f"Error in OCR worker: {e}")
+                texts.append(("", 0.0))
+        conn.send((request_id, texts))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout=1.0):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+# Uzun ömürlü OCR işçilerinden oluşan havuz. Her işçi motorunu bir kez başlatır ve kesitleri
+# bellekte bir boru üzerinden alır. Bir istekte birden fazla kesit gönderilebilir. Zaman aşımına
+# uğrayan ya da çöken işçi öldürülüp yeniden başlatılır; o isteğin kesitleri için (metin, güven) yerine None
+# döner (okuma yapılamadı; önbelleğe yazılmaz, kesit sonraki karede tekrar okunur).
+class OCRService:
+    def __init__(self, workers=1, timeout=DEFAULT_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        # Qt ve dlib iş parçacıklarıyla fork güvenli olmadığı için işlemler spawn ile başlatılır
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._request_id = 0
+        self._closed = False
+        for _ in range(workers):
+            self._idle.put(_Worker(self._context))
+        atexit.register(self.close)
+        self.requests = 0
+        self.crops = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    # Kesitleri tek istekte boş bir işçiye gönder ve (metin, güven) çiftlerini aynı sırayla döndür; işçi
+    # yanıt vermezse ya da çökerse her kesit için None
+    def read_batch(self, crops, timeout=None):
+        if not crops:
+            return []
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+            self.requests += 1
+            self.crops += len(crops)
+        worker = self._idle.get()
+        try:
+            worker.conn.send((request_id, list(crops)))
+            # Zaman aşımından önceki isteklerin geç gelen yanıtları atlanır
+            while worker.conn.poll(timeout):
+                reply_id, texts = worker.conn.recv()
+                if reply_id == request_id:
+                    return texts
+            with self._lock:
+                self.timeouts += 1
+            print(f"OCR istegi {timeout} sn icinde yanitlanmadi, isci yeniden baslatiliyor.")
+            worker = self._restart(worker)
+        except (EOFError, OSError) as e:
+            print(f"Error in OCR worker: {e}")
+            worker = self._restart(worker)
+        finally:
+            self._idle.put(worker)
+        return [None] * len(crops)
+
+    def read(self, plate_image, timeout=None):
+        return self.read_batch([plate_image], timeout)[0]
+
+    def _restart(self, worker):
+        worker.kill()
+        with self._lock:
+            self.restarts += 1
+        return _Worker(self._context)
+
+    def stats(self):
+        return {"workers": self.workers, "requests": self.requests, "crops": self.crops,
+                "timeouts": self.timeouts, "restarts": self.restarts}
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self.workers):
+            # Meşgul işçiler beklenmez; daemon oldukları için ana işlemle birlikte sonlanırlar
+            try:
+                self._idle.get(timeout=self.timeout).stop()
+            except queue.Empty:
+                break
@@ -0,0 +1,147 @@
+import re
+
+import cv2
+import numpy as np
+
+# Türk plakası 520 x 110 mm (en-boy oranı ~4.7); eğik ya da kısmen kırpılmış plakalar için geniş bir aralık kabul edilir
+PLATE_ASPECT = 520 / 110
+MIN_ASPECT = 2.0
+MAX_ASPECT = 7.0
+# Aday kutusunun kare alanına oranı için sınırlar
+MIN_AREA_RATIO = 0.0005
+MAX_AREA_RATIO = 0.15
+# Karakter sayılan bağlı bileşenlerin plaka yüksekliğine oranı
+CHAR_HEIGHT_RANGE = (0.3, 0.95)
+# Plaka metni 5-8 karakterden oluşur (boşluklar hariç)
+EXPECTED_CHARS = (5, 8)
+# Sol kenardaki mavi AB şeridi: genişliğin ~%8'i, HSV tonu (OpenCV 0-180 ölçeğinde)
+BLUE_BAND_WIDTH = 0.1
+BLUE_HUE_RANGE = (95, 135)
+# Puan ağırlıkları
+WEIGHTS = {"aspect": 0.3, "edges": 0.2, "chars": 0.35, "blue": 0.15}
+# Plaka adayı aranan en büyük kontur sayısı. Adaylar OCR'dan önce puanlandığı için eski 10 sınırından
+# daha geniş bir havuza bakılır; RETR_TREE her dikdörtgen için iç ve dış olmak üzere iki kontur verir.
+PLATE_CONTOURS = 40
+# Aynı plakanın iç ve dış çerçevesi gibi iç içe adaylardan sadece en yüksek puanlı olanı tutulur
+DUPLICATE_IOU = 0.6
+
+
+# Plaka olabilecek dörtgenler: [(kutu, eşiklenmiş kesit)] ve kenar görüntüsü
+def find_plate_candidates(frame, max_contours=PLATE_CONTOURS):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    edged = cv2.Canny(blurred, 50, 150)
+    contours, _ = cv2.findContours(edged, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:max_contours]
+
+    candidates = []
+    for contour in contours:
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4:
+            x, y, w, h = cv2.boundingRect(approx)
+            plate_img = gray[y:y + h, x:x + w]
+            plate_img = cv2.adaptiveThreshold(plate_img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+            candidates.append(((x, y, w, h), plate_img))
+    return candidates, edged
+
+
+def is_turkish_license_plate(plate_text):
+    pattern = r'^\d{2}\s[A-Z]{1,3}\s\d{2,4}$'
+    return re.match(pattern, plate_text) is not None
+
+
+def box_iou(a, b):
+    x, y, w, h = a
+    x2, y2, w2, h2 = b
+    inter_w = min(x + w, x2 + w2) - max(x, x2)
+    inter_h = min(y + h, y2 + h2) - max(y, y2)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / (w * h + w2 * h2 - inter)
+
+
+def _aspect_score(w, h):
+    aspect = w / h
+    if aspect < MIN_ASPECT or aspect > MAX_ASPECT:
+        return None
+    # Beklenen orana yaklaştıkça 1'e çıkar
+    return max(0.0, 1.0 - abs(np.log(aspect / PLATE_ASPECT)) / np.log(MAX_ASPECT / MIN_ASPECT))
+
+
+# Kutunun içindeki kenar piksellerinin oranı; karakterler plakayı düz yüzeylerden (cam, tabela zemini) ayırır
+def _edge_score(edged, box):
+    x, y, w, h = box
+    # Çerçeve kenarları sayılmasın diye kutunun iç kısmına bakılır
+    inner = edged[y + h // 6:y + h - h // 6, x + w // 20:x + w - w // 20]
+    if inner.size == 0:
+        return 0.0
+    density = np.count_nonzero(inner) / inner.size
+    # Plaka metninde yoğunluk tipik olarak 0.1-0.3 arasındadır
+    return float(min(density / 0.1, 1.0) * (1.0 if density < 0.4 else 0.5))
+
+
+# Eşiklenmiş kesitte karakter boyutundaki bağlı bileşen sayısı
+def count_characters(binary_crop):
+    h = binary_crop.shape[0]
+    _, _, stats, _ = cv2.connectedComponentsWithStats(255 - binary_crop, connectivity=8)
+    chars = 0
+    for _, _, cw, ch, area in stats[1:]:
+        if CHAR_HEIGHT_RANGE[0] * h <= ch <= CHAR_HEIGHT_RANGE[1] * h and cw < ch * 1.2 and area > 4:
+            chars += 1
+    return chars
+
+
+def _char_score(chars):
+    low, high = EXPECTED_CHARS
+    if low <= chars <= high:
+        return 1.0
+    if chars < low:
+        return chars / low
+    return max(0.0, 1.0 - (chars - high) / high)
+
+
+# Sol şeritteki mavi piksellerin oranı
+def _blue_score(frame, box):
+    if frame is None or frame.ndim != 3:
+        return 0.0
+    x, y, w, h = box
+    band = frame[y:y + h, x:x + max(1, int(w * BLUE_BAND_WIDTH))]
+    hsv = cv2.cvtColor(band, cv2.COLOR_BGR2HSV)
+    blue = ((hsv[..., 0] >= BLUE_HUE_RANGE[0]) & (hsv[..., 0] <= BLUE_HUE_RANGE[1])
+            & (hsv[..., 1] > 80) & (hsv[..., 2] > 50))
+    return float(min(np.count_nonzero(blue) / blue.size / 0.5, 1.0))
+
+
+# Bir aday kutusunun plaka olma puanı (0-1); en-boy oranı ya da alan sınırların dışındaysa None
+def score_candidate(frame, edged, binary_crop, box):
+    x, y, w, h = box
+    frame_area = edged.shape[0] * edged.shape[1]
+    if h == 0 or not MIN_AREA_RATIO <= w * h / frame_area <= MAX_AREA_RATIO:
+        return None
+    aspect = _aspect_score(w, h)
+    if aspect is None:
+        return None
+    return (WEIGHTS["aspect"] * aspect
+            + WEIGHTS["edges"] * _edge_score(edged, box)
+            + WEIGHTS["chars"] * _char_score(count_characters(binary_crop))
+            + WEIGHTS["blue"] * _blue_score(frame, box))
+
+
+# Adayları puanla, iç içe olanları ele ve OCR'a gidecek en iyi budget adayı döndür.
+# candidates: [(kutu, eşiklenmiş kesit)] -> [(puan, kutu, eşiklenmiş kesit)] (puana göre azalan)
+def rank_candidates(frame, edged, candidates, budget, min_score=0.0):
+    scored = []
+    for box, binary_crop in candidates:
+        score = score_candidate(frame, edged, binary_crop, box)
+        if score is not None and score >= min_score:
+            scored.append((score, box, binary_crop))
+    scored.sort(key=lambda candidate: candidate[0], reverse=True)
+
+    selected = []
+    for candidate in scored:
+        if len(selected) >= budget:
+            break
+        if all(box_iou(candidate[1], other[1]) < DUPLICATE_IOU for other in selected):
+            selected.append(candidate)
+    return selected
@@ -0,0 +1,135 @@
+from collections import Counter, defaultdict
+
+from plate_candidates import box_iou
+
+
+# Kareler arası plaka uzlaşısı: plaka kutuları IoU ile araç izlerine bağlanır, her izin okumaları
+# karakter konumu bazında OCR güveniyle ağırlıklı olarak oylanır. Uzlaşıya varan iz için tek bir
+# plaka olayı üretilir ve o izin kesitleri artık OCR'a gönderilmez (decided_boxes).
+class PlateConsensus:
+    def __init__(self, validate=None, match_iou=0.3, min_votes=3, min_agreement=0.6,
+                 max_missed=15, max_readings=15):
+        # validate(metin) -> bool: uzlaşı metninin geçerli bir plaka olup olmadığı
+        self.validate = validate
+        self.match_iou = match_iou
+        self.min_votes = min_votes
+        self.min_agreement = min_agreement
+        self.max_missed = max_missed
+        self.max_readings = max_readings
+        self.tracks = []
+        self._next_id = 1
+        self.readings = 0
+        self.events = 0
+
+    def reset(self):
+        self.tracks = []
+
+    # Okumaları ağırlıklı oyla birleştir: önce uzunluk, sonra o uzunluktaki okumalarda her karakter konumu.
+    # (metin, uyum, oy sayısı) döndürür; uyum en zayıf konumdaki kazanan ağırlığın toplam ağırlığa oranıdır.
+    @staticmethod
+    def vote(readings):
+        if not readings:
+            return None, 0.0, 0
+        lengths = Counter()
+        for text, weight in readings:
+            lengths[len(text)] += weight
+        length = lengths.most_common(1)[0][0]
+        same_length = [(text, weight) for text, weight in readings if len(text) == length]
+
+        positions = [defaultdict(float) for _ in range(length)]
+        for text, weight in same_length:
+            for position, char in enumerate(text):
+                positions[position][char] += weight
+        chars = []
+        agreement = 1.0
+        for votes in positions:
+            char, weight = max(votes.items(), key=lambda item: item[1])
+            chars.append(char)
+            agreement = min(agreement, weight / sum(votes.values()))
+        return "".join(chars), agreement, len(same_length)
+
+    def _consensus(self, track):
+        text, agreement, votes = self.vote(track["readings"])
+        if text is None or (self.validate is not None and not self.validate(text)):
+            return None, agreement, votes
+        return text, agreement, votes
+
+    def _event(self, track, text, agreement):
+        self.events += 1
+        return {"track_id": track["id"], "plate_number": text, "agreement": agreement,
+                "readings": len(track["readings"]), "location": track["location"]}
+
+    # Bir karenin sonuçlarını işle. readings: [(kutu, metin, güven)], seen_boxes: OCR'a gönderilmeden
+    # görülen (kesinleşmiş izlere ait) kutular. Bu karede kesinleşen plaka olaylarını döndürür.
+    def update(self, readings, seen_boxes=()):
+        observations = [(box, text, confidence) for box, text, confidence in readings]
+        observations += [(box, None, None) for box in seen_boxes]
+        pairs = sorted(((box_iou(track["location"], box), t, o)
+                        for t, track in enumerate(self.tracks)
+                        for o, (box, _, _) in enumerate(observations)), reverse=True)
+        used_tracks, used_observations = set(), set()
+        for score, t, o in pairs:
+            if score < self.match_iou:
+                break
+            if t in used_tracks or o in used_observations:
+                continue
+            used_tracks.add(t)
+            used_observations.add(o)
+            self._observe(self.tracks[t], observations[o])
+
+        events = []
+        tracks = []
+        for t, track in enumerate(self.tracks):
+            if t not in used_tracks:
+                track["missed"] += 1
+            if track["missed"] <= self.max_missed:
+                tracks.append(track)
+            elif track["decided"] is None and len(track["readings"]) >= 2:
+                # Araç uzlaşı eşiğine varmadan çıktı; en iyi tahmin yine de tek olay olarak bildirilir
+                text, agreement, _ = self._consensus(track)
+                if text is not None:
+                    events.append(self._event(track, text, agreement))
+        for o, observation in enumerate(observations):
+            if o not in used_observations and observation[1] is not None:
+                track = {"id": self._next_id, "location": observation[0], "readings": [],
+                         "decided": None, "missed": 0}
+                self._next_id += 1
+                self._observe(track, observation)
+                tracks.append(track)
+        self.tracks = tracks
+
+        for track in self.tracks:
+            if track["decided"] is None and track["missed"] == 0:
+                text, agreement, votes = self._consensus(track)
+                if text is not None and votes >= self.min_votes and agreement >= self.min_agreement:
+                    track["decided"] = text
+                    events.append(self._event(track, text, agreement))
+        return events
+
+    def _observe(self, track, observation):
+        box, text, confidence = observation
+        track["location"] = box
+        track["missed"] = 0
+        if text is None or track["decided"] is not None:
+            return
+        self.readings += 1
+        # Tesseract güveni 0-100; bilinmiyorsa (-1) orta ağırlık kullanılır
+        weight = max(confidence, 1.0) / 100.0 if confidence is not None and confidence >= 0 else 0.5
+        track["readings"].append((text, weight))
+        del track["readings"][:-self.max_readings]
+
+    # Uzlaşıya varmış izlerin son kutuları; bu kutulardaki kesitler OCR'a gönderilmez
+    def decided_boxes(self):
+        return [track["location"] for track in self.tracks if track["decided"] is not None]
+
+    # Ekranda gösterilecek (kutular, etiketler): kesinleşmiş metin ya da o ana kadarki en iyi tahmin
+    def display(self):
+        locations, labels = [], []
+        for track in self.tracks:
+            if track["missed"] > 0:
+                continue
+            label = track["decided"] or self.vote(track["readings"])[0]
+            if label:
+                locations.append(track["location"])
+                labels.append(label)
+        return locations, labels
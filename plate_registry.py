@@ -0,0 +1,150 @@
+import time
+from collections import OrderedDict
+
+# OCR'ın sık karıştırdığı harf/rakam çiftleri aynı anahtara indirgenir
+CONFUSABLE = str.maketrans({'O': '0', 'I': '1'})
+
+
+# Plaka metninin karşılaştırma anahtarı: büyük harf, boşluksuz, O/0 ve I/1 karışıklıkları giderilmiş
+def normalize_plate(plate_number):
+    return "".join(plate_number.upper().split()).translate(CONFUSABLE)
+
+
+# Anahtarın kendisi ve bir karakter silinmiş tüm biçimleri
+def _deletions(key):
+    return {key} | {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+# İki anahtar arasındaki düzenleme uzaklığı en fazla 1 mi (değiştirme, ekleme ya da silme)
+def within_one_edit(a, b):
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        return sum(x != y for x, y in zip(a, b)) == 1
+    if len(a) > len(b):
+        a, b = b, a
+    for i in range(len(b)):
+        if b[:i] + b[i + 1:] == a:
+            return True
+    return False
+
+
+# Kayıtlı plakaların bellekteki dizini. Kayıtlı ve işaretli plakalar normalleştirilmiş anahtarlarla
+# sözlük/kümede tutulur. İşaretli plakalar için silme komşuluğu dizini, bir karakteri yanlış okunmuş
+# plakaları da plaka sayısından bağımsız sürede bulur. Son görülen plakalar süreli bir haritada tutulur.
+class PlateRegistry:
+    def __init__(self, plates=None, fuzzy=True, seen_ttl=300.0, max_seen=10000):
+        self.fuzzy = fuzzy
+        self.seen_ttl = seen_ttl
+        self.max_seen = max_seen
+        self._plates = {}
+        self._marked = set()
+        self._neighbours = {}
+        self._seen = OrderedDict()
+        if plates is not None:
+            self.load(plates)
+
+    def __len__(self):
+        return len(self._plates)
+
+    # Veritabanından gelen plakalarla dizini yeniden oluştur: [{"id", "plate_number", "marked"}]
+    def load(self, plates):
+        self._plates = {}
+        self._marked = set()
+        self._neighbours = {}
+        for plate in plates:
+            self.add(plate["id"], plate["plate_number"], plate["marked"])
+
+    def add(self, plate_id, plate_number, marked=0):
+        key = normalize_plate(plate_number)
+        self._plates[key] = {"id": plate_id, "plate_number": plate_number, "marked": marked}
+        self._set_marked_key(key, marked)
+
+    def remove(self, plate_number):
+        key = normalize_plate(plate_number)
+        if self._plates.pop(key, None) is not None:
+            self._set_marked_key(key, 0)
+
+    def set_marked(self, plate_number, value):
+        key = normalize_plate(plate_number)
+        plate = self._plates.get(key)
+        if plate is not None:
+            plate["marked"] = value
+            self._set_marked_key(key, value)
+
+    def _set_marked_key(self, key, marked):
+        if marked and key not in self._marked:
+            self._marked.add(key)
+            for variant in _deletions(key):
+                self._neighbours.setdefault(variant, set()).add(key)
+        elif not marked and key in self._marked:
+            self._marked.discard(key)
+            for variant in _deletions(key):
+                keys = self._neighbours.get(variant)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._neighbours[variant]
+
+    def get(self, plate_number):
+        return self._plates.get(normalize_plate(plate_number))
+
+    def contains(self, plate_number):
+        return normalize_plate(plate_number) in self._plates
+
+    # İşaretli listede eşleşen kayıtlı plaka (yoksa None). Önce tam eşleşmeye bakılır; fuzzy açıksa
+    # tek karakteri farklı okunmuş plakalar da eşleşir. Aday aynı uzaklıktaysa alfabetik ilk seçilir.
+    def watch_match(self, plate_number):
+        key = normalize_plate(plate_number)
+        if key in self._marked:
+            return self._plates[key]
+        if not self.fuzzy:
+            return None
+        candidates = set()
+        for variant in _deletions(key):
+            candidates |= self._neighbours.get(variant, set())
+        # Silme komşuluğu yer değiştirme gibi 2 uzaklıktaki eşleşmeleri de getirebilir
+        matches = sorted(candidate for candidate in candidates if within_one_edit(key, candidate))
+        return self._plates[matches[0]] if matches else None
+
+    # Kırmızı vurgu için sadece tam (normalleştirilmiş) eşleşme; bir karakter uzaktaki plakalar possible_match ile
+    def is_marked(self, plate_number):
+        return normalize_plate(plate_number) in self._marked
+
+    # Tam eşleşmeyen ama tek karakteri farklı okunmuş olabilecek işaretli plaka (yoksa None); uyarı için
+    def possible_match(self, plate_number):
+        if self.is_marked(plate_number):
+            return None
+        return self.watch_match(plate_number)
+
+    def _expire_seen(self, now):
+        while self._seen:
+            key, entry = next(iter(self._seen.items()))
+            if now - entry["last_seen"] <= self.seen_ttl and len(self._seen) <= self.max_seen:
+                break
+            del self._seen[key]
+
+    # Plakanın görüldüğünü kaydet; TTL içinde ilk kez görülüyorsa True döner
+    def see(self, plate_number, now=None):
+        now = time.time() if now is None else now
+        self._expire_seen(now)
+        key = normalize_plate(plate_number)
+        entry = self._seen.get(key)
+        if entry is not None:
+            entry["last_seen"] = now
+            entry["count"] += 1
+            self._seen.move_to_end(key)
+            return False
+        self._seen[key] = {"plate_number": plate_number, "first_seen": now, "last_seen": now, "count": 1}
+        self._expire_seen(now)
+        return True
+
+    def last_seen(self, plate_number):
+        entry = self._seen.get(normalize_plate(plate_number))
+        return None if entry is None else entry["last_seen"]
+
+    def stats(self):
+        return {"plates": len(self._plates), "marked": len(self._marked),
+                "neighbour_keys": len(self._neighbours), "recently_seen": len(self._seen)}
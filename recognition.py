@@ -0,0 +1,149 @@
+import time
+
+import cv2
+import face_recognition
+
+from ocr_cache import OCRCache
+from ocr_service import OCRService
+from plate_candidates import box_iou, find_plate_candidates, is_turkish_license_plate, rank_candidates
+
+# Her işlemin açacağı kalıcı OCR işçisi sayısı (tanıma havuzundaki her işçi kendi OCR işçilerini açar)
+OCR_WORKERS = 1
+# Kare başına OCR'a gönderilen en fazla plaka adayı
+OCR_BUDGET = 3
+# Önceki karedeki bir kutuyla bu kadar örtüşen aday aynı araç sayılır
+SKIP_IOU = 0.3
+
+
+# Arayüzden bağımsız tanıma adımları. Veritabanına yazmaz ve kareyi değiştirmez;
+# böylece hem arayüzde hem de ayrı işlemlerde (işçi havuzu) çalıştırılabilir.
+
+# Yüz kodlama
+def encode_face(image):
+    face_encodings = face_recognition.face_encodings(image)
+    if face_encodings:
+        return face_encodings[0]
+    return None
+
+
+# Bir karedeki yüzlerin konumları; scale < 1 ise algılama küçültülmüş karede yapılıp
+# konumlar özgün kare ölçeğine geri çevrilir
+def detect_face_locations(frame, scale=1.0):
+    if scale != 1.0:
+        frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    face_locations = face_recognition.face_locations(rgb_frame)
+    if scale != 1.0:
+        face_locations = [tuple(int(round(v / scale)) for v in location) for location in face_locations]
+    return face_locations
+
+
+# Verilen konumlardaki yüzleri kodla
+def encode_faces(frame, face_locations):
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return face_recognition.face_encodings(rgb_frame, face_locations)
+
+
+# Bir karedeki yüzlerin konumları ve 128 boyutlu kodlamaları
+def detect_faces(frame):
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    face_locations = face_recognition.face_locations(rgb_frame)
+    face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+    return face_locations, face_encodings
+
+
+# Aynı işlemdeki tüm iş parçacıklarınca paylaşılan OCR önbelleği (her işçi işleminin kendi önbelleği vardır)
+ocr_cache = OCRCache()
+
+
+_ocr_service = None
+
+
+# Kalıcı OCR işçileri ilk plaka okumasında başlatılır
+def get_ocr_service():
+    global _ocr_service
+    if _ocr_service is None:
+        _ocr_service = OCRService(workers=OCR_WORKERS)
+    return _ocr_service
+
+
+def extract_plate_text(plate_image):
+    result = get_ocr_service().read(plate_image)
+    return "" if result is None else result[0]
+
+
+# Birden fazla kesiti tek istekte oku: [(metin, güven)]; okunamayan kesitler için None
+def extract_plate_texts(plate_images):
+    return get_ocr_service().read_batch(plate_images)
+
+
+# Bir karedeki geçerli plaka okumaları [(kutu, metin, güven)] ve OCR'a gönderilmeden atlanan kutular.
+# Adaylar puanlanır ve sadece en iyi ocr_budget aday OCR'a gönderilir. skip_boxes ile örtüşen adaylar
+# (ör. plakası zaten kesinleşmiş araçlar) bütçeyi harcamaz.
+def read_plates(frame, ocr_budget=OCR_BUDGET, skip_boxes=(), timings=None):
+    candidates, edged = _timed(timings, "plate_candidates", find_plate_candidates, frame)
+    ranked = _timed(timings, "plate_ranking", rank_candidates, frame, edged, candidates, len(candidates))
+
+    skipped = []
+    selected = []
+    for _, box, plate_img in ranked:
+        if any(box_iou(box, skip_box) >= SKIP_IOU for skip_box in skip_boxes):
+            if not any(box_iou(box, other) >= SKIP_IOU for other in skipped):
+                skipped.append(box)
+        elif len(selected) < ocr_budget:
+            selected.append((box, plate_img))
+
+    readings = []
+    # Önbellekte olmayan adaylar OCR işçisine tek istekte gönderilir
+    results = _timed(timings, "ocr", ocr_cache.lookup_batch, [plate_img for _, plate_img in selected], extract_plate_texts)
+    for (box, _), result in zip(selected, results):
+        if result is None:
+            continue
+        plate_text, confidence = result
+        if plate_text and is_turkish_license_plate(plate_text) and plate_text not in [r[1] for r in readings]:
+            readings.append((box, plate_text, confidence))
+    return readings, skipped
+
+
+# Bir karedeki plakaların konumları ve okunan metinleri
+def detect_plates(frame, ocr_budget=OCR_BUDGET):
+    readings, _ = read_plates(frame, ocr_budget)
+    return [box for box, _, _ in readings], [plate_text for _, plate_text, _ in readings]
+
+
+# timings None değilse fn'in süresini timings[name]'e ekler (aşama ölçümü kapalıyken ek iş yapılmaz)
+def _timed(timings, name, fn, *args):
+    if timings is None:
+        return fn(*args)
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+
+# İşçi işlemlerinde çalışan giriş noktası: görev türüne göre kareyi işler.
+# options["timings"] ile sonuç aşama sürelerini {"timings": {aşama: saniye}} olarak da içerir.
+def process_frame(task, frame, options=None):
+    options = options or {}
+    timings = {} if options.get("timings") else None
+    if task == 'faces':
+        face_locations, face_encodings = _timed(timings, "detect_encode", detect_faces, frame)
+        result = {"face_locations": face_locations, "face_encodings": face_encodings}
+    elif task == 'face_locations':
+        result = {"face_locations": _timed(timings, "detect", detect_face_locations, frame, options.get("scale", 1.0))}
+    elif task == 'encode':
+        face_locations = options["face_locations"]
+        result = {"face_locations": face_locations,
+                  "face_encodings": _timed(timings, "encode", encode_faces, frame, face_locations)}
+    elif task == 'plates':
+        readings, skipped = read_plates(frame, options.get("ocr_budget", OCR_BUDGET), options.get("skip_boxes", ()),
+                                        timings)
+        result = {"plate_locations": [box for box, _, _ in readings],
+                  "plate_numbers": [plate_text for _, plate_text, _ in readings],
+                  "plate_confidences": [confidence for _, _, confidence in readings],
+                  "skipped_plate_locations": skipped}
+    else:
+        raise ValueError(f"Bilinmeyen gorev: {task}")
+    if timings is not None:
+        result["timings"] = timings
+    return result
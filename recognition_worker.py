@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import recognition
+from metrics import metrics
+
+
+# Kareleri ayrı işlemlerden oluşan bir havuzda işleyen ve sonuçları Qt sinyaliyle
+# arayüz iş parçacığına ileten yürütücü. Aynı anda işlenen kare sayısı sınırlıdır;
+# sınır doluysa yeni kare gönderilmez, eski bir kareye ait geç gelen sonuçlar atılır.
+class RecognitionExecutor(QObject):
+    # {"seq", "task", "stream", ...process_frame sonucu...} sözlüğü; işçi hata verirse sonuç yerine "error" anahtarı bulunur
+    result_ready = pyqtSignal(dict)
+
+    def __init__(self, workers=None, max_in_flight=None, parent=None):
+        super().__init__(parent)
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_in_flight = max_in_flight or self.workers
+        # dlib ve Qt iş parçacıklarıyla fork güvenli olmadığı için işlemler spawn ile başlatılır
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._in_flight = 0
+        self._last_delivered = {}
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.stale_results = 0
+        self.failed = 0
+
+    # İşlenmekte olan (sonucu beklenen) kare sayısı; havuzu boyutlandırmak için kuyruk derinliği ölçüsü
+    @property
+    def queue_depth(self):
+        return self._in_flight
+
+    def has_capacity(self):
+        return self._in_flight < self.max_in_flight
+
+    # Kareyi havuza gönder ve sıra numarasını döndür; sınır doluysa None döner.
+    # force=True ile (ör. kullanıcının başlattığı karar için) sınır yok sayılır. Birden fazla kamera
+    # aynı havuzu paylaşıyorsa stream akışın adıdır; bayat sonuçlar akış başına ayrı ayrı atılır.
+    def submit(self, task, frame, options=None, force=False, stream=None):
+        with self._lock:
+            if not force and self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                metrics.count("rejected_frames")
+                return None
+            self._seq += 1
+            seq = self._seq
+            self._in_flight += 1
+            self.submitted += 1
+        # Aşama ölçümü açıksa işçiler aşama sürelerini de döndürür
+        if metrics.enabled:
+            options = dict(options or {}, timings=True)
+        submitted_at = time.perf_counter()
+        # Kare havuza daha sonra başka bir iş parçacığında aktarılır; çağıran üzerine çizim yapabilsin diye kopyalanır
+        future = self._pool.submit(recognition.process_frame, task, frame.copy(), options)
+        future.add_done_callback(lambda f, seq=seq, task=task: self._on_done(f, seq, task, stream, submitted_at))
+        return seq
+
+    # Havuzun yönetim iş parçacığında çağrılır; sinyal kuyruklu bağlantı ile arayüz iş parçacığına geçer
+    def _on_done(self, future, seq, task, stream, submitted_at):
+        with self._lock:
+            self._in_flight -= 1
+            metrics.gauge("queue_depth", self._in_flight)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+                print(f"Error in recognition worker: {future.exception()}")
+                self.result_ready.emit({"seq": seq, "task": task, "stream": stream, "error": str(future.exception())})
+                return
+            # Aynı akışta aynı görev için daha yeni bir kare zaten teslim edildiyse bu sonuç bayattır
+            if seq < self._last_delivered.get((stream, task), 0):
+                self.stale_results += 1
+                metrics.count("stale_results")
+                return
+            self._last_delivered[(stream, task)] = seq
+            self.completed += 1
+        result = future.result()
+        roundtrip = time.perf_counter() - submitted_at
+        result.update(seq=seq, task=task, stream=stream, roundtrip=roundtrip)
+        # Gönderimden sonuca kadar geçen süre (kuyrukta bekleme ve aktarım dahil)
+        metrics.observe(f"{task}_roundtrip", roundtrip)
+        metrics.observe_all(result.pop("timings", None))
+        self.result_ready.emit(result)
+
+    def stats(self):
+        return {"workers": self.workers, "max_in_flight": self.max_in_flight, "queue_depth": self._in_flight,
+                "submitted": self.submitted, "completed": self.completed, "rejected": self.rejected,
+                "stale_results": self.stale_results, "failed": self.failed}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,138 @@
+import pickle
+import sqlite3
+import threading
+
+import cv2
+import numpy as np
+
+ENCODING_DTYPE = np.dtype('<f4')
+# PRAGMA user_version ile tutulan şema sürümü
+# 1: faces.encoding sütunu pickle yerine ham little-endian float32 baytları
+SCHEMA_VERSION = 1
+# Kayıtlı yüzler listesinde gösterilen küçük resimlerin en uzun kenarı (piksel)
+THUMBNAIL_SIZE = 100
+
+
+# Her bağlantıda uygulanan ayarlar: WAL ile okuyucular yazıcıyı beklemez,
+# synchronous=NORMAL WAL altında her commit'te fsync yapmaz
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA busy_timeout=5000",
+)
+STATEMENT_CACHE_SIZE = 256
+
+
+# İki uygulamanın da kullandığı kalıcı depolama katmanı: her iş parçacığı için tek,
+# uzun ömürlü bir bağlantı tutar. sqlite3 hazırlanmış ifadeleri bağlantı başına önbelleğe alır.
+class Storage:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    # Bu iş parçacığının bağlantısı (ilk kullanımda açılır)
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    # Yazma ifadesi: tek işlemde çalıştırıp commit eder
+    def execute(self, sql, params=()):
+        conn = self.connection()
+        with conn:
+            return conn.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        conn = self.connection()
+        with conn:
+            return conn.executemany(sql, rows)
+
+    def query(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()
+
+    # Bu iş parçacığının bağlantısını kapat
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Yüz kodlamasını veritabanında saklanacak ham float32 baytlarına çevir
+def encoding_to_blob(encoding):
+    return np.asarray(encoding, dtype=ENCODING_DTYPE).tobytes()
+
+
+# Ham baytlardan kopyasız (salt okunur) kodlama dizisi oluştur
+def encoding_from_blob(blob):
+    return np.frombuffer(blob, dtype=ENCODING_DTYPE)
+
+
+# Eski pickle kodlamalarını ham float32 biçimine dönüştür
+def migrate_encodings(conn):
+    cursor = conn.cursor()
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    rows = cursor.execute("SELECT id, encoding FROM faces").fetchall()
+    converted = []
+    for face_id, blob in rows:
+        if blob is None or len(blob) == 128 * ENCODING_DTYPE.itemsize:
+            continue
+        converted.append((encoding_to_blob(pickle.loads(blob)), face_id))
+    cursor.executemany("UPDATE faces SET encoding = ? WHERE id = ?", converted)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+    if converted:
+        print(f"{len(converted)} yuz kodlamasi yeni bicime donusturuldu.")
+
+
+# Kayıt sırasında bir kez üretilen küçük resim: en uzun kenarı size olan JPEG baytları (resim çözülemezse None)
+def make_thumbnail(image_blob, size=THUMBNAIL_SIZE):
+    image = cv2.imdecode(np.frombuffer(image_blob, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    return thumbnail_from_image(image, size)
+
+
+# Çözülmüş (BGR) resimden küçük resim
+def thumbnail_from_image(image, size=THUMBNAIL_SIZE):
+    scale = size / max(image.shape[:2])
+    if scale < 1:
+        image = cv2.resize(image, (max(int(image.shape[1] * scale), 1), max(int(image.shape[0] * scale), 1)),
+                           interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return buffer.tobytes() if ok else None
+
+
+# faces tablosuna küçük resim sütununu ekle; eski kayıtların küçük resimleri ilk gösterimde üretilir
+def migrate_thumbnails(conn):
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(faces)")]
+    if "thumbnail" not in columns:
+        conn.execute("ALTER TABLE faces ADD COLUMN thumbnail BLOB")
+        conn.commit()
+
+
+# Yüzün küçük resmi; eski kayıtlarda yoksa tam resimden bir kez üretilip saklanır
+def face_thumbnail(conn, face_id):
+    row = conn.execute("SELECT thumbnail FROM faces WHERE id = ?", (face_id,)).fetchone()
+    if row is None:
+        return None
+    if row[0] is not None:
+        return row[0]
+    row = conn.execute("SELECT image FROM faces WHERE id = ?", (face_id,)).fetchone()
+    thumbnail = make_thumbnail(row[0]) if row and row[0] else None
+    if thumbnail is not None:
+        with conn:
+            conn.execute("UPDATE faces SET thumbnail = ? WHERE id = ?", (thumbnail, face_id))
+    return thumbnail
@@ -0,0 +1,97 @@
+import time
+from collections import deque
+
+# Birden fazla kameranın tek işçi havuzunu paylaşması için adil zamanlayıcı. Her akışın bir kare hızı
+# bütçesi (fps, saniyede en fazla gönderim) ve önceliği (ağırlık) vardır. Havuzda yer açıldığında
+# gönderilecek karesi olan ve bütçesi izin veren akışlar arasından sanal zamanı en geride olan seçilir;
+# her gönderim akışın sanal zamanını 1/öncelik kadar ilerletir (ağırlıklı adil sıra). Böylece öncelik
+# 2 olan akış, havuz doluyken öncelik 1 olanın iki katı kare gönderir ve hiçbir akış aç kalmaz.
+
+# Gecikme istatistiği için akış başına tutulan son örnek sayısı
+LATENCY_WINDOW = 200
+# Gerçekleşen kare hızı bu süredeki gönderimlerden hesaplanır (saniye)
+RATE_WINDOW = 5.0
+
+
+class StreamScheduler:
+    def __init__(self):
+        self._streams = {}
+        # Sistemin sanal saati: en son gönderim hakkı alan akışın başlangıç sanal zamanı
+        self._vclock = 0.0
+
+    # fps None ise bütçe sınırı yoktur (sadece havuz kapasitesi ve adil sıra uygulanır)
+    def add(self, name, fps=None, priority=1.0):
+        self._streams[name] = {"name": name, "interval": 1.0 / fps if fps else 0.0, "fps": fps,
+                               "priority": max(float(priority), 1e-3), "vtime": self._vclock,
+                               "next_due": 0.0, "submitted": 0, "completed": 0, "failed": 0,
+                               "over_budget": 0, "deferred": 0, "latencies": deque(maxlen=LATENCY_WINDOW),
+                               "sent": deque()}
+
+    def remove(self, name):
+        self._streams.pop(name, None)
+
+    def names(self):
+        return list(self._streams)
+
+    # Gönderecek karesi olan akışlardan (waiting) bu turda gönderim hakkı olanlar, adil sırada.
+    # Bütçesi dolmamış akışların bekleyen karesi bu turda atlanır ve "over_budget" olarak sayılır.
+    def order(self, waiting, now=None):
+        now = time.monotonic() if now is None else now
+        ready = []
+        for name in waiting:
+            stream = self._streams[name]
+            if now < stream["next_due"]:
+                stream["over_budget"] += 1
+                continue
+            ready.append(stream)
+        # Uzun süre boşta kalan akış geçmiş hakkını biriktirip havuzu tekelleştirmesin diye
+        # sanal zamanı sistem saatinin gerisinde sayılmaz
+        ready.sort(key=lambda stream: (max(stream["vtime"], self._vclock), -stream["priority"]))
+        return [stream["name"] for stream in ready]
+
+    # Akışın karesi havuza gönderildi
+    def submitted(self, name, now=None):
+        now = time.monotonic() if now is None else now
+        stream = self._streams[name]
+        stream["submitted"] += 1
+        self._vclock = max(stream["vtime"], self._vclock)
+        stream["vtime"] = self._vclock + 1.0 / stream["priority"]
+        # Bütçe, kareler arası süre kadar ileri kayar; geç kalan akış birikmiş kareleri art arda göndermez
+        stream["next_due"] = max(stream["next_due"] + stream["interval"], now)
+        sent = stream["sent"]
+        sent.append(now)
+        while sent and now - sent[0] > RATE_WINDOW:
+            sent.popleft()
+
+    # Sırası geldiği halde havuz dolu olduğu için gönderilemedi
+    def deferred(self, name):
+        self._streams[name]["deferred"] += 1
+
+    def completed(self, name, latency=None, failed=False):
+        stream = self._streams.get(name)
+        if stream is None:
+            return
+        if failed:
+            stream["failed"] += 1
+            return
+        stream["completed"] += 1
+        if latency is not None:
+            stream["latencies"].append(latency)
+
+    # {akış: {"fps", "priority", "rate", "submitted", "completed", "failed", "over_budget", "deferred",
+    #         "latency_p50", "latency_p95"}} (gecikmeler saniye)
+    def stats(self, now=None):
+        now = time.monotonic() if now is None else now
+        result = {}
+        for name, stream in self._streams.items():
+            sent = [t for t in stream["sent"] if now - t <= RATE_WINDOW]
+            latencies = sorted(stream["latencies"])
+            result[name] = {
+                "fps": stream["fps"], "priority": stream["priority"],
+                "rate": (len(sent) - 1) / (sent[-1] - sent[0]) if len(sent) > 1 and sent[-1] > sent[0] else 0.0,
+                "submitted": stream["submitted"], "completed": stream["completed"], "failed": stream["failed"],
+                "over_budget": stream["over_budget"], "deferred": stream["deferred"],
+                "latency_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+                "latency_p95": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else 0.0,
+            }
+        return result
@@ -1,199 +1,43 @@
 import sys
 import cv2
-import face_recognition
-import numpy as np
-import sqlite3
-import re
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QLineEdit, QFileDialog, QDialog, QInputDialog, QScrollArea, QHBoxLayout, QMessageBox
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QLineEdit, QFileDialog, QDialog, QInputDialog, QHBoxLayout, QMessageBox
 from PyQt5.QtCore import QTimer, QDateTime
 from PyQt5.QtGui import QImage, QPixmap
 from datetime import datetime
-import pytesseract
-import pickle
-
-detected_plates = {}
-
-# Veritabanı bağlantısı
-def create_connection():
-    return sqlite3.connect('recognition.db')
-
-# Veritabanı kurulumu ve güncelleme
-def setup_database():
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS faces (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            name TEXT,
-                            encoding BLOB,
-                            image BLOB,
-                            marked INTEGER DEFAULT 0)''')
-        cursor.execute('''CREATE TABLE IF NOT EXISTS plates (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            plate_number TEXT,
-                            marked INTEGER DEFAULT 0)''')
-        cursor.execute('''CREATE TABLE IF NOT EXISTS recognition_logs (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            type TEXT,
-                            identifier TEXT,
-                            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-        conn.commit()
-
-# Veritabanına yüz ekleme
-def add_face(name, encoding, image):
-    encoding_blob = pickle.dumps(encoding)
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO faces (name, encoding, image) VALUES (?, ?, ?)", (name, encoding_blob, image))
-        conn.commit()
-
-# Veritabanındaki tüm yüzleri alma
-def get_faces():
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM faces")
-        faces = cursor.fetchall()
-    return [{"id": face[0], "name": face[1], "encoding": pickle.loads(face[2]), "image": face[3], "marked": face[4]} for face in faces]
-
-# Veritabanında bir yüzü işaretleme
-def mark_face(name):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE faces SET marked = 1 WHERE name = ?", (name,))
-        conn.commit()
-
-# Veritabanında bir yüzün işaretini kaldırma
-def unmark_face(name):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE faces SET marked = 0 WHERE name = ?", (name,))
-        conn.commit()
-
-# Veritabanından bir yüzü silme
-def delete_face(name):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM faces WHERE name = ?", (name,))
-        conn.commit()
-
-# Veritabanındaki tüm yüzleri işaretleme
-def mark_all_faces():
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE faces SET marked = 1")
-        conn.commit()
-
-# Veritabanına plaka ekleme
-def add_plate(plate_number):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO plates (plate_number) VALUES (?)", (plate_number,))
-        conn.commit()
-
-# Veritabanındaki tüm plakaları alma
-def get_plates():
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM plates")
-        plates = cursor.fetchall()
-    return [{"id": plate[0], "plate_number": plate[1], "marked": plate[2]} for plate in plates]
-
-# Veritabanında bir plakayı işaretleme
-def mark_plate(plate_number):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE plates SET marked = 1 WHERE plate_number = ?", (plate_number,))
-        conn.commit()
-
-# Veritabanında bir plakanın işaretini kaldırma
-def unmark_plate(plate_number):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("UPDATE plates SET marked = 0 WHERE plate_number = ?", (plate_number,))
-        conn.commit()
-
-# Tanıma olayını kaydetme
-def log_recognition(rec_type, identifier):
-    with create_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO recognition_logs (type, identifier) VALUES (?, ?)", (rec_type, identifier))
-        conn.commit()
-
-# Yüzün yeni olup olmadığını kontrol etme
-def is_new_face(face_encoding, known_faces):
-    for known_face in known_faces:
-        matches = face_recognition.compare_faces([known_face["encoding"]], face_encoding)
-        if True in matches:
-            return False
-    return True
-
-# Yüz kodlama
-def encode_face(image):
-    face_encodings = face_recognition.face_encodings(image)
-    if face_encodings:
-        return face_encodings[0]
-    return None
-
-# Bir karedeki yüzleri tanıma
-def recognize_faces(frame, known_faces):
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    face_locations = face_recognition.face_locations(rgb_frame)
-    face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-
-    face_names = []
-    for face_encoding in face_encodings:
-        matches = face_recognition.compare_faces([face["encoding"] for face in known_faces], face_encoding)
-        name = "Yeni Yuz"
-        face_distances = face_recognition.face_distance([face["encoding"] for face in known_faces], face_encoding)
-        if len(face_distances) > 0:
-            best_match_index = np.argmin(face_distances)
-            if matches[best_match_index]:
-                name = known_faces[best_match_index]["name"]
-                if name == "Isimsiz":
-                    name = "Kayitli Ama Isimsiz"
-                # Bu yüz işaretlenmiş mi kontrol et
-                if known_faces[best_match_index]["marked"]:
-                    log_recognition('face', name)
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    print(f"Marked face {name} recognized at {timestamp}!")
-        face_names.append(name)
-
-    return face_locations, face_names
-
-# Bir karedeki plakaları tanıma
-def recognize_plate(frame):
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-    edged = cv2.Canny(blurred, 50, 150)
-    contours, _ = cv2.findContours(edged, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    contours = sorted(contours, key=cv2.contourArea, reverse=True)[:10]
-
-    recognized_plates = []
-    plate_locations = []
-
-    for contour in contours:
-        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
-        if len(approx) == 4:
-            x, y, w, h = cv2.boundingRect(approx)
-            plate_img = gray[y:y + h, x:x + w]
-            plate_img = cv2.adaptiveThreshold(plate_img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-            plate_text = extract_plate_text(plate_img)
-            if plate_text and is_turkish_license_plate(plate_text) and plate_text not in recognized_plates:
-                recognized_plates.append(plate_text)
-                plate_locations.append((x, y, w, h))
-                log_recognition('plate', plate_text)
-                cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                cv2.putText(frame, plate_text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-
-    return plate_locations, recognized_plates
-
-def is_turkish_license_plate(plate_text):
-    pattern = r'^\d{2}\s[A-Z]{1,3}\s\d{2,4}$'
-    return re.match(pattern, plate_text) is not None
-
-def extract_plate_text(plate_image):
-    config = '--oem 3 --psm 7'
-    plate_text = pytesseract.image_to_string(plate_image, config=config)
-    return plate_text.strip()
+from face_gallery import FaceGallery
+from ann_index import index_path_for
+from capture import CaptureThread
+from recognition import encode_face, is_turkish_license_plate
+from recognition_worker import RecognitionExecutor
+from face_tracker import FaceTracker
+from plate_consensus import PlateConsensus
+from plate_registry import PlateRegistry
+from metrics import metrics
+from log_viewer import LogViewerDialog
+from face_list import FaceListModel, FaceListDialog
+from load_shedder import LoadShedder
+from motion_gate import MotionGate
+from face_clusters import UnknownFaceClusters, cluster_label, is_unknown_label
+from database import (DB_PATH, log_writer, create_connection, setup_database, add_face, get_faces, get_face_thumbnail,
+                      mark_face, unmark_face, delete_face, mark_all_faces, add_plate, get_plates, mark_plate,
+                      unmark_plate, match_faces, log_plates)
+
+# Tanıma işçi havuzu ayarları (None: çekirdek sayısına göre)
+RECOGNITION_WORKERS = None
+MAX_FRAMES_IN_FLIGHT = None
+# Aşama süresi ölçümü: kapalıyken ek iş yapılmaz. Açıkken p50/p95/p99 değerleri kamera görüntüsünün
+# üzerinde gösterilebilir, yerel bir HTTP uç noktasından ya da bir dosyadan Prometheus biçiminde okunabilir.
+METRICS_ENABLED = False
+# Hedef karar gecikmesi (sn): aşılınca kare atlama, küçük algılama, aday sınırı ve OCR durdurma
+# adımlarıyla yük atılır (bkz. load_shedder.py); None ile kapatılır
+LOAD_TARGET_LATENCY = 0.3
+# Sahnede hareket yokken yüz algılama ve plaka OCR'ı çalıştırılmaz (bkz. motion_gate.py);
+# hareket bittikten sonra algılama MOTION_HOLD_OFF saniye daha sürer
+MOTION_GATE = True
+MOTION_HOLD_OFF = 2.0
+METRICS_OVERLAY = True
+METRICS_PORT = None  # ör. 9108 -> http://127.0.0.1:9108/metrics
+METRICS_FILE = None  # ör. '/var/lib/node_exporter/recognition.prom'
 
 # Ana pencere sınıfı
 class MainWindow(QWidget):
@@ -201,19 +45,36 @@ class MainWindow(QWidget):
         super().__init__()
         try:
             self.initUI()
-            self.known_faces = []
-            self.known_plates = []
-            self.detected_plates = {}
+            if METRICS_ENABLED:
+                metrics.enable(METRICS_PORT, METRICS_FILE)
+            self.face_gallery = FaceGallery(flag_key="marked")
+            # Kayıtlı ve işaretli plakalar normalleştirilmiş anahtarlarla dizinlenir; son görülenler süreli tutulur
+            self.plate_registry = PlateRegistry()
             self.detected_faces = set()  # Önceden tespit edilen yüzleri takip etmek için
             self.load_known_faces()
             self.load_known_plates()
+            self.plate_results = ([], [])
+            # Yüzler her karede değil, izleyicinin istediği karelerde algılanır ve sadece yeni/kayan izler kodlanır
+            self.face_tracker = FaceTracker()
+            self.load_shedder = LoadShedder(LOAD_TARGET_LATENCY)
+            self.motion_gate = MotionGate(hold_off=MOTION_HOLD_OFF)
+            self.face_tracker.detect_scale = self.load_shedder.settings["detect_scale"]
+            self.pending_detections = {}
+            self.pending_encodes = {}
+            # Galeride olmayan yüzler kümelenir; tekrar gelen bir ziyaretçi aynı "Ziyaretci N" etiketini alır
+            self.face_clusters = UnknownFaceClusters()
+            # Plakalar kareler arasında oylanır; her araç geçişi için tek bir plaka olayı üretilir
+            self.plate_consensus = PlateConsensus(validate=is_turkish_license_plate)
+            # Algılama ve OCR arayüz iş parçacığını bloklamaması için işlem havuzunda çalışır
+            self.executor = RecognitionExecutor(RECOGNITION_WORKERS, MAX_FRAMES_IN_FLIGHT, parent=self)
+            self.executor.result_ready.connect(self.on_recognition_result)
             self.timer = QTimer(self)
-            self.cap = cv2.VideoCapture(0)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)  # Çözünürlüğü ayarla
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)  # Çözünürlüğü ayarla
+            # Kamera ayrı bir iş parçacığında okunur, işleme her zaman en yeni kareyi alır
+            self.cap = CaptureThread(0, width=640, height=480)
             if not self.cap.isOpened():
                 print("Kamera açilamadi.")
                 return
+            self.cap.start()
             self.auto_save_active = False
         except Exception as e:
             print(f"Initialization error: {e}")
@@ -251,10 +112,20 @@ class MainWindow(QWidget):
         self.view_plates_button.hide()
 
         self.mark_all_faces_button = QPushButton('Tüm Yüzleri İşaretle', self)
-        self.mark_all_faces_button.clicked.connect(mark_all_faces)
+        self.mark_all_faces_button.clicked.connect(self.mark_all_faces)
         self.mark_all_faces_button.setStyleSheet('background-color: lightgray; border-radius: 10px; padding: 10px')
         self.mark_all_faces_button.hide()
 
+        self.view_unknown_faces_button = QPushButton('Bilinmeyen Yüzler', self)
+        self.view_unknown_faces_button.clicked.connect(self.view_unknown_faces)
+        self.view_unknown_faces_button.setStyleSheet('background-color: lightcyan; border-radius: 10px; padding: 10px')
+        self.view_unknown_faces_button.hide()
+
+        self.view_logs_button = QPushButton('Tanıma Kayıtlarını Gör', self)
+        self.view_logs_button.clicked.connect(self.view_logs)
+        self.view_logs_button.setStyleSheet('background-color: lightsteelblue; border-radius: 10px; padding: 10px')
+        self.view_logs_button.hide()
+
         self.auto_save_button = QPushButton('Oto Kaydet', self)
         self.auto_save_button.clicked.connect(self.toggle_auto_save)
         self.auto_save_button.setStyleSheet('background-color: lightpink; border-radius: 10px; padding: 10px')
@@ -285,9 +156,11 @@ class MainWindow(QWidget):
         button_layout.addWidget(self.upload_plate_button)
         button_layout.addWidget(self.plate_input)
         button_layout.addWidget(self.view_faces_button)
+        button_layout.addWidget(self.view_unknown_faces_button)
         button_layout.addWidget(self.view_plates_button)
         button_layout.addWidget(self.mark_all_faces_button)
         button_layout.addWidget(self.auto_save_button)
+        button_layout.addWidget(self.view_logs_button)
 
         main_layout = QHBoxLayout()
         main_layout.addWidget(self.camera_label)
@@ -299,29 +172,46 @@ class MainWindow(QWidget):
     def show_face_recognition_buttons(self):
         self.upload_face_button.show()
         self.view_faces_button.show()
+        self.view_unknown_faces_button.show()
         self.mark_all_faces_button.show()
+        self.view_logs_button.show()
         self.upload_plate_button.hide()
         self.view_plates_button.hide()
         self.auto_save_button.hide()
         self.name_input.show()
         self.plate_input.hide()
 
-        self.timer.stop()
-        self.timer.timeout.connect(self.update_frame_face_recognition)
-        self.timer.start(30)
+        self.switch_timer(self.update_frame_face_recognition)
 
     def show_plate_recognition_buttons(self):
         self.upload_plate_button.show()
         self.view_plates_button.show()
         self.auto_save_button.show()
+        self.view_logs_button.show()
         self.upload_face_button.hide()
         self.view_faces_button.hide()
+        self.view_unknown_faces_button.hide()
         self.mark_all_faces_button.hide()
         self.name_input.hide()
         self.plate_input.show()
 
+        self.switch_timer(self.update_frame_plate_recognition)
+
+    # Zamanlayıcıyı sadece seçili modun kare güncellemesine bağla
+    def switch_timer(self, update_frame):
         self.timer.stop()
-        self.timer.timeout.connect(self.update_frame_plate_recognition)
+        try:
+            self.timer.timeout.disconnect()
+        except TypeError:
+            pass
+        self.face_tracker.reset()
+        self.pending_detections.clear()
+        self.pending_encodes.clear()
+        self.load_shedder.reset()
+        self.motion_gate.reset()
+        self.plate_consensus.reset()
+        self.plate_results = ([], [])
+        self.timer.timeout.connect(update_frame)
         self.timer.start(30)
 
     def upload_face(self):
@@ -340,8 +230,12 @@ class MainWindow(QWidget):
                     if ok:
                         with open(fileName, 'rb') as f:
                             image_blob = f.read()
-                        add_face(name, encoding, image_blob)
-                        self.load_known_faces()
+                        face_id = add_face(name, encoding, image_blob)
+                        self.face_gallery.add(face_id, name, encoding)
+                        self.face_gallery.save_index()
+                        # Bu kişiye ait ziyaretçi kümeleri artık galeriden tanınır
+                        for cluster_id in self.face_clusters.remove_near(encoding, self.face_gallery.tolerance):
+                            self.face_tracker.relabel(cluster_label(cluster_id), name)
         except Exception as e:
             print(f"Error in uploading face: {e}")
 
@@ -351,8 +245,7 @@ class MainWindow(QWidget):
             if ok and plate_number:
                 plate_number = plate_number.upper()
                 if is_turkish_license_plate(plate_number):
-                    add_plate(plate_number)
-                    self.load_known_plates()
+                    self.plate_registry.add(add_plate(plate_number), plate_number)
                     self.plate_input.clear()
                 else:
                     QMessageBox.warning(self, "Hatalı Format", "Lütfen geçerli bir Türk plakası girin.")
@@ -361,87 +254,124 @@ class MainWindow(QWidget):
 
     def load_known_faces(self):
         try:
-            self.known_faces = get_faces()
+            self.face_gallery.load(get_faces())
+            self.face_gallery.enable_index(index_path_for(DB_PATH))
         except Exception as e:
             print(f"Error in loading known faces: {e}")
 
     def load_known_plates(self):
         try:
-            self.known_plates = get_plates()
+            self.plate_registry.load(get_plates())
         except Exception as e:
             print(f"Error in loading known plates: {e}")
 
+    # Sadece görünen satırların küçük resimleri okunur (bkz. face_list.py)
     def view_faces(self):
         try:
-            dialog = QDialog(self)
-            dialog.setWindowTitle("Kayıtlı Yüzler")
-            scroll = QScrollArea(dialog)
-            scroll.setWidgetResizable(True)
-            container = QWidget()
-            layout = QVBoxLayout(container)
-
-            faces = get_faces()
-            for face in faces:
-                if face["image"]:
-                    image = QImage.fromData(face["image"])
-                    pixmap = QPixmap.fromImage(image)
-                    label = QLabel()
-                    label.setPixmap(pixmap.scaled(100, 100, aspectRatioMode=1))
-                    layout.addWidget(QLabel(f"Name: {face['name']}"))
-                    layout.addWidget(label)
-                    if face["marked"]:
-                        mark_label = QLabel("Isaretli")
-                        mark_label.setStyleSheet('background-color: yellow')
-                        layout.addWidget(mark_label)
-                    mark_button = QPushButton("Isaretle", container)
-                    mark_button.clicked.connect(lambda _, name=face['name']: self.mark_and_notify(name))
-                    mark_button.setStyleSheet('background-color: lightblue')
-                    layout.addWidget(mark_button)
-                    unmark_button = QPushButton("Isaret Kaldir", container)
-                    unmark_button.clicked.connect(lambda _, name=face['name']: self.unmark_and_notify(name))
-                    unmark_button.setStyleSheet('background-color: lightgreen')
-                    layout.addWidget(unmark_button)
-                    delete_button = QPushButton("Sil", container)
-                    delete_button.clicked.connect(lambda _, name=face['name']: self.delete_and_notify(name))
-                    delete_button.setStyleSheet('background-color: lightcoral')
-                    layout.addWidget(delete_button)
-                    name_button = QPushButton("Isimle", container)
-                    name_button.clicked.connect(lambda _, face_id=face['id']: self.rename_face(face_id))
-                    name_button.setStyleSheet('background-color: lightgoldenrodyellow')
-                    layout.addWidget(name_button)
-
-            scroll.setWidget(container)
-            layout_wrapper = QVBoxLayout(dialog)
-            layout_wrapper.addWidget(scroll)
-            dialog.setLayout(layout_wrapper)
+            model = FaceListModel(get_faces(), get_face_thumbnail, "marked", {1: ("Isaretli", "yellow")})
+            dialog = FaceListDialog(model, "Kayıtlı Yüzler", parent=self)
+
+            def mark(face):
+                if self.mark_and_notify(face["name"]):
+                    model.update_faces(lambda f: f["name"] == face["name"], marked=1)
+
+            def unmark(face):
+                if self.unmark_and_notify(face["name"]):
+                    model.update_faces(lambda f: f["name"] == face["name"], marked=0)
+
+            def delete(face):
+                if self.delete_and_notify(face["name"]):
+                    model.remove_faces(lambda f: f["name"] == face["name"])
+
+            def rename(face):
+                new_name = self.rename_face(face["id"])
+                if new_name:
+                    model.update_faces(lambda f: f["id"] == face["id"], name=new_name)
+
+            dialog.add_action("Isaretle", 'background-color: lightblue', mark)
+            dialog.add_action("Isaret Kaldir", 'background-color: lightgreen', unmark)
+            dialog.add_action("Sil", 'background-color: lightcoral', delete)
+            dialog.add_action("Isimle", 'background-color: lightgoldenrodyellow', rename)
             dialog.exec_()
         except Exception as e:
             print(f"Error in viewing faces: {e}")
 
+    # Kamerada görülen ama kayıtlı olmayan yüz kümeleri; bir küme tek adımda kayıtlı yüze dönüştürülebilir
+    def view_unknown_faces(self):
+        try:
+            faces = [{"id": cluster["id"], "name": f"{cluster_label(cluster['id'])} ({cluster['count']} görüş)", "marked": 0}
+                     for cluster in self.face_clusters.clusters()]
+            model = FaceListModel(faces, self.face_clusters.snapshot, "marked", {})
+            dialog = FaceListDialog(model, "Bilinmeyen Yüzler", parent=self)
+
+            def enroll(face):
+                if self.enroll_cluster(face["id"]):
+                    model.remove_faces(lambda f: f["id"] == face["id"])
+
+            def discard(face):
+                self.face_clusters.remove(face["id"])
+                model.remove_faces(lambda f: f["id"] == face["id"])
+
+            dialog.add_action("Kaydet", 'background-color: lightblue', enroll)
+            dialog.add_action("Sil", 'background-color: lightcoral', discard)
+            dialog.exec_()
+        except Exception as e:
+            print(f"Error in viewing unknown faces: {e}")
+
+    # Kümenin merkez kodlaması ve en iyi kesiti yeni kayıtlı yüz olur
+    def enroll_cluster(self, cluster_id):
+        try:
+            if self.face_clusters.snapshot(cluster_id) is None:
+                print("Kümenin resmi yok.")
+                return False
+            name, ok = QInputDialog.getText(self, 'Yüz Kaydet', 'Yüz İsmi:')
+            if not ok or not name:
+                return False
+            cluster = self.face_clusters.promote(cluster_id)
+            face_id = add_face(name, cluster["encoding"], cluster["image"])
+            self.face_gallery.add(face_id, name, cluster["encoding"])
+            self.face_gallery.save_index()
+            self.face_tracker.relabel(cluster_label(cluster_id), name)
+            QMessageBox.information(self, "Başarılı", f"{cluster_label(cluster_id)} {name} olarak kaydedildi.")
+            return True
+        except Exception as e:
+            print(f"Error in enrolling unknown face: {e}")
+
     def mark_and_notify(self, name):
         try:
             mark_face(name)
-            self.load_known_faces()
+            self.face_gallery.set_flag(name, 1)
             QMessageBox.information(self, "Başarılı", f"Yüz {name} işaretlendi.")
+            return True
         except Exception as e:
             print(f"Error in marking face: {e}")
 
     def unmark_and_notify(self, name):
         try:
             unmark_face(name)
-            self.load_known_faces()
+            self.face_gallery.set_flag(name, 0)
             QMessageBox.information(self, "Başarılı", f"Yüz {name} için işaret kaldırıldı.")
+            return True
         except Exception as e:
             print(f"Error in unmarking face: {e}")
 
     def delete_and_notify(self, name):
         try:
             delete_face(name)
-            self.load_known_faces()
+            self.face_gallery.remove_name(name)
+            self.face_gallery.save_index()
             QMessageBox.information(self, "Başarılı", f"Yüz {name} silindi.")
+            return True
         except Exception as e:
             print(f"Error in deleting face: {e}")
 
+    def mark_all_faces(self):
+        try:
+            mark_all_faces()
+            self.face_gallery.set_all_flags(1)
+        except Exception as e:
+            print(f"Error in marking all faces: {e}")
+
     def rename_face(self, face_id):
         try:
             new_name, ok = QInputDialog.getText(self, 'Yüzü Yeniden İsimle', 'Yeni ismi girin:')
@@ -450,11 +380,23 @@ class MainWindow(QWidget):
                     cursor = conn.cursor()
                     cursor.execute("UPDATE faces SET name = ? WHERE id = ?", (new_name, face_id))
                     conn.commit()
-                self.load_known_faces()
+                self.face_gallery.rename(face_id, new_name)
                 QMessageBox.information(self, "Başarılı", f"Yüz {face_id} ismi {new_name} olarak değiştirildi.")
+                return new_name
         except Exception as e:
             print(f"Error in renaming face: {e}")
 
+    # Yüz ve plaka kayıtları sayfa sayfa okunur; açılış süresi tablo boyutundan bağımsızdır
+    def view_logs(self):
+        try:
+            dialog = LogViewerDialog(create_connection, [("type", "Tür"), ("identifier", "Kimlik"), ("timestamp", "Zaman")],
+                                     text_filters=[("identifier", "İsim / plaka")],
+                                     choice_filters=[("type", [("Yüz", "face"), ("Plaka", "plate")])],
+                                     title="Tanıma Kayıtları", parent=self)
+            dialog.exec_()
+        except Exception as e:
+            print(f"Error in viewing logs: {e}")
+
     def view_plates(self):
         try:
             dialog = QDialog(self)
@@ -489,7 +431,7 @@ class MainWindow(QWidget):
     def mark_and_notify_plate(self, plate_number):
         try:
             mark_plate(plate_number)
-            self.load_known_plates()
+            self.plate_registry.set_marked(plate_number, 1)
             QMessageBox.information(self, "Başarılı", f"Plaka {plate_number} işaretlendi.")
         except Exception as e:
             print(f"Error in marking plate: {e}")
@@ -497,7 +439,7 @@ class MainWindow(QWidget):
     def unmark_and_notify_plate(self, plate_number):
         try:
             unmark_plate(plate_number)
-            self.load_known_plates()
+            self.plate_registry.set_marked(plate_number, 0)
             QMessageBox.information(self, "Başarılı", f"Plaka {plate_number} için işaret kaldırıldı.")
         except Exception as e:
             print(f"Error in unmarking plate: {e}")
@@ -508,7 +450,7 @@ class MainWindow(QWidget):
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM plates WHERE plate_number = ?", (plate_number,))
                 conn.commit()
-            self.load_known_plates()
+            self.plate_registry.remove(plate_number)
             QMessageBox.information(self, "Başarılı", f"Plaka {plate_number} silindi.")
         except Exception as e:
             print(f"Error in deleting plate: {e}")
@@ -526,20 +468,26 @@ class MainWindow(QWidget):
             if not ret:
                 return
 
-            frame = cv2.resize(frame, (640, 480))  # Daha iyi performans için kare boyutunu değiştir
+            with metrics.stage("resize"):
+                frame = cv2.resize(frame, (640, 480))  # Daha iyi performans için kare boyutunu değiştir
 
-            face_locations, face_names = self.process_face_recognition(frame)
+            self.process_face_recognition(frame)
+            face_locations, face_names = self.face_tracker.locations(), self.face_tracker.labels()
 
             for (top, right, bottom, left), name in zip(face_locations, face_names):
-                color = (0, 255, 0) if name == "Yeni Yuz" else (0, 255, 255) if name == "Kayitli Ama Isimsiz" else (0, 0, 255)
+                color = (0, 255, 0) if is_unknown_label(name) else (0, 255, 255) if name == "Kayitli Ama Isimsiz" else (0, 0, 255)
                 cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
                 cv2.putText(frame, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
 
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+            if METRICS_OVERLAY:
+                metrics.draw_overlay(frame)
+            with metrics.stage("display"):
+                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                h, w, ch = rgb_image.shape
+                bytes_per_line = ch * w
+                qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+                self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+            metrics.frame()
         except Exception as e:
             print(f"Error in updating frame: {e}")
 
@@ -549,14 +497,16 @@ class MainWindow(QWidget):
             if not ret:
                 return
 
-            frame = cv2.resize(frame, (640, 480))  # Daha iyi performans için kare boyutunu değiştir
+            with metrics.stage("resize"):
+                frame = cv2.resize(frame, (640, 480))  # Daha iyi performans için kare boyutunu değiştir
 
-            plate_locations, plate_numbers = self.process_plate_recognition(frame)
+            self.process_plate_recognition(frame)
+            plate_locations, plate_numbers = self.plate_results
 
             for (x, y, w, h), plate_number in zip(plate_locations, plate_numbers):
                 color = (0, 255, 0)  # Varsayılan renk
                 # Plakanın işaretli olup olmadığını kontrol et
-                if plate_number in [plate["plate_number"] for plate in self.known_plates if plate["marked"]]:
+                if self.plate_registry.is_marked(plate_number):
                     color = (0, 0, 255)  # İşaretli plakalar için kırmızı renk
                     # Plaka numarasına tarih ve saat ekle
                     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -564,35 +514,120 @@ class MainWindow(QWidget):
                 cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
                 cv2.putText(frame, plate_number, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
 
-            if self.auto_save_active:
-                for plate_number in plate_numbers:
-                    if plate_number not in self.detected_plates:
-                        add_plate(plate_number)
-                        self.detected_plates[plate_number] = {'start_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'last_seen': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+            if METRICS_OVERLAY:
+                metrics.draw_overlay(frame)
+            with metrics.stage("display"):
+                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                h, w, ch = rgb_image.shape
+                bytes_per_line = ch * w
+                qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+                self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+            metrics.frame()
         except Exception as e:
             print(f"Error in updating frame: {e}")
 
+    def closeEvent(self, event):
+        if hasattr(self, 'cap'):
+            self.timer.stop()
+            self.cap.release()
+            self.executor.shutdown()
+        log_writer.close()
+        metrics.close()
+        super().closeEvent(event)
+
+    # Algılama zamanı geldiyse kareyi işçi havuzuna gönder; sonuç on_recognition_result ile gelir
     def process_face_recognition(self, frame):
         try:
-            face_locations, face_names = recognize_faces(frame, self.known_faces)
-            return face_locations, face_names
+            self.face_tracker.advance()
+            self.apply_load_level()
+            if MOTION_GATE and not self.motion_gate.active(frame):
+                return
+            if not self.load_shedder.take_frame():
+                return
+            if self.face_tracker.detection_due() and not self.pending_detections and not self.pending_encodes:
+                seq = self.executor.submit('face_locations', frame, {"scale": self.face_tracker.detect_scale})
+                if seq is not None:
+                    # Kare ekranda izlerin ve etiketlerin çizileceği dizi; kodlama ve küme kesitleri temiz kopyadan alınır
+                    self.pending_detections[seq] = frame.copy()
         except Exception as e:
             print(f"Error in face recognition processing: {e}")
-            return [], []
+
+    # Önce galeri, galeride olmayanlar için ziyaretçi kümeleri (bkz. face_clusters.py)
+    def assign_faces(self, track_ids, frame, face_locations, face_encodings):
+        with metrics.stage("match"):
+            labels = self.face_clusters.identify(face_encodings, lambda encodings: match_faces(encodings, self.face_gallery),
+                                                 frame, face_locations)
+        for track_id, location, (label, confident) in zip(track_ids, face_locations, labels):
+            self.face_tracker.assign(track_id, label, confident, location)
+
+    # Ölçülen gecikmeye göre yük seviyesini güncelle; algılama ölçeği izleyiciye aktarılır
+    def apply_load_level(self):
+        settings = self.load_shedder.update()
+        if settings is not None:
+            self.face_tracker.detect_scale = settings["detect_scale"]
 
     def process_plate_recognition(self, frame):
         try:
-            plate_locations, plate_numbers = recognize_plate(frame)
-            return plate_locations, plate_numbers
+            self.apply_load_level()
+            if MOTION_GATE and not self.motion_gate.active(frame):
+                return
+            settings = self.load_shedder.settings
+            if not settings["ocr"] or not self.load_shedder.take_frame():
+                return
+            # Plakası kesinleşmiş araçların kesitleri OCR'a gönderilmez
+            options = {"skip_boxes": self.plate_consensus.decided_boxes()}
+            if settings["ocr_budget"] is not None:
+                options["ocr_budget"] = settings["ocr_budget"]
+            self.executor.submit('plates', frame, options)
         except Exception as e:
             print(f"Error in plate recognition processing: {e}")
-            return [], []
+
+    # İşçi havuzundan gelen sonuçlar (arayüz iş parçacığında çalışır)
+    def on_recognition_result(self, result):
+        try:
+            if "roundtrip" in result:
+                self.load_shedder.observe(result["roundtrip"])
+            if "error" in result:
+                self.pending_detections.pop(result["seq"], None)
+                self.pending_encodes.pop(result["seq"], None)
+                return
+            if result["task"] == 'face_locations':
+                frame = self.pending_detections.pop(result["seq"], None)
+                if frame is None:
+                    return
+                pending = self.face_tracker.update_detections(result["face_locations"])
+                max_faces = self.load_shedder.settings["max_faces"]
+                if max_faces is not None and len(pending) > max_faces:
+                    # Yük altında sadece en büyük (kameraya en yakın) yüzler kodlanır; kalanlar sonraki algılamada
+                    pending = sorted(pending, key=lambda track: (track["location"][2] - track["location"][0])
+                                     * (track["location"][1] - track["location"][3]), reverse=True)[:max_faces]
+                if pending:
+                    options = {"face_locations": [track["location"] for track in pending]}
+                    seq = self.executor.submit('encode', frame, options, force=True)
+                    self.pending_encodes[seq] = ([track["id"] for track in pending], frame)
+            elif result["task"] == 'encode':
+                pending = self.pending_encodes.pop(result["seq"], None)
+                if pending is None:
+                    return
+                track_ids, frame = pending
+                self.assign_faces(track_ids, frame, result["face_locations"], result["face_encodings"])
+            elif result["task"] == 'plates':
+                readings = list(zip(result["plate_locations"], result["plate_numbers"], result["plate_confidences"]))
+                with metrics.stage("plate_consensus"):
+                    events = self.plate_consensus.update(readings, result["skipped_plate_locations"])
+                # Her araç geçişi için sadece uzlaşıya varılmış plaka kaydedilir
+                plate_numbers = [event["plate_number"] for event in events]
+                log_plates(plate_numbers)
+                self.plate_results = self.plate_consensus.display()
+                for plate_number in plate_numbers:
+                    self.plate_registry.see(plate_number)
+                    match = self.plate_registry.possible_match(plate_number)
+                    if match is not None:
+                        print(f"Olasi isaretli plaka: {plate_number} (kayitli: {match['plate_number']})")
+                    if self.auto_save_active and not self.plate_registry.contains(plate_number):
+                        self.plate_registry.add(add_plate(plate_number), plate_number)
+        except Exception as e:
+            print(f"Error in handling recognition result: {e}")
 
 if __name__ == '__main__':
     try: